@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+"""Micro-benchmarks for the pure hot paths; run with `python -m benchmarks --help`."""
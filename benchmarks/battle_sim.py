@@ -0,0 +1,335 @@
+# benchmarks/battle_sim.py
+"""
+Headless battle simulator: full one-on-one fights between any class at any
+level and any seeded enemy, run through utils.battle_engine (the same
+rules BattleSystem uses) with no Discord and no database.
+
+    python -m benchmarks.battle_sim                            # every class × every enemy, level 1
+    python -m benchmarks.battle_sim --class Warrior --enemy Drake --level 5 -n 5000
+    python -m benchmarks.battle_sim --difficulty Hard --policy attack --json
+
+A turn is what the cog does per button press: the player acts, then the
+enemy's effects tick, the player's effects tick and the enemy acts.
+Fights are split into chunks across a process pool; each worker builds
+its AbilityEngine catalog from the seed lists once. Reported per matchup:
+win rate, turns-to-kill on wins, damage per player action, damage taken
+per fight and HP left on wins. Fights still going after --max-turns
+count as losses.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from benchmarks import fixtures
+from utils.battle_engine import BattleEngine
+
+PLAYER_ID = 1
+
+# per-process engine, built by _init_worker
+_ENGINE: Optional[BattleEngine] = None
+
+
+class Fight:
+    """The parts of a GameSession BattleEngine reads and writes."""
+    __slots__ = ("battle_state", "ability_cooldowns", "current_turn")
+
+    def __init__(self, enemy: Dict[str, Any]):
+        self.battle_state = {"enemy": enemy, "player_effects": [], "enemy_effects": []}
+        self.ability_cooldowns: Dict[int, Dict[int, float]] = {}
+        self.current_turn = PLAYER_ID
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Combatants from seed data
+# ──────────────────────────────────────────────────────────────────────────
+def build_player(cls: Dict[str, Any], level: int) -> Dict[str, Any]:
+    """A players row for `cls` at `level`, as stat_levelup would write it."""
+    from utils.stat_levelup import calculate_effective_stats
+
+    growth = next((lv for lv in fixtures.LEVELS if lv["level"] == level), {})
+    stats = calculate_effective_stats(cls, growth, level)
+    return {
+        "hp": stats["hp"], "max_hp": stats["hp"],
+        "attack_power": stats["attack"], "magic_power": stats["magic"],
+        "defense": stats["defense"], "magic_defense": stats["magic_defense"],
+        "accuracy": stats["accuracy"], "evasion": stats["evasion"],
+        "speed": stats["speed"], "base_speed": cls["base_speed"] or 10,
+        "gil": 0,
+    }
+
+
+def class_skills(class_id: int, level: int) -> List[Dict[str, Any]]:
+    by_id = {a["ability_id"]: a for a in fixtures.ABILITIES}
+    return [
+        by_id[link["ability_id"]] for link in fixtures.CLASS_ABILITIES
+        if link["class_id"] == class_id and link["unlock_level"] <= level
+        and link["ability_id"] in by_id
+    ]
+
+
+def build_enemy(row: Dict[str, Any]) -> Dict[str, Any]:
+    """The columns get_enemy_for_room selects, plus the gil pool start_battle adds."""
+    keys = ("enemy_id", "enemy_name", "hp", "max_hp", "attack_power", "magic_power",
+            "defense", "magic_defense", "accuracy", "evasion", "xp_reward", "gil_drop",
+            "loot_item_id", "loot_quantity", "role")
+    enemy = {k: row[k] for k in keys}
+    enemy["gil_pool"] = enemy.get("gil_drop") or 0
+    return enemy
+
+
+def enemy_kit(enemy_id: int) -> List[Dict[str, Any]]:
+    """What AbilityEngine.load_enemy_kit returns for this enemy."""
+    by_id = {a["ability_id"]: a for a in fixtures.ABILITIES}
+    kit = []
+    for ea in fixtures.ENEMY_ABILITIES:
+        ability = by_id.get(ea["ability_id"])
+        if ea["enemy_id"] != enemy_id or ability is None:
+            continue
+        row = {k: ability[k] for k in (
+            "ability_id", "ability_name", "effect", "cooldown", "special_effect",
+            "target_type", "icon_url", "element_id",
+        )}
+        row.update({k: ea[k] for k in (
+            "weight", "can_heal", "heal_threshold_pct", "heal_amount_pct",
+        )})
+        row["ability_accuracy"] = ea["accuracy"]
+        kit.append(row)
+    return kit
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# One fight
+# ──────────────────────────────────────────────────────────────────────────
+def choose_skill(engine: BattleEngine, fight: Fight, player: Dict[str, Any],
+                 skills: Sequence[Dict[str, Any]], policy: str) -> Optional[Dict[str, Any]]:
+    """
+    'attack': always Attack.
+    'skills': below 40% HP use a ready self heal if there is one, otherwise
+    the ready enemy skill with the longest cooldown; Attack when nothing is ready.
+    """
+    if policy == "attack" or not skills:
+        return None
+    cds = fight.ability_cooldowns.get(PLAYER_ID, {})
+    ready = [a for a in skills if cds.get(a["ability_id"], 0) <= 0]
+    if player["hp"] < 0.4 * player["max_hp"]:
+        heals = [a for a in ready if a["target_type"] == "self"
+                 and engine.ability.plan_for(a).kind in ("heal_current_pct", "hot")]
+        if heals:
+            return heals[0]
+    offence = [a for a in ready if a["target_type"] == "enemy"
+               and engine.ability.plan_for(a).kind is not None]
+    return max(offence, key=lambda a: a.get("cooldown") or 0) if offence else None
+
+
+def simulate(engine: BattleEngine, player: Dict[str, Any], skills: Sequence[Dict[str, Any]],
+             enemy: Dict[str, Any], kit: List[Dict[str, Any]], policy: str,
+             max_turns: int) -> Tuple[bool, int, List[int], int, int]:
+    """
+    Run one fight on fresh copies of `player` / `enemy`.
+    Returns (won, turns, damage per player action, damage taken, player HP left).
+    """
+    player, enemy = dict(player), dict(enemy)
+    fight = Fight(enemy)
+    dealt: List[int] = []
+    taken = 0
+
+    for turn in range(1, max_turns + 1):
+        # player's action
+        before = enemy["hp"]
+        skill = choose_skill(engine, fight, player, skills, policy)
+        if skill is None:
+            out = engine.player_attack(fight, PLAYER_ID, player, enemy)
+        else:
+            out = engine.player_skill(fight, PLAYER_ID, player, enemy, skill)
+        if out.player_hp is not None:
+            player["hp"] = out.player_hp
+        dealt.append(max(before - enemy["hp"], 0))
+        if enemy["hp"] <= 0:
+            return True, turn, dealt, taken, player["hp"]
+
+        # enemy's turn: effects tick, then it acts
+        hp = player["hp"]
+        engine.tick_statuses(fight, player)
+        if enemy["hp"] <= 0:
+            taken += max(hp - player["hp"], 0)
+            return True, turn, dealt, taken, player["hp"]
+        out = engine.enemy_action(fight, PLAYER_ID, player, enemy, kit)
+        if out.player_hp is not None:
+            player["hp"] = out.player_hp
+        taken += max(hp - player["hp"], 0)
+        if player["hp"] <= 0:
+            return False, turn, dealt, taken, 0
+        if enemy["hp"] <= 0:
+            return True, turn, dealt, taken, player["hp"]
+
+    return False, max_turns, dealt, taken, player["hp"]
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Process pool
+# ──────────────────────────────────────────────────────────────────────────
+def _init_worker(variance: float) -> None:
+    global _ENGINE
+    logging.disable(logging.WARNING)
+    engine = fixtures.ability_engine(variance)
+    for a in fixtures.ABILITIES:
+        engine.plan_for(a)
+    _ENGINE = BattleEngine(engine)
+
+
+def _run_chunk(job: Tuple[int, int, int, int, int, str, int]) -> Tuple[Tuple[int, int, int], Dict[str, Any]]:
+    """One chunk of fights for a matchup; returns the raw numbers to merge."""
+    class_id, level, enemy_id, count, seed, policy, max_turns = job
+    random.seed(seed)
+    cls = next(c for c in fixtures.CLASSES if c["class_id"] == class_id)
+    player = build_player(cls, level)
+    skills = class_skills(class_id, level)
+    enemy = build_enemy(next(e for e in fixtures.ENEMIES if e["enemy_id"] == enemy_id))
+    kit = enemy_kit(enemy_id)
+
+    raw: Dict[str, Any] = {"wins": 0, "turns": [], "dealt": [], "taken": [], "hp_left": []}
+    for _ in range(count):
+        won, turns, dealt, taken, hp_left = simulate(_ENGINE, player, skills, enemy, kit,
+                                                     policy, max_turns)
+        raw["dealt"].extend(dealt)
+        raw["taken"].append(taken)
+        if won:
+            raw["wins"] += 1
+            raw["turns"].append(turns)
+            raw["hp_left"].append(hp_left)
+    return (class_id, level, enemy_id), raw
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def _dist(values: List[float]) -> Dict[str, float]:
+    return {
+        "mean": statistics.fmean(values) if values else 0.0,
+        "p50": _pct(values, 0.50),
+        "p90": _pct(values, 0.90),
+        "max": max(values) if values else 0.0,
+    }
+
+
+def summarize(fights: int, raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "fights": fights,
+        "win_rate": raw["wins"] / fights if fights else 0.0,
+        "turns_to_kill": _dist(raw["turns"]),
+        "damage_per_action": _dist(raw["dealt"]),
+        "damage_taken": _dist(raw["taken"]),
+        "hp_left": _dist(raw["hp_left"]),
+    }
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────────────────
+def _pick(rows: List[Dict[str, Any]], name_key: str, id_key: str,
+          wanted: Optional[List[str]]) -> List[Dict[str, Any]]:
+    if not wanted:
+        return rows
+    wanted_l = {w.lower() for w in wanted}
+    picked = [r for r in rows if r[name_key].lower() in wanted_l or str(r[id_key]) in wanted_l]
+    if not picked:
+        sys.exit(f"No match for {', '.join(wanted)}; known: {', '.join(r[name_key] for r in rows)}")
+    return picked
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(prog="python -m benchmarks.battle_sim",
+                                description=__doc__.split("\n\n")[0])
+    p.add_argument("--class", dest="classes", action="append", help="class name or id (repeatable; default all)")
+    p.add_argument("--enemy", dest="enemies", action="append", help="enemy name or id (repeatable; default all)")
+    p.add_argument("--difficulty", help="only enemies of this difficulty (Easy, Medium, Hard …)")
+    p.add_argument("--level", type=int, action="append", help="player level (repeatable; default 1)")
+    p.add_argument("-n", "--fights", type=int, default=1000, help="fights per matchup")
+    p.add_argument("--policy", choices=("skills", "attack"), default="skills")
+    p.add_argument("--variance", type=float, default=0.1, help="damage variance, as config.json damage_variance")
+    p.add_argument("--max-turns", type=int, default=200)
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--chunk", type=int, default=250, help="fights per pool task")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--json", action="store_true", help="print the report as JSON")
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    classes = _pick(fixtures.CLASSES, "class_name", "class_id", args.classes)
+    enemies = _pick(fixtures.ENEMIES, "enemy_name", "enemy_id", args.enemies)
+    if args.difficulty:
+        enemies = [e for e in enemies if (e["difficulty"] or "").lower() == args.difficulty.lower()]
+    levels = args.level or [1]
+
+    jobs = []
+    for cls in classes:
+        for level in levels:
+            for enemy in enemies:
+                for start in range(0, args.fights, args.chunk):
+                    count = min(args.chunk, args.fights - start)
+                    seed = args.seed * 1_000_003 + len(jobs)
+                    jobs.append((cls["class_id"], level, enemy["enemy_id"], count, seed,
+                                 args.policy, args.max_turns))
+
+    merged: Dict[Tuple[int, int, int], Dict[str, Any]] = {}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(args.variance,)) as pool:
+        for key, raw in pool.map(_run_chunk, jobs):
+            acc = merged.setdefault(key, {"wins": 0, "turns": [], "dealt": [], "taken": [], "hp_left": []})
+            acc["wins"] += raw["wins"]
+            for k in ("turns", "dealt", "taken", "hp_left"):
+                acc[k].extend(raw[k])
+    elapsed = time.perf_counter() - started
+
+    class_names = {c["class_id"]: c["class_name"] for c in classes}
+    enemy_rows = {e["enemy_id"]: e for e in enemies}
+    rows = []
+    for (class_id, level, enemy_id), raw in merged.items():
+        rows.append({
+            "class": class_names[class_id], "level": level, "enemy_id": enemy_id,
+            "enemy": enemy_rows[enemy_id]["enemy_name"], "difficulty": enemy_rows[enemy_id]["difficulty"],
+            **summarize(args.fights, raw),
+        })
+    total = args.fights * len(rows)
+    report = {
+        "fights": total,
+        "seconds": round(elapsed, 3),
+        "fights_per_second": round(total / elapsed, 1) if elapsed else 0.0,
+        "workers": args.workers,
+        "policy": args.policy,
+        "matchups": rows,
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'class':<16}{'lvl':>4}  {'enemy':<30}{'win%':>7}{'turns p50/p90':>15}"
+          f"{'dmg/act p50':>13}{'taken p50':>11}{'hp left p50':>13}")
+    for r in rows:
+        t, d, k, h = r["turns_to_kill"], r["damage_per_action"], r["damage_taken"], r["hp_left"]
+        enemy = f"{r['enemy']} ({r['difficulty']})"
+        print(f"{r['class']:<16}{r['level']:>4}  {enemy:<30}{r['win_rate'] * 100:>6.1f}%"
+              f"{t['p50']:>9.0f}/{t['p90']:<5.0f}{d['p50']:>13.0f}{k['p50']:>11.0f}{h['p50']:>13.0f}")
+    print(f"\n{total} fights in {elapsed:.2f}s ({report['fights_per_second']:.0f}/s, "
+          f"{args.workers} workers, policy={args.policy})")
+
+
+if __name__ == "__main__":
+    main()
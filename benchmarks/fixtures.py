@@ -0,0 +1,159 @@
+# benchmarks/fixtures.py
+"""
+Inputs for the micro-benchmarks, built from the seed lists in
+database/database_setup.py so no MySQL server is needed.
+
+The seed tuples carry the id first and then the columns in the order of
+their INSERT statement (link tables such as class_abilities have no id);
+the *_COLUMNS tuples below spell that out.
+"""
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from database import database_setup as seed
+from game.dungeon_generator import DungeonGenerator
+from utils.ability_engine import AbilityEngine
+
+DIFFICULTY_COLUMNS = (
+    "difficulty_id", "name", "width", "height", "min_floors", "max_floors", "min_rooms",
+    "enemy_chance", "npc_count", "basement_chance", "basement_min_rooms",
+    "basement_max_rooms", "created_at", "shops_per_floor",
+)
+FLOOR_RULE_COLUMNS = (
+    "rule_id", "difficulty_name", "floor_number", "room_type", "chance", "max_per_floor", "created_at",
+)
+ROOM_TEMPLATE_COLUMNS = (
+    "template_id", "room_type", "template_name", "description", "image_url",
+    "default_enemy_id", "created_at", "trap_type", "trap_payload",
+)
+ABILITY_COLUMNS = (
+    "ability_id", "ability_name", "description", "effect", "cooldown", "icon_url",
+    "target_type", "special_effect", "element_id", "status_effect_id",
+    "status_duration", "created_at", "scaling_stat",
+)
+STATUS_EFFECT_COLUMNS = (
+    "effect_id", "effect_name", "effect_type", "icon_url", "created_at", "value", "duration",
+)
+CLASS_COLUMNS = (
+    "class_id", "class_name", "description", "base_hp", "base_attack", "base_magic",
+    "base_defense", "base_magic_defense", "base_accuracy", "base_evasion", "base_speed",
+    "image_url", "creator_id", "created_at", "atb_max",
+)
+CLASS_ABILITY_COLUMNS = ("class_id", "ability_id", "unlock_level")
+LEVEL_COLUMNS = (
+    "level", "required_exp", "hp_increase", "attack_increase", "magic_increase",
+    "defense_increase", "magic_defense_increase", "accuracy_increase",
+    "evasion_increase", "speed_increase", "unlocked_abilities", "created_at",
+)
+ENEMY_COLUMNS = (
+    "enemy_id", "enemy_name", "role", "description", "hp", "max_hp", "attack_power", "defense",
+    "magic_power", "magic_defense", "accuracy", "evasion", "difficulty", "abilities",
+    "image_url", "spawn_chance", "gil_drop", "xp_reward", "loot_item_id", "loot_quantity",
+    "creator_id", "created_at", "atb_max",
+)
+ENEMY_ABILITY_COLUMNS = (
+    "enemy_id", "ability_id", "weight", "can_heal", "heal_threshold_pct",
+    "heal_amount_pct", "scaling_stat", "scaling_factor", "accuracy",
+)
+
+
+def seed_rows(rows: Sequence[Tuple], columns: Sequence[str]) -> List[Dict[str, Any]]:
+    """Seed tuples → dicts shaped like `cursor(dictionary=True)` rows."""
+    return [dict(zip(columns, row)) for row in rows]
+
+
+DIFFICULTIES = seed_rows(seed.MERGED_DIFFICULTIES, DIFFICULTY_COLUMNS)
+FLOOR_RULES = seed_rows(seed.MERGED_FLOOR_ROOM_RULES, FLOOR_RULE_COLUMNS)
+ROOM_TEMPLATES = seed_rows(seed.MERGED_ROOM_TEMPLATES, ROOM_TEMPLATE_COLUMNS)
+ABILITIES = seed_rows(seed.MERGED_ABILITIES, ABILITY_COLUMNS)
+STATUS_EFFECTS = seed_rows(seed.MERGED_STATUS_EFFECTS, STATUS_EFFECT_COLUMNS)
+CLASSES = seed_rows(seed.MERGED_CLASSES, CLASS_COLUMNS)
+CLASS_ABILITIES = seed_rows(seed.MERGED_CLASS_ABILITIES, CLASS_ABILITY_COLUMNS)
+LEVELS = seed_rows(seed.MERGED_LEVELS, LEVEL_COLUMNS)
+ENEMIES = seed_rows(seed.MERGED_ENEMIES, ENEMY_COLUMNS)
+ENEMY_ABILITIES = seed_rows(seed.MERGED_ENEMY_ABILITIES, ENEMY_ABILITY_COLUMNS)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Dungeon generation
+# ──────────────────────────────────────────────────────────────────────────
+class SeedDungeonGenerator(DungeonGenerator):
+    """DungeonGenerator whose floor-rule / template lookups read the seed lists."""
+
+    def __init__(self):
+        self.bot = None
+        self.db = None
+
+    def fetch_floor_rules(self, difficulty: str, floor_num: int) -> List[Dict[str, Any]]:
+        return [
+            {k: r[k] for k in ("room_type", "chance", "max_per_floor")}
+            for r in FLOOR_RULES
+            if r["difficulty_name"] == difficulty and r["floor_number"] in (floor_num, None)
+        ]
+
+    def fetch_random_template(self, rtype: str) -> Optional[Dict[str, Any]]:
+        options = [t for t in ROOM_TEMPLATES if t["room_type"] == rtype]
+        return random.choice(options) if options else None
+
+
+def floor_args(difficulty: Dict[str, Any], floor_number: int = 1) -> Dict[str, Any]:
+    """Keyword arguments for generate_rooms_for_floor, as generate_dungeon_for_session builds them."""
+    w, h = difficulty["width"], difficulty["height"]
+    return dict(
+        floor_id=1, width=w, height=h,
+        min_rooms=difficulty["min_rooms"], enemy_chance=difficulty["enemy_chance"],
+        npc_count=difficulty["npc_count"], shop_limit=difficulty["shops_per_floor"],
+        is_last_floor=False, start_x=0, start_y=0, end_x=w - 1, end_y=h - 1,
+        difficulty=difficulty["name"], floor_number=floor_number,
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Combat
+# ──────────────────────────────────────────────────────────────────────────
+def ability_engine(variance: float = 0.1) -> AbilityEngine:
+    """An AbilityEngine with the seed status-effect catalog; plans compile on first use."""
+    engine = AbilityEngine(db_connect=None, damage_variance=variance)
+    engine._effects_by_id = {e["effect_id"]: e for e in STATUS_EFFECTS}
+    engine._effects_by_name = {e["effect_name"]: e for e in STATUS_EFFECTS}
+    links: Dict[int, List[Dict[str, Any]]] = {}
+    for ability_id, effect_id in seed.MERGED_ABILITY_STATUS_EFFECTS:
+        meta = engine._effects_by_id.get(effect_id)
+        if meta:
+            links.setdefault(ability_id, []).append(meta)
+    engine._ability_links = links
+    engine._plans = {}
+    return engine
+
+
+def player(level: int = 10) -> Dict[str, Any]:
+    return {
+        "player_id": 1, "hp": 60 + 14 * level, "max_hp": 60 + 14 * level,
+        "attack_power": 8 + 2 * level, "magic_power": 8 + 2 * level,
+        "defense": 5 + level, "magic_defense": 5 + level,
+        "accuracy": 95, "evasion": 5, "gil": 500,
+    }
+
+
+def enemy() -> Dict[str, Any]:
+    return {
+        "enemy_id": 1, "enemy_name": "Behemoth", "hp": 400, "max_hp": 400,
+        "attack_power": 30, "magic_power": 20, "defense": 15, "magic_defense": 10,
+        "accuracy": 95, "evasion": 5, "gil_pool": 250,
+    }
+
+
+def status_effects(count: int, remaining: int = 3) -> List[Dict[str, Any]]:
+    """`count` effects as battle_state keeps them, alternating DoT and HoT."""
+    out = []
+    for i in range(count):
+        meta = STATUS_EFFECTS[i % len(STATUS_EFFECTS)]
+        effect = {
+            "effect_id": meta["effect_id"], "effect_name": meta["effect_name"],
+            "icon": meta["icon_url"], "remaining": remaining, "target": "enemy",
+        }
+        effect["damage_per_turn" if i % 2 == 0 else "heal_per_turn"] = 5 + i
+        out.append(effect)
+    return out
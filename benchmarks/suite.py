@@ -0,0 +1,334 @@
+# benchmarks/suite.py
+"""
+Micro-benchmarks for the pure hot paths: dungeon carving, ability
+resolution, status ticks, whole fights, UI bars, minimap rendering and
+session (de)serialisation.
+
+    python -m benchmarks                 # run all, append to history, compare
+    python -m benchmarks -k minimap      # only names containing "minimap"
+    python -m benchmarks --no-save --fail-on-regression
+
+Each benchmark is timed with timeit: loops are calibrated to about
+--min-time seconds, repeated --repeat times, and the best and median
+per-call times are kept. Every saved run is one line in
+benchmarks/history.jsonl (commit, timestamp, Python, results); a run is
+compared with the newest earlier run on the same Python version and
+anything slower than --threshold is flagged as a regression.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as _dt
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import timeit
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.jsonl")
+
+# name -> factory returning the zero-argument callable to time
+BENCHMARKS: Dict[str, Callable[[], Callable[[], Any]]] = {}
+
+
+def bench(name: str) -> Callable:
+    """Register a factory; setup runs in the factory, only the returned callable is timed."""
+    def wrap(factory: Callable[[], Callable[[], Any]]) -> Callable:
+        BENCHMARKS[name] = factory
+        return factory
+    return wrap
+
+
+def _register() -> None:
+    """Define every benchmark (imports are deferred so --help works without the deps)."""
+    from benchmarks import fixtures
+    from core.game_session import GameSession
+    from utils import save_codec
+    from utils.battle_engine import BattleEngine
+    from utils.minimap import FloorGlyphGrid
+    from utils.status_engine import StatusEffectEngine
+    from utils.ui_helpers import create_health_bar, format_status_effects
+
+    gen = fixtures.SeedDungeonGenerator()
+
+    # ── dungeon generation, once per seeded difficulty size ──────────────
+    for diff in fixtures.DIFFICULTIES:
+        w, h = diff["width"], diff["height"]
+        tag = f"{diff['name']} {w}x{h}"
+
+        def carve(w=w, h=h):
+            random.seed(1)
+            return lambda: gen._carve_perfect_maze(w, h)
+
+        def loops(w=w, h=h):
+            random.seed(1)
+            adj = gen._carve_perfect_maze(w, h)
+            # loops only ever add edges, so re-running on the same map stays representative
+            return lambda: gen._add_random_loops({k: set(v) for k, v in adj.items()})
+
+        def bfs(w=w, h=h):
+            random.seed(1)
+            adj = gen._carve_perfect_maze(w, h)
+            gen._add_random_loops(adj)
+            return lambda: gen._bfs_path(adj, (0, 0), (w - 1, h - 1))
+
+        def rooms(diff=diff):
+            random.seed(1)
+            kwargs = fixtures.floor_args(diff)
+            return lambda: gen.generate_rooms_for_floor(**kwargs)
+
+        bench(f"dungeon.carve_perfect_maze[{tag}]")(carve)
+        bench(f"dungeon.add_random_loops[{tag}]")(loops)
+        bench(f"dungeon.bfs_path[{tag}]")(bfs)
+        bench(f"dungeon.generate_rooms_for_floor[{tag}]")(rooms)
+
+    # ── abilities ────────────────────────────────────────────────────────
+    @bench("ability.jrpg_damage")
+    def _():
+        engine = fixtures.ability_engine()
+        user, target = fixtures.player(), fixtures.enemy()
+        return lambda: engine.jrpg_damage(user, target, 50, "magic_power", 1.2)
+
+    @bench("ability.resolve[all seed abilities]")
+    def _():
+        random.seed(1)
+        engine = fixtures.ability_engine()
+        abilities = fixtures.ABILITIES
+        for a in abilities:
+            engine.plan_for(a)        # compile up front: resolve() is the hot path
+        state = {"i": 0}
+
+        def run():
+            a = abilities[state["i"] % len(abilities)]
+            state["i"] += 1
+            # fresh combatants: some resolvers (mug, pilfer) mutate them
+            return engine.resolve(fixtures.player(), fixtures.enemy(), a)
+        return run
+
+    # ── status effects ───────────────────────────────────────────────────
+    @bench("status.tick_combat[enemy, 6 effects]")
+    def _():
+        session = GameSession(session_id=1, guild_id=1, thread_id="1", owner_id=1)
+        session.battle_state = {"enemy": fixtures.enemy(), "enemy_effects": []}
+        engine = StatusEffectEngine(session, lambda sid, msg: None, lambda sid, lines: None)
+        effects = fixtures.status_effects(6)
+
+        def run():
+            session.battle_state["enemy_effects"] = [dict(e) for e in effects]
+            coro = engine.tick_combat("enemy")
+            try:
+                coro.send(None)          # no awaits inside: finishes in one step
+            except StopIteration:
+                pass
+        return run
+
+    @bench("status.tick_entries[player, 6 effects]")
+    def _():
+        effects = fixtures.status_effects(6)
+
+        def run():
+            return StatusEffectEngine._tick_entries(
+                [dict(e) for e in effects], [],
+                "{name} deals {amount} damage to you!", "{name} heals you for {amount} HP!",
+            )
+        return run
+
+    # ── whole fights through the battle engine ───────────────────────────
+    @bench("battle.simulate[Warrior L1 vs Drake]")
+    def _():
+        from benchmarks import battle_sim
+        random.seed(1)
+        engine = BattleEngine(fixtures.ability_engine())
+        cls = next(c for c in fixtures.CLASSES if c["class_name"] == "Warrior")
+        row = next(e for e in fixtures.ENEMIES if e["enemy_name"] == "Drake")
+        player = battle_sim.build_player(cls, 1)
+        skills = battle_sim.class_skills(cls["class_id"], 1)
+        enemy = battle_sim.build_enemy(row)
+        kit = battle_sim.enemy_kit(row["enemy_id"])
+        return lambda: battle_sim.simulate(engine, player, skills, enemy, kit, "skills", 200)
+
+    # ── UI helpers ───────────────────────────────────────────────────────
+    @bench("ui.create_health_bar")
+    def _():
+        values = [(hp, 250) for hp in range(0, 251, 7)]
+        return lambda: [create_health_bar(c, m) for c, m in values]
+
+    @bench("ui.format_status_effects[6]")
+    def _():
+        effects = fixtures.status_effects(6)
+        return lambda: format_status_effects(effects)
+
+    # ── minimap ──────────────────────────────────────────────────────────
+    for diff in fixtures.DIFFICULTIES:
+        w, h = diff["width"], diff["height"]
+        tag = f"{diff['name']} {w}x{h}"
+        random.seed(1)
+        floor = [
+            {"coord_x": x, "coord_y": y, "room_type": rtype}
+            for _, x, y, rtype, _ in gen.generate_rooms_for_floor(**fixtures.floor_args(diff))
+        ]
+        discovered = {(r["coord_x"], r["coord_y"]) for r in floor[: len(floor) // 2]}
+        current = (w // 2, h // 2)
+
+        def build(floor=floor):
+            return lambda: FloorGlyphGrid(1, floor)
+
+        def full(floor=floor, discovered=discovered, current=current):
+            grid = FloorGlyphGrid(1, floor)
+
+            def run():
+                grid._renders.clear()    # measure the render, not the memo
+                return grid.render_full(current, discovered, set())
+            return run
+
+        def local(floor=floor, discovered=discovered, current=current):
+            grid = FloorGlyphGrid(1, floor)
+
+            def run():
+                grid._renders.clear()
+                return grid.render_local(current, discovered, set())
+            return run
+
+        bench(f"minimap.build_grid[{tag}]")(build)
+        bench(f"minimap.render_full[{tag}]")(full)
+        bench(f"minimap.render_local[{tag}]")(local)
+
+    # ── session state ────────────────────────────────────────────────────
+    state = save_codec._sample_state()
+
+    @bench("session.to_dict")
+    def _():
+        session = GameSession.from_dict(state)
+        return session.to_dict
+
+    @bench("session.from_dict")
+    def _():
+        data = GameSession.from_dict(state).to_dict()
+        return lambda: GameSession.from_dict(data)
+
+    @bench("save_codec.dumps")
+    def _():
+        data = GameSession.from_dict(state).to_dict()
+        return lambda: save_codec.dumps(data, schema_version=GameSession.SCHEMA_VERSION)
+
+    @bench("save_codec.loads")
+    def _():
+        blob = save_codec.dumps(GameSession.from_dict(state).to_dict(),
+                                schema_version=GameSession.SCHEMA_VERSION)
+        return lambda: save_codec.loads(blob)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Running / history
+# ──────────────────────────────────────────────────────────────────────────
+def measure(fn: Callable[[], Any], min_time: float, repeat: int) -> Dict[str, float]:
+    timer = timeit.Timer(fn)
+    loops, elapsed = timer.autorange()           # smallest 1/2/5×10^n taking ≥ 0.2 s
+    if 0 < elapsed < min_time:
+        loops = int(loops * min_time / elapsed) + 1
+    runs = [t / loops for t in timer.repeat(repeat, loops)]
+    return {
+        "best_us": min(runs) * 1e6,
+        "median_us": statistics.median(runs) * 1e6,
+        "loops": loops,
+    }
+
+
+def _commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, cwd=os.path.dirname(HISTORY_PATH), timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def load_history(path: str = HISTORY_PATH) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def previous_run(history: List[Dict[str, Any]], python: str) -> Optional[Dict[str, Any]]:
+    for run in reversed(history):
+        if run.get("python") == python:
+            return run
+    return None
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Any]],
+            threshold: float) -> List[Tuple[str, float]]:
+    """[(name, ratio)] for benchmarks whose best time grew by more than `threshold`."""
+    if not baseline:
+        return []
+    slower = []
+    for name, row in results.items():
+        old = baseline["results"].get(name)
+        if old and old["best_us"] > 0:
+            ratio = row["best_us"] / old["best_us"]
+            if ratio > 1 + threshold:
+                slower.append((name, ratio))
+    return slower
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.split("\n\n")[0])
+    p.add_argument("-k", dest="filter", default="", help="only run benchmarks whose name contains this")
+    p.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--threshold", type=float, default=0.15, help="regression threshold (0.15 = 15%% slower)")
+    p.add_argument("--no-save", action="store_true", help="don't append this run to the history")
+    p.add_argument("--history", default=HISTORY_PATH)
+    p.add_argument("--fail-on-regression", action="store_true", help="exit 1 if anything regressed")
+    p.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    # the game modules log at DEBUG; keep that out of the timings
+    logging.disable(logging.WARNING)
+    _register()
+
+    names = [n for n in BENCHMARKS if args.filter in n]
+    if args.list:
+        print("\n".join(names))
+        return
+
+    python = platform.python_version()
+    history = load_history(args.history)
+    baseline = previous_run(history, python)
+
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'benchmark':<52}{'best µs':>12}{'median µs':>12}{'vs last':>9}")
+    for name in names:
+        fn = BENCHMARKS[name]()
+        row = results[name] = measure(fn, args.min_time, args.repeat)
+        old = (baseline or {}).get("results", {}).get(name)
+        delta = f"{(row['best_us'] / old['best_us'] - 1) * 100:+.0f}%" if old and old["best_us"] else ""
+        print(f"{name:<52}{row['best_us']:>12.2f}{row['median_us']:>12.2f}{delta:>9}")
+
+    slower = compare(results, baseline, args.threshold)
+    if baseline:
+        print(f"\ncompared with {baseline.get('commit') or '?'} ({baseline['timestamp']})")
+    for name, ratio in slower:
+        print(f"  REGRESSION {name}: {ratio:.2f}× slower")
+
+    if not args.no_save:
+        entry = {
+            "timestamp": _dt.datetime.now().isoformat(timespec="seconds"),
+            "commit": _commit(),
+            "python": python,
+            "machine": platform.machine(),
+            "results": results,
+        }
+        with open(args.history, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(entry, sort_keys=True) + "\n")
+    if slower and args.fail_on_regression:
+        sys.exit(1)
@@ -1,68 +1,124 @@
+import time
+
+# before the discord import, so the READY time in the startup report counts it
+_STARTED = time.perf_counter()
+
 import discord
 from discord.ext import commands
-import subprocess
 import os
-import json
 import logging
 import asyncio
-import importlib
+from typing import Dict
+
+from utils import db_metrics, tracing
+from utils.cog_discovery import discover_cogs, load_cogs, timing_report
+from utils.command_sync import sync_command_tree
+from utils.helpers import get_bot_root, load_config as _load_shared_config
+from utils.log_config import configure_logging
 
 # ---------------------
 #   LOGGING SETUP
 # ---------------------
-logging.basicConfig(
-    level=logging.WARNING,   # Global: only show warnings and errors by default
-    format='[%(asctime)s] %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+# Defaults until config.json is read; levels, sampling and the queue
+# pipeline then come from its "logging" section (see utils/log_config.py).
+configure_logging()
 logger = logging.getLogger("AdventureBot")
-logger.setLevel(logging.DEBUG)  # Your bot logs are still DEBUG
-
-# --- LOGGING VERBOSITY CLEANUP ---
-logging.getLogger("discord").setLevel(logging.WARNING)
-logging.getLogger("discord.gateway").setLevel(logging.WARNING)
-logging.getLogger("discord.http").setLevel(logging.WARNING)
 
 # ---------------------
 #   CONFIG LOADING
 # ---------------------
-def get_bot_root():
-    """Return the absolute path to the directory containing this script (bot.py)."""
-    return os.path.dirname(os.path.abspath(__file__))
-
 CONFIG_PATH = os.path.join(get_bot_root(), 'config.json')
 
 def load_config():
+    """Parse config.json once; cogs and models reuse this dict via utils.helpers.load_config."""
+    start = time.perf_counter()
     try:
-        with open(CONFIG_PATH, 'r') as f:
-            config_data = json.load(f)
-            logger.debug("Configuration loaded successfully.")
-            return config_data
+        config_data = _load_shared_config()
     except Exception as e:
         logger.error(f"❌ Failed to load config from {CONFIG_PATH}: {e}")
         exit(1)
+    if config_data is None:
+        logger.error(f"❌ Failed to load config from {CONFIG_PATH}: file missing")
+        exit(1)
+    startup_ms["config load"] = (time.perf_counter() - start) * 1000
+    logger.debug("Configuration loaded successfully (%.1f ms).", startup_ms["config load"])
+    return config_data
+
+# phase ➜ ms, reported once on the first READY (see startup_report)
+startup_ms: Dict[str, float] = {}
 
 config = load_config()
+configure_logging(config.get('logging'))
 TOKEN = config.get('discord_token')
 DB_CONFIG = config.get('mysql', {})
+# "startup": {"schema_check": true, "concurrent_cogs": true}
+STARTUP_CONFIG = config.get('startup', {})
+# "command_sync": {"scope": "global" | "guilds", "guild_ids": [...]}
+SYNC_CONFIG = config.get('command_sync', {})
 
 # ---------------------
 #   DATABASE SETUP
 # ---------------------
-def run_database_setup():
-    """Runs database_setup.py from the database/ folder to ensure tables are ready."""
+async def run_database_setup() -> bool:
+    """
+    Runs database_setup.py from the database/ folder to ensure tables are ready.
+    Runs as a subprocess, so cog loading and login carry on meanwhile.
+    """
     bot_root = get_bot_root()
     db_setup_path = os.path.join(bot_root, 'database', 'database_setup.py')
     if not os.path.exists(db_setup_path):
         logger.error(f"❌ Database setup script not found at {db_setup_path}. Exiting...")
-        exit(1)
+        return False
     logger.info(f"🔄 Running database setup script at {db_setup_path}")
-    result = subprocess.run(["python3", db_setup_path])
-    if result.returncode == 0:
+    proc = await asyncio.create_subprocess_exec("python3", db_setup_path)
+    try:
+        returncode = await proc.wait()
+    except asyncio.CancelledError:
+        proc.kill()
+        raise
+    if returncode == 0:
         logger.info("✅ Database setup complete.")
-    else:
-        logger.error("❌ Database setup encountered an error. Exiting bot.")
-        exit(1)
+        return True
+    logger.error("❌ Database setup encountered an error. Exiting bot.")
+    return False
+
+def _warm_database() -> None:
+    """Open and close one connection so the first query does not pay for connector setup."""
+    from models.database import Database
+    Database().get_connection().close()
+
+async def warm_caches(bot: commands.Bot) -> None:
+    """
+    Fill reference-data caches while the gateway connects: every cog with a
+    warm_caches() method, plus one DB connection, each in a worker thread.
+    """
+    jobs = {"database": _warm_database}
+    for name, cog in bot.cogs.items():
+        if callable(getattr(cog, "warm_caches", None)):
+            jobs[name] = cog.warm_caches
+    results = await asyncio.gather(
+        *(asyncio.to_thread(job) for job in jobs.values()), return_exceptions=True
+    )
+    for name, result in zip(jobs, results):
+        if isinstance(result, Exception):
+            logger.warning(f"⚠️ Cache warm-up failed for {name}: {result}")
+
+async def _timed(phase: str, coro):
+    start = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        startup_ms[phase] = (time.perf_counter() - start) * 1000
+        if phase == "cache warm" and "first READY" in startup_ms:
+            logger.info(f"Cache warm-up finished after READY ({startup_ms[phase]:.0f} ms).")
+
+def startup_report() -> str:
+    """Phases overlap (see main), so they do not add up to the READY time."""
+    phases = ["config load", "schema check", "cog import", "cache warm"]
+    parts = [f"{p} {startup_ms[p]:.0f} ms" for p in phases if p in startup_ms]
+    if "cache warm" not in startup_ms:
+        parts.append("cache warm still running")
+    return f"Startup: {', '.join(parts)}; first READY after {startup_ms['first READY'] / 1000:.2f} s"
 
 # ---------------------
 #   BOT INTENTS
@@ -75,20 +131,73 @@ intents.members = True
 # ---------------------
 #   BOT INITIALIZATION
 # ---------------------
-bot = commands.Bot(command_prefix="/", intents=intents)
+class AdventureBot(commands.Bot):
+    # started by main() before login, finished by setup_hook
+    schema_task = None
+    cog_task = None
+    warm_task = None
+
+    async def setup_hook(self):
+        # bot.start() calls this after login and before connecting to the
+        # gateway: the schema check and cog loading ran during login, and the
+        # caches warm while the gateway connects.
+        if self.schema_task and not await self.schema_task:
+            exit(1)
+        timings = await self.cog_task
+        for module, seconds in timings.items():
+            if seconds is not None:
+                logger.info(f"✅ Loaded module: {module}")
+        logger.info(timing_report(timings))
+        self.warm_task = asyncio.create_task(_timed("cache warm", warm_caches(self)))
+
+    def dispatch(self, event_name, /, *args, **kwargs):
+        # Listener tasks copy the current context, so every cog handling this
+        # interaction shares one DB-metrics scope and one latency trace
+        # (see utils/db_metrics.py and utils/tracing.py).
+        if event_name == "interaction" and args:
+            label = db_metrics.interaction_label(args[0])
+            with db_metrics.interaction_scope(label), tracing.interaction_trace(label):
+                return super().dispatch(event_name, *args, **kwargs)
+        return super().dispatch(event_name, *args, **kwargs)
+
+bot = AdventureBot(command_prefix="/", intents=intents)
+_commands_synced = False
+
+async def sync_commands():
+    """
+    Sync slash commands once per process, and only the scopes whose
+    definitions changed since the last sync (see utils/command_sync.py).
+    """
+    scope = SYNC_CONFIG.get("scope", "global")
+    guild_ids = None
+    if scope == "guilds":
+        guild_ids = SYNC_CONFIG.get("guild_ids") or [guild.id for guild in bot.guilds]
+    start = time.perf_counter()
+    try:
+        synced = await sync_command_tree(bot, guild_ids)
+    except Exception as e:
+        logger.error(f"❌ Failed to sync slash commands: {e}")
+        return
+    elapsed = (time.perf_counter() - start) * 1000
+    if synced:
+        logger.info(f"✅ Slash commands synced for {synced} ({elapsed:.0f} ms).")
+    else:
+        logger.info(f"✅ Slash commands unchanged; sync skipped ({elapsed:.0f} ms).")
 
 @bot.event
 async def on_ready():
     logger.info(f'🤖 {bot.user.name} is online and ready! Connected to {len(bot.guilds)} server(s).')
+    if "first READY" not in startup_ms:
+        startup_ms["first READY"] = (time.perf_counter() - _STARTED) * 1000
+        logger.info(startup_report())
     await bot.wait_until_ready()
     if not bot.application_id:
         bot.application_id = (await bot.application_info()).id
-    try:
-        await bot.tree.sync()
-        synced_guilds = [guild.id for guild in bot.guilds]
-        logger.info(f"✅ Slash commands synced for {len(synced_guilds)} guilds: {synced_guilds}")
-    except Exception as e:
-        logger.error(f"❌ Failed to sync slash commands: {e}")
+    # on_ready fires again after every reconnect; the tree has not changed since
+    global _commands_synced
+    if not _commands_synced:
+        _commands_synced = True
+        await sync_commands()
     await bot.change_presence(activity=discord.Game(name="Dungeon Adventure!"))
 
 @bot.event
@@ -98,58 +207,30 @@ async def on_shard_connect(shard_id):
 # ---------------------
 #   DYNAMIC COG LOADING
 # ---------------------
-def discover_cogs(root_dirs):
-    """
-    Recursively scans the given list of directories (relative to bot root) for Python files.
-    Only returns modules that define a callable `setup` function.
-    """
-    cogs = []
-    bot_root = get_bot_root()
-    for directory in root_dirs:
-        dir_path = os.path.join(bot_root, directory)
-        if not os.path.exists(dir_path):
-            logger.debug(f"Directory not found (skipping): {dir_path}")
-            continue  # skip if directory doesn't exist
-        for root, _, files in os.walk(dir_path):
-            for file in files:
-                if file.endswith(".py") and file != "__init__.py":
-                    rel_path = os.path.relpath(os.path.join(root, file), bot_root)
-                    module_path = rel_path[:-3].replace(os.sep, ".")
-                    try:
-                        mod = importlib.import_module(module_path)
-                        if hasattr(mod, "setup") and callable(mod.setup):
-                            cogs.append(module_path)
-                        else:
-                            logger.debug(f"Skipping non-cog module: {module_path}")
-                    except Exception as e:
-                        logger.error(f"Error importing module {module_path}: {e}")
-    return cogs
-
-# Only include directories that actually contain cogs.
+# Cogs are found by parsing game/ and hub/ for a top-level setup() (see
+# utils/cog_discovery.py), so nothing is imported until load_extension runs.
 # Our design supports multi-session management and vendor data isolation.
 cog_directories = ["game", "hub"]
 modules = discover_cogs(cog_directories)
-logger.info(f"Discovered cog modules: {modules}")
+logger.info(f"Discovered cog modules: {[m.name for m in modules]}")
 
 # ---------------------
 #   MAIN BOT START
 # ---------------------
 async def main():
-    run_database_setup()
-
     if not TOKEN:
         logger.error("❌ Discord token not found in config. Exiting...")
         return
 
-    for module in modules:
-        try:
-            await bot.load_extension(module)
-            logger.info(f"✅ Loaded module: {module}")
-        except Exception as e:
-            logger.error(f"❌ Failed to load module '{module}': {e}")
-
     # Start the bot using an asynchronous context for proper cleanup.
     async with bot:
+        # schema check, cog loading and login run side by side;
+        # AdventureBot.setup_hook waits for the first two before connecting
+        if STARTUP_CONFIG.get("schema_check", True):
+            bot.schema_task = asyncio.create_task(_timed("schema check", run_database_setup()))
+        bot.cog_task = asyncio.create_task(_timed("cog import", load_cogs(
+            bot, modules, concurrent=STARTUP_CONFIG.get("concurrent_cogs", True)
+        )))
         await bot.start(TOKEN)
 
 if __name__ == '__main__':
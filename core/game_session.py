@@ -5,10 +5,72 @@ Encapsulates an in‑memory representation of a game session,
 including players, turn order, dungeon state, battle state, cooldowns, and trance state.
 """
 
-from typing import List, Optional, Dict, Any
+import time
+from typing import List, Optional, Dict, Any, TypedDict
+
+
+# ── per-player record shapes ─────────────────────────────────────────────
+class TranceState(TypedDict):
+    trance_id: int
+    name: str
+    remaining: int
+    max: int
+
+
+class IllusionState(TypedDict, total=False):
+    room_id: int
+    sequence: List[str]
+    current_index: int
+    failures: int
+
+
+class StatusEffectEntry(TypedDict, total=False):
+    effect_id: int
+    effect_name: str
+    remaining: int
+    icon: str
+
+
+# Per-player maps whose keys are player ids (JSON turns them into strings).
+_PLAYER_KEYED = (
+    "trance_states", "ability_cooldowns", "temp_ability_cooldowns",
+    "status_effects", "illusion_states", "illusion_cleared",
+)
 
 
 class GameSession:
+    # Everything written to game_state by to_dict(), in order.
+    PERSISTED = (
+        "session_id", "guild_id", "thread_id", "owner_id",
+        "difficulty", "num_players", "players", "current_turn",
+        "status", "current_floor", "total_floors", "message_id",
+        "game_log", "game_state", "battle_state",
+        "ability_cooldowns", "temp_ability_cooldowns", "trance_states",
+        "status_effects", "current_enemy", "illusion_states", "illusion_cleared",
+        "battle_pace",
+    )
+    # Runtime-only bookkeeping; reset on load.
+    TRANSIENT = (
+        "victory_pending", "victory_embed_sent", "last_victory_enemy",
+        "queue_posted", "last_death_msg_id", "_status_engine", "last_active",
+    )
+    __slots__ = PERSISTED + TRANSIENT
+    # Bump when the to_dict() shape changes and register the step in
+    # utils.save_codec.UPGRADES. 0 is the old JSON game_state save.
+    SCHEMA_VERSION = 2
+    # to_dict() keys grouped by how they change, for autosave deltas.
+    SAVE_SECTIONS = {
+        "core":      ("session_id", "guild_id", "thread_id", "owner", "difficulty",
+                      "num_players", "players", "status", "message_id", "battle_pace"),
+        "turn":      ("current_turn", "current_floor", "total_floors"),
+        "log":       ("game_log",),
+        "world":     ("game_state",),
+        "battle":    ("battle_state", "current_enemy", "status_effects"),
+        "cooldowns": ("ability_cooldowns", "temp_ability_cooldowns"),
+        "trance":    ("trance_states",),
+        "illusion":  ("illusion_states", "illusion_cleared"),
+    }
+
     def __init__(
         self,
         session_id: int,
@@ -51,26 +113,38 @@ class GameSession:
         self.victory_pending: bool = False
         self.victory_embed_sent: bool = False
         self.last_victory_enemy: Optional[Dict[str, Any]] = None
+        # StatusEffectEngine bound to this battle (built by BattleSystem)
+        self._status_engine: Optional[Any] = None
 
         # ── trance state ────────────────────────────────────────────────
-        # { player_id: { "trance_id": int, "name": str, "remaining": int, "max": int } }
-        self.trance_states: Dict[int, Dict[str, Any]] = {}
+        self.trance_states: Dict[int, TranceState] = {}
 
         # ── ability cooldowns ────────────────────────────────────────────
-        # { player_id: { ability_id: remaining_seconds } }
-        self.ability_cooldowns: Dict[int, Dict[int, float]] = {}
+        # { player_id | enemy_id: { ability_id: remaining_turns } }
+        self.ability_cooldowns: Dict[int, Dict[int, int]] = {}
         # ── temporary ability cooldowns ──────────────────────────────────
         # { player_id: { temp_ability_id: remaining_turns } }
         self.temp_ability_cooldowns: Dict[int, Dict[int, int]] = {}
         # ── status effects ───────────────────────────────────────────────
-        # { player_id: [ { "effect_id": int, "remaining": int }, … ] }
-        self.status_effects: Dict[int, List[Dict[str, Any]]] = {}
+        self.status_effects: Dict[int, List[StatusEffectEntry]] = {}
         # ── illusion rooms ───────────────────────────────────────────────
-        # { player_id: {"room_id": int, "sequence": [...], "current_index": int, "failures": int} }
-        self.illusion_states: Dict[int, Dict[str, Any]] = {}
+        self.illusion_states: Dict[int, IllusionState] = {}
         # { player_id: [room_id, ...] }
         self.illusion_cleared: Dict[int, List[int]] = {}
 
+        # ── battle pacing ────────────────────────────────────────────────
+        # "fast" | "normal" | "slow"; None follows the guild / config default
+        self.battle_pace: Optional[str] = None
+
+        # ── UI bookkeeping ───────────────────────────────────────────────
+        self.queue_posted: bool = False                 # difficulty chosen, queue/LFG sent
+        self.last_death_msg_id: Optional[int] = None    # death embed to clean up
+        self.last_active: float = time.monotonic()      # see touch(); drives idle eviction
+
+    def touch(self) -> None:
+        """Record player activity (SessionManager evicts sessions idle too long)."""
+        self.last_active = time.monotonic()
+
     def add_player(self, player_id: int) -> None:
         if player_id in self.players or len(self.players) >= 6:
             raise Exception("Cannot add player.")
@@ -119,29 +193,26 @@ class GameSession:
                 cds[aid] = max(cds[aid] - amount, 0.0)
 
     def to_dict(self) -> Dict[str, Any]:
+        data = {name: getattr(self, name) for name in self.PERSISTED}
+        data["owner"] = data.pop("owner_id")
+        return data
+
+    def save_sections(self) -> Dict[str, Dict[str, Any]]:
+        """to_dict() split into SAVE_SECTIONS."""
+        data = self.to_dict()
         return {
-            "session_id": self.session_id,
-            "guild_id": self.guild_id,
-            "thread_id": self.thread_id,
-            "owner": self.owner_id,
-            "difficulty": self.difficulty,
-            "num_players": self.num_players,
-            "players": self.players,
-            "current_turn": self.current_turn,
-            "status": self.status,
-            "current_floor": self.current_floor,
-            "total_floors": self.total_floors,
-            "message_id": self.message_id,
-            "game_log": self.game_log,
-            "game_state": self.game_state,
-            "battle_state": self.battle_state,
-            "ability_cooldowns": self.ability_cooldowns,
-            "temp_ability_cooldowns": self.temp_ability_cooldowns,
-            "trance_states": self.trance_states,
-            "status_effects": self.status_effects,
-            "current_enemy": self.current_enemy,
-            "illusion_states": self.illusion_states,
-            "illusion_cleared": self.illusion_cleared
+            name: {key: data[key] for key in keys}
+            for name, keys in self.SAVE_SECTIONS.items()
+        }
+
+    @staticmethod
+    def _int_keys(mapping: Optional[Dict[Any, Any]]) -> Dict[Any, Any]:
+        """Restore numeric dict keys that a JSON round-trip turned into strings."""
+        if not mapping:
+            return {}
+        return {
+            int(k) if isinstance(k, str) and k.lstrip("-").isdigit() else k: v
+            for k, v in mapping.items()
         }
 
     @classmethod
@@ -163,13 +234,16 @@ class GameSession:
         gs.players           = data.get("players", [])
         gs.current_turn      = data.get("current_turn")
         gs.battle_state      = data.get("battle_state")
-        gs.ability_cooldowns = data.get("ability_cooldowns", {})
-        gs.temp_ability_cooldowns = data.get("temp_ability_cooldowns", {})
-        gs.trance_states     = data.get("trance_states", {})
-        gs.status_effects    = data.get("status_effects", {})
         gs.current_enemy     = data.get("current_enemy")
-        gs.illusion_states   = data.get("illusion_states", {})
-        gs.illusion_cleared  = data.get("illusion_cleared", {})
+        gs.battle_pace       = data.get("battle_pace")
+        for name in _PLAYER_KEYED:
+            setattr(gs, name, cls._int_keys(data.get(name)))
+        gs.ability_cooldowns = {
+            k: cls._int_keys(v) for k, v in gs.ability_cooldowns.items()
+        }
+        gs.temp_ability_cooldowns = {
+            k: cls._int_keys(v) for k, v in gs.temp_ability_cooldowns.items()
+        }
         return gs
 
     def __repr__(self) -> str:
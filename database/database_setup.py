@@ -836,6 +836,7 @@ TABLES = {
             message_id    BIGINT,
             game_log      JSON,
             game_state    JSON,
+            save_blob     LONGBLOB NULL,
             created_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
         )
@@ -1208,6 +1209,7 @@ TABLES = {
             save_title VARCHAR(100) NOT NULL,
             is_auto_save BOOLEAN NOT NULL DEFAULT FALSE,
             saved_state JSON NOT NULL,
+            save_blob LONGBLOB NULL,
             timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             PRIMARY KEY (session_id, slot),
             FOREIGN KEY (session_id) REFERENCES sessions(session_id) ON DELETE CASCADE
@@ -1320,7 +1322,35 @@ TABLES = {
             gil              INT DEFAULT 0,
             enemies_defeated INT DEFAULT 0,
             play_time        INT DEFAULT 0,
-            completed_at     TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            completed        TINYINT(1) NOT NULL DEFAULT 0,
+            completed_at     TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_high_scores_fastest   (guild_id, completed, play_time),
+            INDEX idx_high_scores_enemies   (guild_id, enemies_defeated),
+            INDEX idx_high_scores_gil       (guild_id, gil),
+            INDEX idx_high_scores_level     (guild_id, player_level)
+        )
+    ''',
+    # ---------- lfg_posts ----------
+    'lfg_posts': '''
+        CREATE TABLE IF NOT EXISTS lfg_posts (
+            session_id        INT PRIMARY KEY,
+            hub_channel_id    BIGINT,
+            hub_message_id    BIGINT,
+            queue_message_id  BIGINT,
+            created_at        TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES sessions(session_id) ON DELETE CASCADE
+        )
+    ''',
+    # ---------- session_deltas ----------
+    'session_deltas': '''
+        CREATE TABLE IF NOT EXISTS session_deltas (
+            delta_id    BIGINT AUTO_INCREMENT PRIMARY KEY,
+            session_id  INT NOT NULL,
+            section     VARCHAR(32) NOT NULL,
+            payload     BLOB NOT NULL,
+            created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_session_deltas_session (session_id, delta_id),
+            FOREIGN KEY (session_id) REFERENCES sessions(session_id) ON DELETE CASCADE
         )
     '''
 }
@@ -1371,7 +1401,9 @@ TABLE_ORDER = [
     'item_effects',
     'hub_embeds',
     'hub_buttons',
-    'high_scores'
+    'high_scores',
+    'lfg_posts',
+    'session_deltas'
 ]
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -1773,6 +1805,46 @@ def insert_hub_embeds(cur):
     )
     logger.info("Inserted hub_embeds.")
 
+# Columns added after a table first shipped: (table, column, definition).
+# CREATE TABLE IF NOT EXISTS won't touch an existing table, so add them here.
+ADDED_COLUMNS: List[Tuple[str, str, str]] = [
+    ("sessions", "save_blob", "LONGBLOB NULL"),
+    ("session_saves", "save_blob", "LONGBLOB NULL"),
+    ("high_scores", "completed", "TINYINT(1) NOT NULL DEFAULT 0"),
+]
+
+def ensure_added_columns(cur):
+    for table, column, definition in ADDED_COLUMNS:
+        cur.execute(
+            "SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+            (table, column)
+        )
+        if cur.fetchone()[0]:
+            continue
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        logger.info("Added column `%s.%s`.", table, column)
+
+# Indexes added after a table first shipped: (table, index, columns).
+ADDED_INDEXES: List[Tuple[str, str, str]] = [
+    ("high_scores", "idx_high_scores_fastest",   "guild_id, completed, play_time"),
+    ("high_scores", "idx_high_scores_enemies",   "guild_id, enemies_defeated"),
+    ("high_scores", "idx_high_scores_gil",       "guild_id, gil"),
+    ("high_scores", "idx_high_scores_level",     "guild_id, player_level"),
+]
+
+def ensure_added_indexes(cur):
+    for table, index, columns in ADDED_INDEXES:
+        cur.execute(
+            "SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s",
+            (table, index)
+        )
+        if cur.fetchone()[0]:
+            continue
+        cur.execute(f"CREATE INDEX {index} ON {table} ({columns})")
+        logger.info("Added index `%s.%s`.", table, index)
+
 # ═══════════════════════════════════════════════════════════════════════════
 #  MAIN
 # ═══════════════════════════════════════════════════════════════════════════
@@ -1785,6 +1857,8 @@ def main() -> None:
                 for tbl in TABLE_ORDER:
                     cur.execute(TABLES[tbl])
                     logger.debug("Table `%s` ready.", tbl)
+                ensure_added_columns(cur)
+                ensure_added_indexes(cur)
 
                 # ── seed data (order matters) ──────────────────────────────────
                 insert_difficulties(cur)
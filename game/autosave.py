@@ -0,0 +1,139 @@
+# game/autosave.py
+
+import asyncio
+import logging
+import time
+from typing import Dict, Tuple
+
+from discord.ext import commands, tasks
+
+from core.game_session import GameSession
+from models.session_models import SessionModel
+from utils import save_codec
+from utils.helpers import load_config
+
+logger = logging.getLogger("Autosave")
+
+
+class Autosave(commands.Cog):
+    """
+    Periodically persists every in-memory GameSession.
+
+    Each pass fingerprints the session's SAVE_SECTIONS and writes only the
+    sections that changed since the last pass, as small rows in
+    `session_deltas`. After `compact_every` deltas (and the first time a
+    session is seen) the whole state is written to `sessions.save_blob`
+    instead and the deltas are dropped, so loading never replays much.
+
+    Anything else that writes a full save blob (Save Game, eviction) does
+    it under session_lock(), so a delta encoded before that save can't be
+    inserted after the save has cleared the older deltas.
+
+    config.json (all optional):
+        "autosave": {"interval_seconds": 60, "compact_every": 20}
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        cfg = load_config().get("autosave", {})
+        self.interval = float(cfg.get("interval_seconds", 60))
+        self.compact_every = int(cfg.get("compact_every", 20))
+        # session_id -> ({section: fingerprint}, deltas written since last compaction)
+        self._marks: Dict[int, Tuple[Dict[str, int], int]] = {}
+        self._lock = asyncio.Lock()
+        # session_id -> lock held while a save blob or delta for it is written
+        self._session_locks: Dict[int, asyncio.Lock] = {}
+        self.autosave_loop.change_interval(seconds=self.interval)
+        logger.info("Autosave cog initialized (every %.0fs).", self.interval)
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        # started here rather than in cog_load: cogs load before login
+        if not self.autosave_loop.is_running():
+            self.autosave_loop.start()
+
+    async def cog_unload(self) -> None:
+        self.autosave_loop.cancel()
+        await self.flush_all()
+
+    @tasks.loop(seconds=60)
+    async def autosave_loop(self) -> None:
+        await self.flush_all()
+
+    def forget(self, session_id: int) -> None:
+        """Drop bookkeeping for a session that ended or was reloaded."""
+        self._marks.pop(session_id, None)
+        lock = self._session_locks.get(session_id)
+        if lock is not None and not lock.locked():
+            del self._session_locks[session_id]
+
+    def session_lock(self, session_id: int) -> asyncio.Lock:
+        """Serialises autosave writes with other full saves of one session."""
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = self._session_locks[session_id] = asyncio.Lock()
+        return lock
+
+    async def flush_all(self) -> None:
+        """Run one autosave pass over every in-memory session."""
+        sm = self.bot.get_cog("SessionManager")
+        if not sm:
+            return
+        async with self._lock:
+            start = time.perf_counter()
+            live = dict(sm.sessions)
+            for sid in list(self._marks):
+                if sid not in live:
+                    self.forget(sid)
+
+            written = 0
+            for session in live.values():
+                try:
+                    written += await self.flush_session(session)
+                except Exception as e:
+                    logger.error("Autosave failed for session %s: %s",
+                                 session.session_id, e, exc_info=True)
+            if written:
+                logger.debug("Autosaved %d session(s), %d bytes in %.1f ms.",
+                             len(live), written, (time.perf_counter() - start) * 1000)
+
+    async def flush_session(self, session: GameSession) -> int:
+        """
+        Persist whatever changed in `session` since its last autosave.
+        Encoding happens here on the event loop (so the state can't shift
+        underneath it); only the finished bytes go to the DB thread.
+        Returns the number of bytes written.
+        """
+        async with self.session_lock(session.session_id):
+            return await self._flush_session(session)
+
+    async def _flush_session(self, session: GameSession) -> int:
+        sid = session.session_id
+        sections = session.save_sections()
+        prints = {name: save_codec.fingerprint(data) for name, data in sections.items()}
+        marks = self._marks.get(sid)
+
+        if marks is None or marks[1] >= self.compact_every:
+            state = {}
+            for data in sections.values():
+                state.update(data)
+            blob = save_codec.dumps(state, schema_version=GameSession.SCHEMA_VERSION)
+            await asyncio.to_thread(SessionModel.write_session_blob, sid, blob, False)
+            self._marks[sid] = (prints, 0)
+            return len(blob)
+
+        last, count = marks
+        changed = {
+            name: save_codec.dumps(sections[name], schema_version=GameSession.SCHEMA_VERSION)
+            for name, fp in prints.items() if last.get(name) != fp
+        }
+        if not changed:
+            return 0
+        size = await asyncio.to_thread(SessionModel.append_session_deltas, sid, changed)
+        self._marks[sid] = (prints, count + len(changed))
+        return size
+
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(Autosave(bot))
+    logger.info("Autosave cog loaded ✔")
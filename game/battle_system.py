@@ -1,4 +1,5 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
 import mysql.connector
 import json
@@ -8,7 +9,11 @@ import asyncio
 import random
 from utils.status_engine   import StatusEffectEngine
 from utils.ability_engine import AbilityEngine
+from utils.battle_engine import BattleEngine
 from utils.helpers import load_config
+from utils.db_metrics import instrument
+from utils import tracing
+from utils.minimap import invalidate_floor
 from typing import Any, Dict, List, Optional, Set, Tuple
 from utils.ui_helpers import (
     create_cooldown_bar,
@@ -20,7 +25,6 @@ from utils.ui_helpers import (
 from models.session_models import SessionPlayerModel
 
 logger = logging.getLogger("BattleSystem")
-logger.setLevel(logging.DEBUG)
 
 
 class BattleSystem(commands.Cog):
@@ -31,6 +35,27 @@ class BattleSystem(commands.Cog):
         self.embed_manager: Optional[commands.Cog] = self.bot.get_cog("EmbedManager")
         # AbilityEngine handles ALL ability logic & damage formulas
         self.ability = AbilityEngine(self.db_connect, self.config.get("damage_variance", 0.0))
+        # BattleEngine applies the combat rules; this cog renders and persists them
+        self.engine = BattleEngine(self.ability)
+
+        # pause between the player's action and the enemy's reply (see battle_pace)
+        pcfg = self.config.get("battle", {})
+        self.pace_seconds: Dict[str, float] = {**self.PACE_SECONDS, **pcfg.get("pace_seconds", {})}
+        self.default_pace: str = pcfg.get("pace", "normal")
+        self.guild_paces: Dict[int, str] = {int(g): p for g, p in pcfg.get("guild_pace", {}).items()}
+        # session_id ➜ scheduled enemy reply
+        self._enemy_turns: Dict[int, asyncio.Task] = {}
+
+    PACE_SECONDS = {"fast": 0.0, "normal": 1.0, "slow": 2.0}
+
+    async def cog_unload(self) -> None:
+        for task in self._enemy_turns.values():
+            task.cancel()
+        self._enemy_turns.clear()
+
+    def warm_caches(self) -> None:
+        """Compile the ability catalog now instead of on the first resolve (run in a thread at startup)."""
+        self.ability.load_catalog()
 
     # --------------------------------------------------------------------- #
     #                               Helpers                                 #
@@ -40,31 +65,40 @@ class BattleSystem(commands.Cog):
         gm = self.bot.get_cog("GameMaster")
         gm.append_game_log(session_id, line)
 
+    def _append_battle_logs(self, session_id: int, lines: List[str]):
+        """Batched variant used by StatusEffectEngine for a whole tick."""
+        gm = self.bot.get_cog("GameMaster")
+        gm.append_game_logs(session_id, lines)
+
+    def _bind_status_engine(self, session: Any) -> StatusEffectEngine:
+        """Attach a StatusEffectEngine whose log lines go to the DB and the in-memory battle log."""
+        def battle_log(sid: int, line: str):
+            # 1) persist to your normal battle_log table via GameMaster
+            self._append_battle_log(sid, line)
+            # 2) append it _in memory_ so update_battle_embed will render it
+            session.game_log.append(line)
+
+        def battle_log_many(sid: int, lines: List[str]):
+            self._append_battle_logs(sid, lines)
+            session.game_log.extend(lines)
+
+        session._status_engine = StatusEffectEngine(
+            session,
+            battle_log,
+            battle_log_many
+        )
+        return session._status_engine
+
     def db_connect(self):
         try:
-            return mysql.connector.connect(**self.db_config)
+            return instrument(mysql.connector.connect(**self.db_config))
         except Exception as e:
             logger.error("DB connection error in BattleSystem: %s", e)
             raise
 
     def _normalize_se(self, raw: Dict[str,Any]) -> Dict[str,Any]:
-        """
-        Turn raw engine output into exactly the 3 keys our UI helper wants:
-          - icon (str)
-          - effect_name (str)
-          - remaining (int)
-        plus anything else your engine attaches (damage_per_turn, etc.)
-        """
-        out = {
-            "effect_id":   raw.get("effect_id"),
-            "effect_name": raw.get("effect_name"),
-            "remaining":   raw.get("remaining", raw.get("remaining_turns", 0)),
-            "icon":        raw.get("icon") or raw.get("icon_url",""),
-            # preserve any extra tick fields
-            **{k: v for k,v in raw.items() if k in ("damage_per_turn","heal_per_turn")}
-        }
-        out["target"] = raw.get("target", "self")
-        return out
+        """See BattleEngine.normalize_se."""
+        return BattleEngine.normalize_se(raw)
     # --------------------------------------------------------------------- #
     #                     Room / Template utilities                         #
     # --------------------------------------------------------------------- #
@@ -147,6 +181,7 @@ class BattleSystem(commands.Cog):
             conn.commit()
             cursor.close()
             conn.close()
+            invalidate_floor(floor_id)
             logger.debug("Replaced monster room (id=%s) with safe room.", old_room_id)
             return 1
         except Exception as e:
@@ -267,35 +302,68 @@ class BattleSystem(commands.Cog):
     def reduce_player_cooldowns(self, session: Any, player_id: int) -> None:
         if not hasattr(session, "ability_cooldowns") or session.ability_cooldowns is None:
             session.ability_cooldowns = {}
-        cds = session.ability_cooldowns.get(player_id, {})
 
-        conn = self.db_connect()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(
-            "SELECT speed, class_id FROM players WHERE player_id = %s AND session_id = %s",
-            (player_id, session.session_id),
-        )
-        player = cursor.fetchone()
-        cursor.close(); conn.close()
+        player = self._combatant(session, player_id, load=False) or self._fetch_combatant(session, player_id)
         if not player:
             return
+        self.engine.reduce_player_cooldowns(session, player_id, player)
 
-        player_speed = player["speed"]
+    # --------------------------------------------------------------------- #
+    #                    Combatant snapshot (battle_state)                  #
+    # --------------------------------------------------------------------- #
+    def _fetch_combatant(self, session: Any, player_id: int) -> Optional[Dict[str, Any]]:
+        """One round-trip for every player stat the battle code reads."""
         conn = self.db_connect()
         cursor = conn.cursor(dictionary=True)
         cursor.execute(
-            "SELECT base_speed FROM classes WHERE class_id = %s",
-            (player["class_id"],),
+            """
+            SELECT p.hp, p.max_hp, p.attack_power, p.magic_power,
+                   p.defense, p.magic_defense, p.accuracy, p.evasion,
+                   p.speed, COALESCE(c.base_speed, 10) AS base_speed
+              FROM players p
+              LEFT JOIN classes c ON c.class_id = p.class_id
+             WHERE p.player_id = %s AND p.session_id = %s
+            """,
+            (player_id, session.session_id),
         )
-        class_data = cursor.fetchone()
+        row = cursor.fetchone()
         cursor.close(); conn.close()
+        if row:
+            row["hp_dirty"] = False
+        return row
 
-        base = class_data["base_speed"] if class_data else 10
-        multiplier = player_speed / base
-        for aid in list(cds):
-            cds[aid] = max(cds[aid] - multiplier, 0)
-
-        session.ability_cooldowns[player_id] = cds
+    def _combatant(self, session: Any, player_id: int, load: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Return the in-memory stat snapshot for `player_id` in the current battle,
+        loading it once on first use. Outside a battle there is no snapshot
+        and this returns None.
+        """
+        state = session.battle_state
+        if not state or session.current_enemy is None:
+            return None
+        combatants = state.setdefault("combatants", {})
+        snap = combatants.get(player_id)
+        if snap is None and load:
+            snap = self._fetch_combatant(session, player_id)
+            if snap:
+                combatants[player_id] = snap
+        return snap
+
+    def _set_combatant_hp(self, session: Any, player_id: int, new_hp: int) -> None:
+        """Change HP in memory only; persisted by _flush_combatants."""
+        snap = self._combatant(session, player_id)
+        if snap is None:
+            return self._update_player_hp(player_id, session.session_id, new_hp)
+        snap["hp"] = max(0, min(new_hp, snap["max_hp"]))
+        snap["hp_dirty"] = True
+
+    def _flush_combatants(self, session: Any) -> None:
+        """Persist batched HP changes – at most one UPDATE per dirty combatant."""
+        state = session.battle_state or {}
+        for pid, snap in (state.get("combatants") or {}).items():
+            if snap.get("hp_dirty"):
+                self._update_player_hp(pid, session.session_id, snap["hp"])
+                snap["hp_dirty"] = False
 
     def get_session(self, channel_id: int) -> Optional[Any]:
         mgr = self.bot.get_cog("SessionManager")
@@ -304,75 +372,93 @@ class BattleSystem(commands.Cog):
             return None
         return mgr.get_session(channel_id)
 
+    def _enemy_kit(self, session: Any, enemy: Dict[str,Any]) -> List[Dict[str,Any]]:
+        """
+        The enemy’s kit preloaded into battle_state at battle start
+        (loaded lazily if a restored battle has none).
+        """
+        state = session.battle_state or {}
+        kit = state.get("enemy_kit")
+        if kit is None:
+            kit = self.ability.load_enemy_kit(enemy["enemy_id"])
+            state["enemy_kit"] = kit
+        return kit
+
     def choose_enemy_ability(self, session: Any, enemy: Dict[str,Any]) -> Optional[Dict[str,Any]]:
         """
-        Pick one of this enemy’s abilities, respecting:
-          – Silence status on enemy_effects
-          – Per‐turn cooldowns (–1 each turn, +cooldown on use)
-          – Healing only when hp% ≤ heal_threshold_pct & can_heal=1
-          – Weighted random choice by ea.weight
+        Pick one of this enemy’s abilities from its kit.
         Returns None to fall back to a plain Attack.
         """
-        eid = enemy["enemy_id"]
-
-        # 1) If silenced, no spells at all
-        if any(eff.get("effect_name") == "Silence"
-               for eff in session.battle_state.get("enemy_effects", [])):
-            return None
+        return self.ability.choose_enemy_ability(session, enemy, self._enemy_kit(session, enemy))
 
-        # 2) Decrement this enemy’s cooldowns by 1
-        session.ability_cooldowns = getattr(session, "ability_cooldowns", {}) or {}
-        cds = session.ability_cooldowns.get(eid, {})
-        for aid in list(cds):
-            cds[aid] = max(cds[aid] - 1, 0)
-        session.ability_cooldowns[eid] = cds
-
-        # 3) Load all enemy_abilities + ability metadata
-        conn = self.db_connect()
-        cur  = conn.cursor(dictionary=True)
-        cur.execute("""
-            SELECT ea.ability_id, ea.weight,
-                   ea.can_heal, ea.heal_threshold_pct,
-                   ea.heal_amount_pct,
-                   a.ability_name, a.effect, a.cooldown,
-                   a.special_effect, a.target_type, a.icon_url,
-                   a.element_id
-              FROM enemy_abilities ea
-              JOIN abilities a USING (ability_id)
-             WHERE ea.enemy_id = %s
-        """, (eid,))
-        rows = cur.fetchall()
-        cur.close(); conn.close()
+    # --------------------------------------------------------------------- #
+    #                               Pacing                                  #
+    # --------------------------------------------------------------------- #
+    def battle_pace(self, session: Any) -> str:
+        """The session's own pace, else its guild's, else config battle.pace."""
+        pace = session.battle_pace or self.guild_paces.get(session.guild_id) or self.default_pace
+        return pace if pace in self.pace_seconds else "normal"
 
-        # 4) Filter out on‐cooldown & out‐of‐threshold heals
-        pool = []
-        pct  = enemy["hp"] / enemy["max_hp"]
-        for r in rows:
-            aid = r["ability_id"]
-            if cds.get(aid, 0) > 0:
-                continue
-            if r["can_heal"] and pct > (r["heal_threshold_pct"] or 0):
-                continue
-            pool.append(r)
-
-        if not pool:
-            return None
+    def pending_enemy_turn(self, session: Any) -> Optional[asyncio.Task]:
+        task = self._enemy_turns.get(session.session_id)
+        return task if task is not None and not task.done() else None
 
-        # 5) Weighted random pick
-        total = sum(r["weight"] for r in pool)
-        pick  = random.uniform(0, total)
-        upto  = 0.0
-        for r in pool:
-            upto += r["weight"]
-            if pick <= upto:
-                # apply its cooldown
-                cd = r.get("cooldown") or 0
-                if cd > 0:
-                    cds[r["ability_id"]] = cd
-                    session.ability_cooldowns[eid] = cds
-                return r
+    async def _after_player_action(self, interaction: discord.Interaction, session: Any,
+                                   pid: int, enemy: Dict[str, Any]) -> None:
+        """
+        Let the enemy reply to the player's action. Fast mode (0 s) runs
+        the enemy turn right away so both land in one render; otherwise the
+        player's action is shown now and the reply is scheduled as its own
+        task, so this interaction returns instead of sleeping.
+        """
+        delay = self.pace_seconds[self.battle_pace(session)]
+        if delay <= 0:
+            return await self.enemy_turn(interaction, enemy)
+        await self.update_battle_embed(interaction, pid, enemy)
+        self._enemy_turns[session.session_id] = asyncio.create_task(
+            self._delayed_enemy_turn(interaction, session.session_id, enemy, delay)
+        )
 
-        return None
+    async def _delayed_enemy_turn(self, interaction: discord.Interaction, session_id: int,
+                                  enemy: Dict[str, Any], delay: float) -> None:
+        try:
+            await asyncio.sleep(delay)
+            with tracing.span("enemy_turn"):
+                await self.enemy_turn(interaction, enemy)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Enemy turn failed for session %s: %s", session_id, e, exc_info=True)
+        finally:
+            if self._enemy_turns.get(session_id) is asyncio.current_task():
+                del self._enemy_turns[session_id]
+
+    @app_commands.command(
+        name="battlepace",
+        description="Set how quickly enemies reply in this game's battles."
+    )
+    @app_commands.describe(pace="fast resolves your action and the enemy's in one update; default follows the server")
+    @app_commands.choices(pace=[
+        app_commands.Choice(name="fast", value="fast"),
+        app_commands.Choice(name="normal", value="normal"),
+        app_commands.Choice(name="slow", value="slow"),
+        app_commands.Choice(name="server default", value="default"),
+    ])
+    async def battlepace(self, interaction: discord.Interaction, pace: str) -> None:
+        session = self.get_session(interaction.channel.id)
+        if not session:
+            return await interaction.response.send_message(
+                "❌ Use this inside your game thread.", ephemeral=True
+            )
+        perms = getattr(interaction.user, "guild_permissions", None)
+        if interaction.user.id != session.owner_id and not (perms and perms.administrator):
+            return await interaction.response.send_message(
+                "❌ Only the game's owner can change its pace.", ephemeral=True
+            )
+        session.battle_pace = None if pace == "default" else pace
+        await interaction.response.send_message(
+            f"⏱️ Battle pace: **{self.battle_pace(session)}**", ephemeral=True
+        )
 
     # --------------------------------------------------------------------- #
     #                           Battle sequence                             #
@@ -422,6 +508,9 @@ class BattleSystem(commands.Cog):
                 session.game_state = new_room
 
         # ─── Completely tear down combat state ─────────────────────────
+        # 0) Persist whatever HP the fighter ended the battle on
+        self._flush_combatants(session)
+
         # 1) Clear out any lingering player‐side DoT/status effects
         if session.battle_state:
             session.battle_state.pop("player_effects", None)
@@ -444,7 +533,12 @@ class BattleSystem(commands.Cog):
         if not session:
             return await interaction.response.send_message("❌ No session found.", ephemeral=True)
 
-        session.battle_state     = {"enemy": enemy, "player_effects": [], "enemy_effects": []}
+        session.battle_state     = {
+            "enemy": enemy,
+            "player_effects": [],
+            "enemy_effects": [],
+            "enemy_kit": self.ability.load_enemy_kit(enemy["enemy_id"]),
+        }
         session.victory_pending = False
         session.victory_embed_sent = False
         session.last_victory_enemy = None
@@ -462,25 +556,10 @@ class BattleSystem(commands.Cog):
         enemy["gil_pool"]        = enemy.get("gil_drop", 0)
         session.game_log         = ["Battle initiated!"]
         session.current_enemy    = enemy
-        def battle_log(sid: int, line: str):
-            # 1) persist to your normal battle_log table via GameMaster
-            self._append_battle_log(sid, line)
-            # 2) append it _in memory_ so update_battle_embed will render it
-            session.game_log.append(line)
+        self._bind_status_engine(session)
 
-        session._status_engine = StatusEffectEngine(
-            session,
-            battle_log
-        )
-
-        conn = self.db_connect()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(
-            "SELECT hp, max_hp, defense, attack_power FROM players WHERE player_id = %s AND session_id = %s",
-            (player_id, session.session_id),
-        )
-        player = cursor.fetchone()
-        cursor.close(); conn.close()
+        # 3) snapshot the fighter's stats once; the rest of the battle works on it in memory
+        player = self._combatant(session, player_id)
 
         self.embed_manager = self.embed_manager or self.bot.get_cog("EmbedManager")
         role = enemy.get("role", "normal")
@@ -554,14 +633,9 @@ class BattleSystem(commands.Cog):
         if not session.battle_state or session.current_enemy is None:
             return
 
-        conn = self.db_connect()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(
-            "SELECT hp, max_hp, defense, attack_power FROM players WHERE player_id = %s AND session_id = %s",
-            (player_id, session.session_id),
-        )
-        player = cursor.fetchone()
-        cursor.close(); conn.close()
+        player = self._combatant(session, player_id)
+        if not player:
+            return
 
         role = enemy.get("role", "normal")
         if role == "boss":
@@ -711,7 +785,7 @@ class BattleSystem(commands.Cog):
         session.temp_ability_cooldowns = getattr(session, "temp_ability_cooldowns", {}) or {}
         temp_cds = session.temp_ability_cooldowns.get(pid, {})
         for a in temp_abilities:
-            a["ability_id"] = a.pop("temp_ability_id")
+            a["ability_id"] = a["temp_ability_id"]
             a["cooldown"] = a.pop("cooldown_turns", 0)
             a["duration_turns"] = a.pop("duration_turns", 0)
             a["remaining_duration"] = a.pop("remaining_turns", 0)
@@ -778,6 +852,7 @@ class BattleSystem(commands.Cog):
             buttons=buttons
         )
 
+    @tracing.traced("handle_skill_use")
     async def handle_skill_use(self, interaction: discord.Interaction, ability_id: int) -> None:
         mgr = self.bot.get_cog("SessionManager")
         if not mgr or not self.embed_manager:
@@ -840,15 +915,8 @@ class BattleSystem(commands.Cog):
                 return
 
 
-        # 2) fetch player stats
-        conn = self.db_connect()
-        cur = conn.cursor(dictionary=True)
-        cur.execute(
-            "SELECT hp, max_hp, attack_power, magic_power, defense, magic_defense, accuracy, evasion FROM players WHERE player_id=%s AND session_id=%s",
-            (pid, session.session_id),
-        )
-        player = cur.fetchone()
-        cur.close(); conn.close()
+        # 2) player stats: the battle snapshot in combat, a fresh read otherwise
+        player = self._combatant(session, pid) if in_battle else self._fetch_combatant(session, pid)
         if not player:
             return await interaction.response.send_message("❌ Could not retrieve your stats.", ephemeral=True)
         
@@ -907,16 +975,8 @@ class BattleSystem(commands.Cog):
 
         
 
-        # 4) Emit exactly one log line per result.type, or fall back on engine.logs for niche cases
-        if result.type == "damage":
-            session.game_log.append(
-                f"You use {ability_meta['ability_name']} and deal {result.amount} damage!"
-            )
-        elif result.type == "dot":
-            session.game_log.append(
-                f"{enemy['enemy_name']} has been afflicted by {result.dot['effect_name']}."
-            )
-        else:
+        # 4) damage / dot fall through to BattleEngine below; everything else is handled here
+        if result.type not in ("damage", "dot"):
             # miss, heal, pilfer, mug, etc.
             session.game_log.extend(result.logs)
             # ── If we’re *outside* battle and this was a self‐target skill ──
@@ -933,13 +993,13 @@ class BattleSystem(commands.Cog):
             if result.type in ("heal", "set_hp"):
                 # e.g. “heal” gives you result.amount HP
                 # or “set_hp” forces to exactly result.amount
-                old_hp = self._get_player_hp(pid, session.session_id)
                 new_hp = result.amount if result.type == "set_hp" else min(
-                    old_hp + result.amount,
-                    self._get_player_max_hp(pid, session.session_id),
+                    player["hp"] + result.amount,
+                    player["max_hp"],
                 )
-                self._update_player_hp(pid, session.session_id, new_hp)
+                self._set_combatant_hp(session, pid, new_hp)
                 session.game_log.append(f"You are healed to {new_hp} HP.")
+            self._flush_combatants(session)
 
             # 3) Send the same ephemeral confirmation you already build in game_log
             await interaction.followup.send("\n".join(session.game_log), ephemeral=True)
@@ -950,74 +1010,21 @@ class BattleSystem(commands.Cog):
             return await sm.refresh_current_state(interaction)
 
 
-        # 5) apply any returned status effects
-        for raw_se in getattr(result, "status_effects", []) or []:
-            raw_se.setdefault("target", ability_meta.get("target_type", "self"))
-            se = self._normalize_se(raw_se)
-            bucket = "player_effects" if se["target"] == "self" else "enemy_effects"
-            session.battle_state[bucket].append(se)
-
-            # initial application log
-            if se["target"] == "self":
-                session.game_log.append(
-                    f"{se['effect_name']} has been applied to <@{pid}>."
-                )
-                # persist the player buff
-                SessionPlayerModel.update_status_effects(
-                    session.session_id, pid, session.battle_state[bucket]
-                )
-            else:
-                name = session.current_enemy.get("enemy_name", "The enemy")
-                session.game_log.append(
-                    f"{name} has been afflicted by {se['effect_name']}."
-                )
-
-        # 6) burn cooldown on the player
-        session.ability_cooldowns.setdefault(pid, {})[ability_id] = ability_meta.get("cooldown", 0)
-        self.reduce_player_cooldowns(session, pid)
-
-        # 7) handle the result types
-        if result.type in ("damage","heal","set_hp","dot"):
-            # update enemy.hp or player.hp as needed
-            if result.type == "damage":
-                enemy["hp"] = max(enemy["hp"] - result.amount, 0)
-            elif result.type == "heal":
-                if target in ("self","ally"):
-                    # heal the player
-                    new_hp = min(player["hp"] + result.amount, player["max_hp"])
-                    self._update_player_hp(pid, session.session_id, new_hp)
-                    session.game_log.append(f"You restore {result.amount} HP to yourself!")
-                else:
-                    # heal the enemy (e.g. Vampire or enemy‑buff)
-                    enemy["hp"] = min(enemy["hp"] + result.amount, enemy["max_hp"])
-                    session.game_log.append(f"{enemy['enemy_name']} recovers {result.amount} HP!")
-            elif result.type == "set_hp":
-                enemy["hp"] = result.amount
-            elif result.type == "dot":
-                enemy.setdefault("dot_effects", []).append(result.dot)
-                enemy["hp"] = max(enemy["hp"] - result.dot["damage_per_turn"], 0)
-
+        # 5) log line, status effects, cooldown and HP via BattleEngine
+        outcome = self.engine.apply_player_skill(session, pid, player, enemy, ability_meta, result)
+        session.game_log.extend(outcome.lines)
+        if outcome.player_effects_changed:
+            SessionPlayerModel.update_status_effects(
+                session.session_id, pid, session.battle_state["player_effects"]
+            )
+        if outcome.player_hp is not None:
+            self._set_combatant_hp(session, pid, outcome.player_hp)
 
-        else:
-            # for “miss”, “pilfer”, “mug”, etc.
-            await self.update_battle_embed(interaction, pid, enemy)
-            if result.type in ("pilfer","mug") and result.type=="pilfer":
-                # apply gil steal on DB
-                self._steal_gil(pid, session.session_id, result.amount)
-                enemy["gil_pool"] -= result.amount
-            if result.type=="mug":
-                enemy["hp"] = max(enemy["hp"] - result.amount, 0)
-                if enemy["hp"] <= 0:
-                    return await self.handle_enemy_defeat(interaction, session, enemy)
-        
         if enemy["hp"] <= 0:
             return await self.handle_enemy_defeat(interaction, session, enemy)
 
-        await self.update_battle_embed(interaction, pid, enemy)
-
-        # 8) now let the enemy take their turn, then advance back
-        await asyncio.sleep(1)
-        await self.enemy_turn(interaction, enemy)
+        # 6) show the skill, then let the enemy reply at the session's pace
+        await self._after_player_action(interaction, session, pid, enemy)
 
     async def handle_temp_skill_use(self, interaction: discord.Interaction, temp_ability_id: int) -> None:
         mgr = self.bot.get_cog("SessionManager")
@@ -1098,16 +1105,7 @@ class BattleSystem(commands.Cog):
         ability_meta["ability_id"] = ability_meta["temp_ability_id"]
         enemy = session.current_enemy if in_battle else None
 
-        conn = self.db_connect()
-        cur = conn.cursor(dictionary=True)
-        cur.execute(
-            "SELECT hp, max_hp, attack_power, magic_power, defense, magic_defense, accuracy, evasion "
-            "FROM players WHERE player_id=%s AND session_id=%s",
-            (pid, session.session_id),
-        )
-        player = cur.fetchone()
-        cur.close()
-        conn.close()
+        player = self._combatant(session, pid) if in_battle else self._fetch_combatant(session, pid)
         if not player:
             return await interaction.response.send_message("❌ Could not retrieve your stats.", ephemeral=True)
 
@@ -1194,7 +1192,7 @@ class BattleSystem(commands.Cog):
             elif result.type == "heal":
                 if target in ("self", "ally"):
                     new_hp = min(player["hp"] + result.amount, player["max_hp"])
-                    self._update_player_hp(pid, session.session_id, new_hp)
+                    self._set_combatant_hp(session, pid, new_hp)
                     session.game_log.append(f"You restore {result.amount} HP to yourself!")
                 else:
                     enemy["hp"] = min(enemy["hp"] + result.amount, enemy["max_hp"])
@@ -1208,9 +1206,7 @@ class BattleSystem(commands.Cog):
         if enemy["hp"] <= 0:
             return await self.handle_enemy_defeat(interaction, session, enemy)
 
-        await self.update_battle_embed(interaction, pid, enemy)
-        await asyncio.sleep(1)
-        await self.enemy_turn(interaction, enemy)
+        await self._after_player_action(interaction, session, pid, enemy)
 
     # --------------------------------------------------------------------- #
     #                          Enemy –> Player turn                         #
@@ -1228,136 +1224,35 @@ class BattleSystem(commands.Cog):
             return
         
         # 1) tick all enemy effects for this turn
-        await session._status_engine.tick_combat("enemy")
+        engine = session._status_engine or self._bind_status_engine(session)
+        await engine.tick_combat("enemy")
         if enemy["hp"] <= 0:
             return await self.handle_enemy_defeat(interaction, session, enemy)
         # 2) then tick all player effects immediately before enemy acts
-        await session._status_engine.tick_combat("player")
+        await engine.tick_combat("player")
 
-        # 2) fetch fresh player stats
+        # 2) current player stats from the battle snapshot (DoT/HoT ticks above already applied)
         pid = session.current_turn
-        conn = self.db_connect()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(
-            "SELECT hp, max_hp, defense, magic_defense, accuracy, evasion "
-            "FROM players WHERE player_id = %s AND session_id = %s",
-            (pid, session.session_id),
-        )
-        player = cursor.fetchone()
-        cursor.close(); conn.close()
-
-        # 3) pick an ability (or None)
-        ability = self.choose_enemy_ability(session, enemy)
-
-        # 4) fallback to plain attack
-        if not ability:
-            dmg = self.ability.jrpg_damage(
-                enemy, player,
-                base_damage=0,
-                scaling_stat="attack_power",
-                scaling_factor=1.0
-            )
-            session.game_log.append(f"{enemy['enemy_name']} attacks for {dmg} damage!")
-            new_hp = max(player["hp"] - dmg, 0)
-            self._update_player_hp(pid, session.session_id, new_hp)
-            if new_hp <= 0:
-                return await self._kill_player(interaction, pid, session)
-            await self.update_battle_embed(interaction, pid, enemy)
-            return await self._end_enemy_action(interaction)
-
-        # 5) otherwise resolve the chosen ability
-        result = self.ability.resolve(enemy, player, ability)
-
-        # 6) apply any status effects first (e.g. enemy‐inflicted DoT/HoT)
-        for raw_se in getattr(result, "status_effects", []):
-            se = self._normalize_se(raw_se)
-            # these are coming from the enemy → must go on the player
-            session.battle_state["player_effects"].append(se)
-            session.game_log.append(
-                f"{enemy['enemy_name']} inflicts **{se['effect_name']}** on you for {se['remaining']} turns."
-            )
-
-        # 7) unified logging for each result type
-        if result.type == "miss":
-            session.game_log.append(
-                f"{enemy['enemy_name']} uses {ability['ability_name']} but misses!"
-            )
-            await self.update_battle_embed(interaction, pid, enemy)
-            return await self._end_enemy_action(interaction)
-
-        if result.type == "heal":
-            enemy["hp"] = min(enemy["hp"] + result.amount, enemy["max_hp"])
-            session.game_log.append(
-                f"{enemy['enemy_name']} uses {ability['ability_name']} and heals for {result.amount} HP!"
-            )
-            await self.update_battle_embed(interaction, pid, enemy)
-            return await self._end_enemy_action(interaction)
-
-        if result.type == "set_hp":
-            enemy["hp"] = result.amount
-            session.game_log.append(
-                f"{enemy['enemy_name']} is reduced to 1 HP by {ability['ability_name']}!"
-            )
-            if enemy["hp"] <= 0:
-                return await self.handle_enemy_defeat(interaction, session, enemy)
-            await self.update_battle_embed(interaction, pid, enemy)
-            return await self._end_enemy_action(interaction)
-
-        if result.type == "dot":
-            dot = result.dot
-            # apply the DoT on the **player** side
-            session.battle_state["player_effects"].append(dot)
-            # immediate first tick
-            new_hp = max(player["hp"] - dot["damage_per_turn"], 0)
-            self._update_player_hp(pid, session.session_id, new_hp)
-            session.game_log.append(
-                f"<@{pid}> has been hurt from {dot['effect_name']} for {dot['damage_per_turn']} HP."
-            )
-            await self.update_battle_embed(interaction, pid, enemy)
-            return await self._end_enemy_action(interaction)
-
-        if result.type == "damage":
-            dmg = result.amount
-            # barrier check
-            if any(b["effect_name"] == "Barrier" for b in session.battle_state["player_effects"]):
-                dmg //= 2
-                session.game_log.append("🛡️ Barrier halves the incoming damage!")
-            new_hp = max(player["hp"] - dmg, 0)
-            self._update_player_hp(pid, session.session_id, new_hp)
-            session.game_log.append(
-                f"{enemy['enemy_name']} uses {ability['ability_name']} and deals {dmg} damage!"
-            )
-            if new_hp <= 0:
+        player = self._combatant(session, pid)
+
+        # 3) pick and resolve an ability (or a plain attack) via BattleEngine
+        outcome = self.engine.enemy_action(session, pid, player, enemy, self._enemy_kit(session, enemy))
+        session.game_log.extend(outcome.lines)
+        if outcome.gil_stolen:
+            self._steal_gil(pid, session.session_id, outcome.gil_stolen)
+        if outcome.player_hp is not None:
+            self._set_combatant_hp(session, pid, outcome.player_hp)
+            if outcome.player_hp <= 0:
                 return await self._kill_player(interaction, pid, session)
-            await self.update_battle_embed(interaction, pid, enemy)
-            return await self._end_enemy_action(interaction)
-
-        if result.type in ("pilfer", "mug"):
-            if result.type == "pilfer":
-                steal = result.amount
-                self._steal_gil(pid, session.session_id, steal)
-                enemy["gil_pool"] -= steal
-                session.game_log.append(
-                    f"{enemy['enemy_name']} uses {ability['ability_name']} and pilfers {steal} Gil!"
-                )
-            else:
-                dmg = result.amount
-                enemy["hp"] = max(enemy["hp"] - dmg, 0)
-                session.game_log.append(
-                    f"{enemy['enemy_name']} uses {ability['ability_name']} and deals {dmg} damage!"
-                )
-                if enemy["hp"] <= 0:
-                    return await self.handle_enemy_defeat(interaction, session, enemy)
-
-            await self.update_battle_embed(interaction, pid, enemy)
-            return await self._end_enemy_action(interaction)
+        if enemy["hp"] <= 0:
+            return await self.handle_enemy_defeat(interaction, session, enemy)
 
-        # 8) final fallback (should rarely hit)
         await self.update_battle_embed(interaction, pid, enemy)
         return await self._end_enemy_action(interaction)
 
 
 
+    @tracing.traced("handle_attack")
     async def handle_attack(self, interaction: discord.Interaction) -> None:
         mgr = self.bot.get_cog("SessionManager")
         if not mgr or not self.embed_manager:
@@ -1382,28 +1277,15 @@ class BattleSystem(commands.Cog):
 
         enemy = session.current_enemy
         pid = session.current_turn
-        conn = self.db_connect()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(
-            "SELECT hp, max_hp, defense, attack_power FROM players WHERE player_id = %s AND session_id = %s",
-            (pid, session.session_id),
-        )
-        player = cursor.fetchone()
-        cursor.close(); conn.close()
-        dmg = self.ability.jrpg_damage(player, enemy, base_damage=0, scaling_stat="attack_power", scaling_factor=1.0)
-        enemy["hp"] = max(enemy["hp"] - dmg, 0)
-        session.game_log.append(f"You strike the {enemy['enemy_name']} for {dmg} damage!")
-        self.reduce_player_cooldowns(session, pid)
+        player = self._combatant(session, pid)
+        outcome = self.engine.player_attack(session, pid, player, enemy)
+        session.game_log.extend(outcome.lines)
 
         if enemy["hp"] <= 0:
             return await self.handle_enemy_defeat(interaction, session, enemy)
 
-        # 1) show your strike…
-        await self.update_battle_embed(interaction, pid, enemy)
-        # 2) brief pause so it’s visible
-        await asyncio.sleep(1)
-        # 3) now let the enemy take its turn (enemy_turn will refresh and then call end‐of‐turn)
-        return await self.enemy_turn(interaction, enemy)
+        # show your strike, then the enemy replies (enemy_turn refreshes and ends the turn)
+        return await self._after_player_action(interaction, session, pid, enemy)
 
     # --------------------------------------------------------------------- #
     #                            Victory embed                              #
@@ -1494,6 +1376,7 @@ class BattleSystem(commands.Cog):
         session = mgr.get_session(interaction.channel.id)
         if not session:
             return await interaction.response.send_message("❌ No active session found.", ephemeral=True)
+        self._flush_combatants(session)
         session.clear_battle_state()
         session.victory_pending = False
         session.game_log.append("You fled the battle!")
@@ -1538,6 +1421,7 @@ class BattleSystem(commands.Cog):
                         )
                     conn.commit()
                     conn.close()
+                    invalidate_floor(floor)
                 session.clear_battle_state()
             gm = self.bot.get_cog("GameMaster")
             if gm:
@@ -1547,6 +1431,15 @@ class BattleSystem(commands.Cog):
                 await sm.refresh_current_state(interaction)
             return
 
+        # no combat input (menus included) until the paced enemy turn lands
+        if (session and cid.startswith("combat_")
+                and cid not in ("combat_skill_back", "combat_trance_back")
+                and self.pending_enemy_turn(session)):
+            msg = "⏳ The enemy is still acting."
+            if interaction.response.is_done():
+                return await interaction.followup.send(msg, ephemeral=True)
+            return await interaction.response.send_message(msg, ephemeral=True)
+
         if cid == "combat_skill_menu":
             return await self.handle_skill_menu(interaction)
         if cid == "combat_item":
@@ -1726,20 +1619,19 @@ class BattleSystem(commands.Cog):
         return row[0] if row else 0
 
     async def _kill_player(self, interaction, pid, session):
-        # 1) force the DB → 0 HP so the next embed shows 0/max
-        self._update_player_hp(pid, session.session_id, 0)
-
-        # 2) mark them dead
+        # 1) force 0 HP and mark them dead in a single write so the next embed shows 0/max
+        snap = self._combatant(session, pid, load=False)
+        if snap is not None:
+            snap["hp"], snap["hp_dirty"] = 0, False
         conn = self.db_connect()
         cur = conn.cursor()
         cur.execute(
-            "UPDATE players SET is_dead=TRUE WHERE player_id=%s AND session_id=%s",
+            "UPDATE players SET hp=0, is_dead=TRUE WHERE player_id=%s AND session_id=%s",
             (pid, session.session_id),
         )
         conn.commit()
         cur.close()
         conn.close()
-        SessionPlayerModel.set_player_dead(session.session_id, pid)
 
         # 3) re‐draw the battle embed (now at 0 HP) before dropping in the death panel
         await self.update_battle_embed(interaction, pid, session.current_enemy)
@@ -1749,6 +1641,10 @@ class BattleSystem(commands.Cog):
         return await sm.refresh_current_state(interaction)
 
     async def _end_enemy_action(self, interaction):
+        # persist this turn's batched HP changes before the world tick reads them
+        session = self.get_session(interaction.channel.id)
+        if session:
+            self._flush_combatants(session)
         gm = self.bot.get_cog("GameMaster")
         if gm:
             return await gm.end_player_turn(interaction)
@@ -0,0 +1,194 @@
+# game/diagnostics.py
+
+import asyncio
+import logging
+import os
+from typing import Optional
+
+import discord
+from discord import app_commands
+from discord.ext import commands, tasks
+
+from utils import db_metrics, tracing
+from utils.helpers import load_config
+
+logger = logging.getLogger("Diagnostics")
+
+
+class Diagnostics(commands.Cog):
+    """
+    Admin-facing runtime numbers. DB query stats come from utils.db_metrics,
+    interaction latency histograms from utils.tracing.
+
+    config.json (all optional):
+        "db_metrics": {"enabled": true, "summary_minutes": 15}
+        "tracing":    {"enabled": true, "export_path": "metrics/latency.prom",
+                       "export_seconds": 60, "http_port": 9108}
+    export_path / http_port are off unless set; the HTTP endpoint binds to
+    127.0.0.1 and serves the Prometheus text format on any path.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        config = load_config() or {}
+        cfg = config.get("db_metrics", {})
+        db_metrics.ENABLED = bool(cfg.get("enabled", True))
+        self.summary_minutes = float(cfg.get("summary_minutes", 15))
+        if self.summary_minutes > 0:
+            self.summary_loop.change_interval(minutes=self.summary_minutes)
+
+        tcfg = config.get("tracing", {})
+        tracing.ENABLED = bool(tcfg.get("enabled", True))
+        self.export_path = tcfg.get("export_path")
+        self.http_port = tcfg.get("http_port")
+        self.export_loop.change_interval(seconds=float(tcfg.get("export_seconds", 60)))
+        self._server: Optional[asyncio.AbstractServer] = None
+        logger.info("Diagnostics cog initialized (db metrics %s, tracing %s).",
+                    "on" if db_metrics.ENABLED else "off",
+                    "on" if tracing.ENABLED else "off")
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        if db_metrics.ENABLED and self.summary_minutes > 0 and not self.summary_loop.is_running():
+            self.summary_loop.start()
+        if tracing.ENABLED and self.export_path and not self.export_loop.is_running():
+            self.export_loop.start()
+        if tracing.ENABLED and self.http_port and self._server is None:
+            try:
+                self._server = await asyncio.start_server(
+                    self._serve_metrics, "127.0.0.1", int(self.http_port)
+                )
+                logger.info("Latency metrics served on http://127.0.0.1:%s/metrics", self.http_port)
+            except OSError as e:
+                logger.error("Could not start metrics endpoint on port %s: %s", self.http_port, e)
+
+    async def cog_unload(self) -> None:
+        self.summary_loop.cancel()
+        self.export_loop.cancel()
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+    # ──────────────────────────────────────────────────────────────────
+    # Latency export
+    # ──────────────────────────────────────────────────────────────────
+    @tasks.loop(seconds=60)
+    async def export_loop(self) -> None:
+        body = tracing.render_prometheus()
+        await asyncio.to_thread(self._write_export, self.export_path, body)
+
+    @staticmethod
+    def _write_export(path: str, body: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(body)
+        os.replace(tmp, path)                 # scrapers never see a half-written file
+
+    async def _serve_metrics(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+            body = tracing.render_prometheus().encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/plain; version=0.0.4\r\n"
+                b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+                b"Connection: close\r\n\r\n" + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @tasks.loop(minutes=15)
+    async def summary_loop(self) -> None:
+        if db_metrics.QUERIES:
+            logger.info("DB summary:\n%s", "\n".join(db_metrics.summary_lines()))
+
+    @app_commands.command(
+        name="dbstats",
+        description="Show database queries per interaction and the costliest statements."
+    )
+    @app_commands.describe(
+        sort="Order statements by total time, count or worst single call",
+        reset="Clear the counters after showing them"
+    )
+    @app_commands.choices(sort=[
+        app_commands.Choice(name="total time", value="total_ms"),
+        app_commands.Choice(name="count", value="count"),
+        app_commands.Choice(name="slowest call", value="max_ms"),
+    ])
+    @app_commands.checks.has_permissions(administrator=True)
+    async def dbstats(
+        self,
+        interaction: discord.Interaction,
+        sort: str = "total_ms",
+        reset: bool = False,
+    ) -> None:
+        if not db_metrics.ENABLED:
+            return await interaction.response.send_message(
+                "DB metrics are disabled in config.json.", ephemeral=True
+            )
+
+        embed = discord.Embed(title="🗄️ Database usage", color=discord.Color.dark_teal())
+        embed.description = db_metrics.summary_lines(limit=0)[0]
+
+        per_use = [
+            f"`{s.label}` {s.queries_per:.1f} q · {s.ms_per:.1f} ms (max {s.max_queries}, n={s.interactions})"
+            for s in db_metrics.top_interactions(10)
+        ]
+        embed.add_field(
+            name="Per interaction (avg queries · DB ms)",
+            value="\n".join(per_use)[:1024] or "No interactions yet.",
+            inline=False
+        )
+
+        for s in db_metrics.top_queries(5, by=sort):
+            callers = ", ".join(f"{name} ×{n}" for name, n in s.callers.most_common(3))
+            embed.add_field(
+                name=f"{s.count}× · {s.avg_ms:.2f} ms avg · {s.max_ms:.1f} ms max",
+                value=f"```sql\n{s.fingerprint[:300]}\n```{callers[:300]}",
+                inline=False
+            )
+
+        if reset:
+            db_metrics.reset()
+            embed.set_footer(text="Counters reset.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(
+        name="latency",
+        description="Show p50/p95/p99 interaction latency per button, or the span breakdown for one."
+    )
+    @app_commands.describe(custom_id="Button label as listed (e.g. move_north, open_chest_#) for a per-span breakdown")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def latency(self, interaction: discord.Interaction, custom_id: Optional[str] = None) -> None:
+        if not tracing.ENABLED:
+            return await interaction.response.send_message(
+                "Tracing is disabled in config.json.", ephemeral=True
+            )
+
+        def fmt(rows):
+            return "\n".join(
+                f"`{name}` p50 {p50 * 1000:.0f} · p95 {p95 * 1000:.0f} · p99 {p99 * 1000:.0f} ms (n={n})"
+                for name, n, p50, p95, p99 in rows
+            )[:4000]
+
+        if custom_id:
+            rows = tracing.breakdown(custom_id)
+            title = f"⏱️ Latency spans – {custom_id}"
+        else:
+            rows = tracing.percentiles("total")[:15]
+            title = "⏱️ Interaction latency (receipt → first update)"
+        embed = discord.Embed(
+            title=title,
+            description=fmt(rows) or "No traced interactions yet.",
+            color=discord.Color.dark_teal()
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(Diagnostics(bot))
+    logger.info("Diagnostics cog loaded ✔")
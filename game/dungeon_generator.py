@@ -14,9 +14,9 @@ import discord
 from discord.ext import commands
 
 from models.database import Database
+from utils.minimap import invalidate_floor
 
 logger = logging.getLogger("DungeonGenerator")
-logger.setLevel(logging.DEBUG)
 
 
 class DungeonGenerator(commands.Cog):
@@ -825,6 +825,8 @@ class DungeonGenerator(commands.Cog):
                     (session_id, first_floor_id, link_x, link_y),
                 )
             conn.commit()
+            invalidate_floor(basement_floor_id)
+            invalidate_floor(first_floor_id)
 
         # create chests in item rooms
         key_defs = self.fetch_random_treasure_chest("key")
@@ -992,6 +994,8 @@ class DungeonGenerator(commands.Cog):
                     (prev_floor_id, current_entry[0], current_entry[1], session_id, floor_id, current_entry[0], current_entry[1])
                 )
             conn.commit()
+            invalidate_floor(prev_floor_id)
+            invalidate_floor(floor_id)
 
             current_entry = (exit_x, exit_y)
             prev_floor_id = floor_id
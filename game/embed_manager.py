@@ -17,12 +17,12 @@ from utils.ui_helpers import (
     create_cooldown_bar,
     create_health_bar,
     create_progress_bar,
-    get_emoji_for_room_type,
     format_status_effects,
 )
+from utils.minimap import FloorGlyphGrid
+from utils import tracing
 
 logger = logging.getLogger("EmbedManager")
-logger.setLevel(logging.DEBUG)
 
 # Discord refuses completely blank title / description fields.
 _ZWSP: str = "\u200b"  # zero-width space
@@ -45,6 +45,14 @@ class EmbedManager(commands.Cog):
 
         logger.debug("EmbedManager initialised.")
 
+    def release_channel(self, channel_id: int) -> None:
+        """Forget a session thread's message ids and lock (session ended or evicted)."""
+        self.active_messages.pop(channel_id, None)
+        self.status_messages.pop(channel_id, None)
+        lock = self._update_locks.get(channel_id)
+        if lock is not None and not lock.locked():
+            del self._update_locks[channel_id]
+
     # ──────────────────────────────────────────────────────────────────
     # Database connection helper
     # ──────────────────────────────────────────────────────────────────
@@ -93,6 +101,7 @@ class EmbedManager(commands.Cog):
         """
         target = channel or interaction.channel
         cid = target.id
+        tracing.mark("handler")          # receipt → first render: handler + DB work
 
         # Always acknowledge the interaction before doing any work so users
         # don’t see “Interaction Failed” while we fetch/update messages.
@@ -100,14 +109,18 @@ class EmbedManager(commands.Cog):
             try:
                 # A plain defer is safe even when we later edit a different
                 # message via the webhook/message API.
-                await interaction.response.defer()
+                with tracing.span("defer"):
+                    await interaction.response.defer()
             except Exception as e:  # pragma: no cover - defensive guard
                 logger.debug("send_or_update_embed: defer failed: %s", e)
 
         # Obtain or create the per-channel lock
         lock = self._update_locks.setdefault(cid, asyncio.Lock())
 
-        async with lock:
+        with tracing.span("lock_wait"):
+            await lock.acquire()
+        try:
+            build_start = time.perf_counter()
             # Build or reuse embed
             if embed_override:
                 embed = embed_override
@@ -153,14 +166,18 @@ class EmbedManager(commands.Cog):
                                 Button(label=label, style=style, custom_id=cid_btn)
                             )
 
+            tracing.record("embed_build", time.perf_counter() - build_start)
+
             # Send or edit
             try:
                 if cid in self.active_messages:
                     msg_id = self.active_messages[cid]
                     partial = target.get_partial_message(msg_id)
-                    await partial.edit(embed=embed, view=view)
+                    with tracing.span("discord_edit"):
+                        await partial.edit(embed=embed, view=view)
                     return partial
-                msg = await target.send(embed=embed, view=view)
+                with tracing.span("discord_send"):
+                    msg = await target.send(embed=embed, view=view)
                 self.active_messages[cid] = msg.id
                 return msg
             except Exception as e:
@@ -178,6 +195,9 @@ class EmbedManager(commands.Cog):
                 except Exception as fb:
                     logger.error("Fallback send failed: %s", fb)
                     return None
+        finally:
+            lock.release()
+            tracing.finish()
 
     # ──────────────────────────────────────────────────────────────────
     # Submenu for Save / Quit / Back
@@ -333,47 +353,16 @@ class EmbedManager(commands.Cog):
     async def send_minimap_embed(
         self,
         interaction: discord.Interaction,
-        all_rooms: List[Dict[str, Any]],
+        grid: FloorGlyphGrid,
         current_pos: Tuple[int, int],
         reveal_set: Set[Tuple[int, int]],
         discovered_set: Set[Tuple[int, int]],
-        current_floor: int,
         dead_positions: Optional[Set[Tuple[int, int]]] = None,
     ):
-        if dead_positions is None:
-            dead_positions = set()
-
-        rooms = [r for r in all_rooms if r["floor_id"] == current_floor]
-        xs = [r["coord_x"] for r in rooms]
-        ys = [r["coord_y"] for r in rooms]
-        room_map = {(r["coord_x"], r["coord_y"]): r["room_type"] for r in rooms}
-
-        VISITED = "🟨"
-        gap = "    "
-        lines: List[str] = []
-
-        for y in range(min(ys), max(ys) + 1):
-            row: List[str] = []
-            for x in range(min(xs), max(xs) + 1):
-                coord = (x, y)
-                if coord in dead_positions:
-                    char = "⚰️"
-                elif coord == current_pos:
-                    char = "🤺"
-                elif coord in discovered_set and room_map.get(coord) in ("safe", "monster"):
-                    char = VISITED
-                elif coord in discovered_set or coord in reveal_set:
-                    char = get_emoji_for_room_type(room_map.get(coord, "unknown"))
-                else:
-                    char = "⬛"
-                row.append(char)
-            lines.append(gap.join(row))
-            lines.append("")
-
-        grid = "\n".join(lines)
+        grid_text = grid.render_full(current_pos, discovered_set, reveal_set, dead_positions)
         embed = discord.Embed(
             title="🗺️ Mini-Map",
-            description=f"```\n{grid}\n```",
+            description=f"```\n{grid_text}\n```",
             color=discord.Color.blue(),
         )
         embed.add_field(
@@ -3,6 +3,7 @@
 from __future__ import annotations
 import re
 import asyncio
+import contextlib
 import json
 import logging
 import time
@@ -15,7 +16,10 @@ from discord.ext import commands
 import mysql.connector
 from utils.status_engine  import StatusEffectEngine
 from utils.helpers        import load_config
-from utils.ui_helpers     import create_health_bar, get_emoji_for_room_type  # For minimap icons, if needed
+from utils.db_metrics     import instrument
+from utils                import tracing
+from utils.ui_helpers     import create_health_bar
+from utils.minimap        import FloorGlyphGrid, build_floor_grid, get_floor_grid, invalidate_floor
 from core.game_session    import GameSession
 from models.session_models import (
     SessionModel,
@@ -26,7 +30,6 @@ from models.session_models import (
 from .treasure_chest import TreasureChestCog
 
 logger = logging.getLogger("GameMaster")
-logger.setLevel(logging.DEBUG)
 
 
 def build_queue_embed_field(player_ids: List[int],
@@ -102,7 +105,7 @@ class GameMaster(commands.Cog):
         logger.debug("★ GameMaster initialised with DB config ✓")
 
     def db_connect(self) -> mysql.connector.MySQLConnection:
-        conn = mysql.connector.connect(**self.db_config)
+        conn = instrument(mysql.connector.connect(**self.db_config))
         conn.autocommit = True
         return conn
 
@@ -132,36 +135,41 @@ class GameMaster(commands.Cog):
             cur.close()
             conn.close()
 
+    def _floor_grid(self, session_id: int, floor_id: int) -> FloorGlyphGrid:
+        """
+        Return the cached glyph grid for a floor, loading the floor’s rooms
+        only on the first render (or after the grid was invalidated).
+        """
+        grid = get_floor_grid(floor_id)
+        if grid is not None:
+            return grid
+        conn = self.db_connect()
+        try:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(
+                    "SELECT coord_x, coord_y, room_type FROM rooms "
+                    "WHERE session_id=%s AND floor_id=%s",
+                    (session_id, floor_id),
+                )
+                floor_rooms = cur.fetchall()
+        finally:
+            conn.close()
+        return build_floor_grid(floor_id, floor_rooms, session_id)
+
     def _render_local_map(
         self,
-        all_rooms: List[Dict[str, Any]],
+        session_id: int,
+        floor_id: int,
         center: Tuple[int, int],
         discovered: Set[Tuple[int,int]],
         reveal: Set[Tuple[int,int]],
     ) -> str:
         """
         Return a 5×5 map centered on `center` using the same emojis
-        as your full minimap (via get_emoji_for_room_type).
+        as your full minimap (via the floor’s cached glyph grid).
         Unknown / out‑of‑bounds = ⬛.
         """
-        x0, y0 = center
-        # build lookup: (x,y) → room_type
-        room_map = { (r["coord_x"], r["coord_y"]): r["room_type"] for r in all_rooms }
-
-        def ch(x: int, y: int) -> str:
-            if (x, y) == (x0, y0):
-                return "🤺"
-            # only reveal if discovered or peeking
-            if (x,y) in discovered or (x,y) in reveal:
-                rtype = room_map.get((x, y), None)
-                return get_emoji_for_room_type(rtype)
-            return "⬛"
-
-        lines = []
-        for dy in range(-2, 3):  # -2, -1, 0, 1, 2
-            row = "".join(ch(x0 + dx, y0 + dy) for dx in range(-2, 3))
-            lines.append(row)
-        return "\n".join(lines)
+        return self._floor_grid(session_id, floor_id).render_local(center, discovered, reveal)
 
 
     def fetch_intro_steps(self) -> List[Dict[str, Any]]:
@@ -585,46 +593,51 @@ class GameMaster(commands.Cog):
             )
             rows = cur.fetchall()
 
-            for row in rows:
-                new_remaining = row["remaining_turns"] - 1
-                if new_remaining <= 0:
-                    cur.execute(
-                        """
-                        DELETE FROM player_temporary_abilities
-                        WHERE session_id = %s
-                          AND player_id = %s
-                          AND temp_ability_id = %s
-                        """,
-                        (session.session_id, player_id, row["temp_ability_id"]),
-                    )
-                    self.append_game_log(
-                        session.session_id,
-                        f"Temporary ability **{row['ability_name']}** fades."
-                    )
+            if rows:
+                cur.execute(
+                    """
+                    UPDATE player_temporary_abilities
+                    SET remaining_turns = remaining_turns - 1
+                    WHERE session_id = %s
+                      AND player_id = %s
+                    """,
+                    (session.session_id, player_id),
+                )
+            expired = [row for row in rows if row["remaining_turns"] - 1 <= 0]
+            if expired:
+                cur.execute(
+                    """
+                    DELETE FROM player_temporary_abilities
+                    WHERE session_id = %s
+                      AND player_id = %s
+                      AND remaining_turns <= 0
+                    """,
+                    (session.session_id, player_id),
+                )
+                for row in expired:
                     session.temp_ability_cooldowns.get(player_id, {}).pop(row["temp_ability_id"], None)
-                else:
-                    cur.execute(
-                        """
-                        UPDATE player_temporary_abilities
-                        SET remaining_turns = %s
-                        WHERE session_id = %s
-                          AND player_id = %s
-                          AND temp_ability_id = %s
-                        """,
-                        (new_remaining, session.session_id, player_id, row["temp_ability_id"]),
-                    )
         conn.commit()
         conn.close()
+        self.append_game_logs(
+            session.session_id,
+            [f"Temporary ability **{row['ability_name']}** fades." for row in expired],
+        )
 
     def append_game_log(self, session_id: int, line: str, keep: int = 10) -> None:
         """Append a line to the session's game_log JSON array."""
+        self.append_game_logs(session_id, [line], keep)
+
+    def append_game_logs(self, session_id: int, lines: List[str], keep: int = 10) -> None:
+        """Append several lines to the session's game_log in one read-modify-write."""
+        if not lines:
+            return
         try:
             conn = self.db_connect()
             with conn.cursor(dictionary=True) as cur:
                 cur.execute("SELECT game_log FROM sessions WHERE session_id=%s", (session_id,))
                 row = cur.fetchone()
                 log = json.loads(row["game_log"]) if row and row["game_log"] else []
-                log.append(line)
+                log.extend(lines)
                 log = log[-keep:]
                 cur.execute("UPDATE sessions SET game_log=%s WHERE session_id=%s",
                             (json.dumps(log), session_id))
@@ -721,6 +734,7 @@ class GameMaster(commands.Cog):
                 ),
             )
             conn.commit()
+            invalidate_floor(floor_id)
         finally:
             cur.close()
             conn.close()
@@ -765,7 +779,7 @@ class GameMaster(commands.Cog):
         embed = build_queue_embed(interaction.user, session_id)
         view = _build_queue_view()
         if em:
-            await em.send_or_update_embed(
+            queue_msg = await em.send_or_update_embed(
                 interaction,
                 "",
                 "",
@@ -774,9 +788,11 @@ class GameMaster(commands.Cog):
                 channel=thread
             )
         else:
-            await thread.send(embed=embed, view=view)
+            queue_msg = await thread.send(embed=embed, view=view)
 
         hub = self.bot.get_cog("HubManager")
+        if hub and queue_msg:
+            hub.record_lfg_message(session_id, queue_message_id=queue_msg.id)
         if hub and hasattr(hub, "post_lfg_post"):
             await hub.post_lfg_post(
                 interaction,
@@ -803,7 +819,7 @@ class GameMaster(commands.Cog):
                 ephemeral=True
             )
 
-        if getattr(session, "queue_posted", False):
+        if session.queue_posted:
             return await interaction.followup.send(
                 "⚠️ Difficulty already set for this session.", ephemeral=True
             )
@@ -1106,16 +1122,20 @@ class GameMaster(commands.Cog):
         new_embed = build_queue_embed(owner, session_id)
         new_view  = _build_queue_view()
 
-        async for msg in thread.history(limit=20):
-            if msg.author.id == self.bot.user.id and msg.embeds:
-                emb = msg.embeds[0]
-                footer = (emb.footer.text or "").strip()
-                if footer.startswith(f"Session ID: {session_id}"):
-                    await msg.edit(embed=new_embed, view=new_view)
-                    return
+        # 4) edit the recorded queue embed in place
+        hub = self.bot.get_cog("HubManager")
+        queue_id = hub.get_lfg_record(session_id).get("queue_message_id") if hub else None
+        if queue_id:
+            try:
+                await thread.get_partial_message(queue_id).edit(embed=new_embed, view=new_view)
+                return
+            except discord.NotFound:
+                pass
 
         # 5) (fallback) if we didn’t find one, just send a new embed
-        await thread.send(embed=new_embed, view=new_view)
+        msg = await thread.send(embed=new_embed, view=new_view)
+        if hub:
+            hub.record_lfg_message(session_id, queue_message_id=msg.id)
         logger.warning(f"⚠️ Couldn’t find existing queue‑embed in thread {thread_id}, sent a new one")
 
 
@@ -1123,6 +1143,7 @@ class GameMaster(commands.Cog):
     # ────────────────────────────────────────────────────────────────────────────
     #  Update room view (header, description, buttons)
     # ────────────────────────────────────────────────────────────────────────────
+    @tracing.traced("update_room_view")
     async def update_room_view(self, interaction: discord.Interaction, room: Dict[str, Any], x: int, y: int, *, force_end_turn: bool = False) -> None:
         sm = self.bot.get_cog("SessionManager")
         session = sm.get_session(interaction.channel.id) if sm else None
@@ -1258,21 +1279,11 @@ class GameMaster(commands.Cog):
         neighbours = { (x+1,y), (x-1,y), (x, y+1), (x, y-1) }
         visible = { (xx,yy) for (_,xx,yy) in discovered_here } | neighbours
 
-        # 2) fetch all rooms on this floor
-        conn = self.db_connect()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute(
-                "SELECT coord_x, coord_y, room_type FROM rooms "
-               "WHERE session_id=%s AND floor_id=%s",
-                (session.session_id, room["floor_id"])
-            )
-            floor_rooms = cur.fetchall()
-        conn.close()
-
-        # 3) render our 3×3 patch
+        # 2) render our 5×5 patch from the floor's cached glyph grid
         local_coords = { (xx, yy) for (_, xx, yy) in discovered_here }
         local_map = self._render_local_map(
-            floor_rooms,
+            session.session_id,
+            room["floor_id"],
             (x, y),
             local_coords,
             visible
@@ -1500,6 +1511,7 @@ class GameMaster(commands.Cog):
             )
         conn.commit()
         conn.close()
+        invalidate_floor(floor)
 
         # 6) sanity‑check for staircase templates
         if room["new_room_type"] in ("staircase_up", "staircase_down"):
@@ -1604,6 +1616,7 @@ class GameMaster(commands.Cog):
     # ─────────────────────────────────────────────────────────────────
     #  Movement: locks, stairs, battles, turn advance
     # ─────────────────────────────────────────────────────────────────
+    @tracing.traced("handle_move")
     async def handle_move(self, interaction: discord.Interaction, direction: str) -> None:
         sm = self.bot.get_cog("SessionManager")
         session = sm.get_session(interaction.channel.id) if sm else None
@@ -1921,43 +1934,28 @@ class GameMaster(commands.Cog):
         neighbours = {(x+1, y), (x-1, y), (x, y+1), (x, y-1)}
         visible    = discovered_here.union(neighbours)
 
-        # 4) fetch all rooms and hand off to your minimap embed
-        conn = self.db_connect()
-        with conn.cursor(dictionary=True) as cur:
-            cur.execute("""
-                SELECT coord_x, coord_y, room_type, floor_id
-                  FROM rooms
-                 WHERE session_id=%s
-                   AND floor_id=%s
-            """, (session.session_id, floor))
-            rooms = cur.fetchall()
-        conn.close()
-        # ——— NEW: fetch any dead players on this floor ———
+        # 4) fetch any dead players on this floor; the room layout itself
+        #    comes from the floor's cached glyph grid
         conn = self.db_connect()
         with conn.cursor(dictionary=True) as cur:
             cur.execute(
-                "SELECT player_id, coord_x, coord_y "
+                "SELECT coord_x, coord_y "
                 "FROM players "
-                "WHERE session_id=%s AND current_floor_id=%s",
+                "WHERE session_id=%s AND current_floor_id=%s AND is_dead=1",
                 (session.session_id, floor)
             )
             players_pos = cur.fetchall()
         conn.close()
 
-        dead_positions = {
-            (r["coord_x"], r["coord_y"])
-            for r in players_pos
-            if SessionPlayerModel.is_player_dead(session.session_id, r["player_id"])
-        }
+        dead_positions = {(r["coord_x"], r["coord_y"]) for r in players_pos}
         em = self.bot.get_cog("EmbedManager")
         if em:
             await em.send_minimap_embed(
                 interaction,
-                all_rooms=rooms,
+                grid=self._floor_grid(session.session_id, floor),
                 current_pos=current,
                 reveal_set=visible,
                 discovered_set=discovered_here,
-                current_floor=floor,
                 dead_positions=dead_positions
             )
         else:
@@ -2228,11 +2226,7 @@ class GameMaster(commands.Cog):
             return
 
         # preserve the join order
-        all_players = SessionPlayerModel.get_players(session.session_id)
-        alive = [
-            pid for pid in all_players
-            if not SessionPlayerModel.is_player_dead(session.session_id, pid)
-        ]
+        alive = SessionPlayerModel.get_alive_players(session.session_id)
         if not alive:
             # everyone fainted → end session
             await sm.terminate_session(session.session_id, "All players fainted")
@@ -2261,11 +2255,8 @@ class GameMaster(commands.Cog):
                 "❌ No session.", ephemeral=True
             )
 
-        # 1️⃣ Tick all world HoT/DoT on the outgoing player
         prev_pid = session.current_turn
-        engine   = StatusEffectEngine(session, self.append_game_log)
-        await engine.tick_world(prev_pid)
-
+        engine   = StatusEffectEngine(session, self.append_game_log, self.append_game_logs)
 
         # ───────────────────────────────────────────────────────
         # 1️⃣ Decrement Trance duration for that player, if active
@@ -2290,10 +2281,9 @@ class GameMaster(commands.Cog):
         # 2️⃣ Advance to the next alive player
         await self.advance_turn(interaction, interaction.channel.id)
 
-        # 3️⃣ Tick world HoT/DoT on the incoming player (only if the turn actually changed)
-        new_pid = session.current_turn
-        if new_pid != prev_pid:
-            await engine.tick_world(new_pid)
+        # 3️⃣ Tick world HoT/DoT on the outgoing player and, if the turn actually
+        #    changed, the incoming one — one read, one write, one log batch
+        await engine.tick_world_many([prev_pid, session.current_turn])
 
         # 4️⃣ Finally redraw that player’s view
         await sm.refresh_current_state(interaction)
@@ -2347,9 +2337,9 @@ class GameMaster(commands.Cog):
     async def handle_save_game(self, interaction: Interaction) -> None:
         """
         Handle the Save Game button:
-        1) Push the full session.to_dict() into the `game_state` column.
-        2) Mark it as saved so cleanup skips it.
-        3) Confirm and restore the current view.
+        1) Encode session.to_dict() into the `save_blob` column and mark the
+           session saved so cleanup skips it.
+        2) Confirm and restore the current view.
         """
         sm = self.bot.get_cog("SessionManager")
         if not sm:
@@ -2363,14 +2353,17 @@ class GameMaster(commands.Cog):
                 "❌ No active session.", ephemeral=True
             )
 
-        # 1) Persist the full session state JSON
+        # 1) Persist the full session state as a versioned save blob, after
+        #    any autosave delta already in flight (see Autosave.session_lock)
         from models.session_models import SessionModel
-        SessionModel.update_game_state(session.session_id, session.to_dict())
-
-        # 2) Mark it as “saved” so it won’t be auto‑cleaned up
-        SessionModel.mark_saved(session.session_id, True)
+        autosave = self.bot.get_cog("Autosave")
+        async with autosave.session_lock(session.session_id) if autosave else contextlib.nullcontext():
+            size = SessionModel.save_session_blob(
+                session.session_id, session.to_dict(), GameSession.SCHEMA_VERSION
+            )
+        logger.debug("Saved session %s (%d bytes).", session.session_id, size)
 
-        # 3) Acknowledge and pop back to wherever we were
+        # 2) Acknowledge and pop back to wherever we were
         await interaction.response.send_message(
             "✅ Game saved!", ephemeral=True
         )
@@ -2400,13 +2393,13 @@ class GameMaster(commands.Cog):
             sm      = self.bot.get_cog("SessionManager")
             session = sm.get_session(interaction.channel.id)
             # delete the death‐embed if we tracked it
-            if hasattr(session, "last_death_msg_id"):
+            if session.last_death_msg_id:
                 try:
                     dm = await interaction.channel.fetch_message(session.last_death_msg_id)
                     await dm.delete()
                 except:
                     pass
-                del session.last_death_msg_id
+                session.last_death_msg_id = None
             # advance turn without reviving
             return await self.end_player_turn(interaction)
         
@@ -2418,13 +2411,13 @@ class GameMaster(commands.Cog):
             pid     = interaction.user.id
 
             # remove the death‐embed
-            if hasattr(session, "last_death_msg_id"):
+            if session.last_death_msg_id:
                 try:
                     dm = await interaction.channel.fetch_message(session.last_death_msg_id)
                     await dm.delete()
                 except:
                     pass
-                del session.last_death_msg_id
+                session.last_death_msg_id = None
 
             # consume one revive item
             inv = SessionPlayerModel.get_inventory(sid, pid)
@@ -2469,13 +2462,13 @@ class GameMaster(commands.Cog):
             pid     = interaction.user.id
 
             # remove the death‐embed
-            if hasattr(session, "last_death_msg_id"):
+            if session.last_death_msg_id:
                 try:
                     dm = await interaction.channel.fetch_message(session.last_death_msg_id)
                     await dm.delete()
                 except:
                     pass
-                del session.last_death_msg_id
+                session.last_death_msg_id = None
 
             # drop them from the session
             if pid in session.players:
@@ -2587,10 +2580,7 @@ class GameMaster(commands.Cog):
 
                 hub = self.bot.get_cog("HubManager")
                 if hub:
-                    await hub.cleanup_lfg_posts(
-                        interaction.user.display_name,
-                        session.thread_id
-                    )
+                    await hub.cleanup_lfg_posts(session.session_id)
 
                 # ←── **NEW**: initialize turn order now that everyone is in
                 sm.set_initial_turn(interaction.channel.id)
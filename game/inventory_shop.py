@@ -14,7 +14,6 @@ from models.session_models import SessionPlayerModel
 from utils.helpers import load_config
 
 logger = logging.getLogger("InventoryShop")
-logger.setLevel(logging.DEBUG)
 
 # --------------------------------------------------------------------------- #
 # Helper utils
@@ -441,6 +440,10 @@ class InventoryShop(commands.Cog):
         if not session:
             await interaction.followup.send("❌ No active session.", ephemeral=True)
             return
+        bs = self.bot.get_cog("BattleSystem")
+        if session.current_enemy and bs and bs.pending_enemy_turn(session):
+            await interaction.followup.send("⏳ The enemy is still acting.", ephemeral=True)
+            return
 
         item_row = get_item_info(self.db, item_id)
         if not item_row:
@@ -450,6 +453,9 @@ class InventoryShop(commands.Cog):
             await interaction.followup.send("❌ You can't use that item here.", ephemeral=True)
             return
 
+        # in battle, HP lives in the combat snapshot (it may hold unflushed changes)
+        snap = bs._combatant(session, interaction.user.id) if bs else None
+
         with self.db.get_connection() as conn, conn.cursor(dictionary=True) as cur:
             cur.execute(
                 "SELECT inventory, hp, max_hp FROM players "
@@ -470,7 +476,10 @@ class InventoryShop(commands.Cog):
             heal = effect.get("heal", 0)
             is_trance = effect.get("trance", False)
             txt = f"You used **{item_row['item_name']}**."
-            if heal:
+            if heal and snap is not None:
+                bs._set_combatant_hp(session, interaction.user.id, snap["hp"] + heal)
+                txt += f" Healed **{heal}** HP! (HP: {snap['hp']}/{snap['max_hp']})"
+            elif heal:
                 new_hp = min(player["hp"] + heal, player["max_hp"])
                 cur.execute(
                     "UPDATE players SET hp=%s WHERE player_id=%s AND session_id=%s",
@@ -487,7 +496,6 @@ class InventoryShop(commands.Cog):
             )
             conn.commit()
             if is_trance:
-                bs = self.bot.get_cog("BattleSystem")
                 if bs:
                     await bs.activate_trance(session, interaction.user.id)
                     txt += "\n*You feel a power welling up…*"
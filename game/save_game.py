@@ -1,142 +1,132 @@
 import discord
 from discord.ext import commands
+import asyncio
 import time
-import json
 import logging
-from models.database import Database
-# We now rely on GameMaster to store the active session state.
+from typing import Optional
+from core.game_session import GameSession
+from models.session_models import SessionSaveModel
+from utils import save_codec
+# Sessions live in SessionManager; slots live in `session_saves`.
 
 logger = logging.getLogger("SaveGame")
-logger.setLevel(logging.INFO)
 
 class SaveGame(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    def _session_for(self, ctx) -> Optional[GameSession]:
+        sm = self.bot.get_cog("SessionManager")
+        return sm.get_session(ctx.channel.id) if sm else None
+
     @commands.command(name='savegame')
     async def save_current_session(self, ctx, slot: int):
         """
         Save the current game session into a specified slot.
-        Uses the channel/thread ID in GameMaster.sessions, instead of guild_id.
+        The state is snapshotted in one step on the event loop; compression
+        and the DB write run in a worker thread so play isn't held up.
         """
-        gm = self.bot.get_cog("GameMaster")
-        if not gm:
-            await ctx.send("❌ GameMaster cog not available.")
-            return
-
-        thread_id = ctx.channel.id
-        session = gm.sessions.get(thread_id)
+        session = self._session_for(ctx)
         if not session:
             await ctx.send("❌ No active session found to save in this thread.")
             return
+        if ctx.author.id not in session.players:
+            await ctx.send("❌ Only players in this session can save it.")
+            return
 
-        session_id = session["session_id"]
+        state = session.to_dict()
+        payload = save_codec.snapshot(state)
+        summary = {key: state[key] for key in SessionSaveModel.SUMMARY_KEYS}
         save_title = f"Save {time.strftime('%Y-%m-%d %H:%M:%S')}"
-        is_auto_save = False  # Manual save
 
-        db = Database()
-        conn = db.get_connection()
-        cursor = conn.cursor()
+        def write() -> None:
+            blob = save_codec.seal(payload, schema_version=GameSession.SCHEMA_VERSION)
+            SessionSaveModel.save_slot(session.session_id, slot, save_title, blob, summary)
+
         try:
-            sql = """
-                REPLACE INTO session_saves (session_id, slot, save_title, is_auto_save, saved_state)
-                VALUES (%s, %s, %s, %s, %s)
-            """
-            cursor.execute(sql, (session_id, slot, save_title, is_auto_save, json.dumps(session)))
-            conn.commit()
+            await asyncio.to_thread(write)
             await ctx.send(f"✅ Game saved successfully in slot {slot} as '{save_title}'.")
         except Exception as e:
             logger.error("Error saving game session: %s", e, exc_info=True)
             await ctx.send("❌ Failed to save the game.")
-        finally:
-            cursor.close()
-            conn.close()
 
     @commands.command(name='loadgame')
     async def load_session(self, ctx, slot: int):
         """
-        Load a game session from a specified slot.
-        Again, uses channel/thread ID for the active session.
+        Load a game session from a specified slot into this thread.
+        Only the session owner can do this, since it rewinds everyone.
         """
-        gm = self.bot.get_cog("GameMaster")
-        if not gm:
-            await ctx.send("❌ GameMaster cog not available.")
-            return
-
-        thread_id = ctx.channel.id
-        session = gm.sessions.get(thread_id)
+        sm = self.bot.get_cog("SessionManager")
+        session = self._session_for(ctx)
         if not session:
             await ctx.send("❌ No active session found to load into in this thread.")
             return
+        if ctx.author.id != session.owner_id:
+            await ctx.send("❌ Only the session owner can load a save.")
+            return
 
-        session_id = session["session_id"]
-        db = Database()
-        conn = db.get_connection()
-        cursor = conn.cursor(dictionary=True)
         try:
-            sql = "SELECT saved_state FROM session_saves WHERE session_id = %s AND slot = %s"
-            cursor.execute(sql, (session_id, slot))
-            result = cursor.fetchone()
-            if result and result.get("saved_state"):
-                loaded_state = json.loads(result["saved_state"])
-                # Update the GameMaster's in-memory session state for this thread
-                gm.sessions[thread_id] = loaded_state
-                await ctx.send(f"✅ Game loaded successfully from slot {slot}.")
-                # Optionally, trigger a refresh of the game embed (assuming the user is still in the correct thread).
-                await gm.refresh_current_state(ctx)
-            else:
-                await ctx.send("❌ No saved game found in that slot.")
+            state = await asyncio.to_thread(
+                SessionSaveModel.load_slot, session.session_id, slot, GameSession.SCHEMA_VERSION
+            )
         except Exception as e:
             logger.error("Error loading game session: %s", e, exc_info=True)
             await ctx.send("❌ Failed to load the game.")
-        finally:
-            cursor.close()
-            conn.close()
+            return
+        if state is None:
+            await ctx.send("❌ No saved game found in that slot.")
+            return
+
+        # keep this thread/guild; everything else comes from the slot
+        state["session_id"] = session.session_id
+        state["guild_id"]   = session.guild_id
+        state["thread_id"]  = session.thread_id
+        loaded = GameSession.from_dict(state)
+        sm.store_session(loaded)
+        autosave = self.bot.get_cog("Autosave")
+        if autosave:
+            autosave.forget(session.session_id)   # next pass writes a full save
+        await ctx.send(
+            f"✅ Game loaded successfully from slot {slot}. "
+            f"It is now <@{loaded.current_turn}>'s turn — press any action to continue."
+        )
 
     @commands.command(name='listsaves')
     async def list_saved_sessions(self, ctx):
         """
-        List all saved sessions for the current active session in this thread.
+        List all saved slots for the active session in this thread.
         """
-        gm = self.bot.get_cog("GameMaster")
-        if not gm:
-            await ctx.send("❌ GameMaster cog not available.")
-            return
-
-        thread_id = ctx.channel.id
-        session = gm.sessions.get(thread_id)
+        session = self._session_for(ctx)
         if not session:
             await ctx.send("❌ No active session found.")
             return
 
-        session_id = session["session_id"]
-        db = Database()
-        conn = db.get_connection()
-        cursor = conn.cursor(dictionary=True)
         try:
-            sql = "SELECT slot, timestamp FROM session_saves WHERE session_id = %s"
-            cursor.execute(sql, (session_id,))
-            rows = cursor.fetchall()
-            if not rows:
-                await ctx.send("❌ You have no saved games.")
-                return
-            embed = discord.Embed(title="🗃️ Your Save Slots", color=discord.Color.blue())
-            for row in rows:
-                # The table presumably uses an integer UNIX timestamp or a datetime. Adjust as needed.
-                saved_ts = row.get('timestamp')
-                if isinstance(saved_ts, int):
-                    saved_time = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(saved_ts))
-                else:
-                    # If it's a datetime object, just convert to str
-                    saved_time = str(saved_ts)
-                embed.add_field(name=f"Slot {row['slot']}", value=f"Saved on {saved_time}", inline=False)
-            await ctx.send(embed=embed)
+            rows = await asyncio.to_thread(SessionSaveModel.list_slots, session.session_id)
         except Exception as e:
             logger.error("Error listing saved sessions: %s", e, exc_info=True)
             await ctx.send("❌ Failed to list saved games.")
-        finally:
-            cursor.close()
-            conn.close()
+            return
+        if not rows:
+            await ctx.send("❌ You have no saved games.")
+            return
+
+        embed = discord.Embed(title="🗃️ Your Save Slots", color=discord.Color.blue())
+        for row in rows:
+            saved_ts = row.get("timestamp")
+            saved_time = saved_ts.strftime('%Y-%m-%d %H:%M:%S') if saved_ts else "unknown"
+            details = f"Saved on {saved_time}"
+            if row.get("current_floor") is not None:
+                details += (
+                    f"\nFloor {row['current_floor']}/{row.get('total_floors') or '?'}"
+                    f" · {row.get('difficulty') or 'Unknown'}"
+                    f" · {row.get('num_players') or '?'} player(s)"
+                )
+            name = f"Slot {row['slot']} – {row['save_title']}"
+            if row.get("is_auto_save"):
+                name += " (auto)"
+            embed.add_field(name=name, value=details, inline=False)
+        await ctx.send(embed=embed)
 
 async def setup(bot):
     await bot.add_cog(SaveGame(bot))
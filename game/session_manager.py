@@ -1,16 +1,21 @@
 import discord
-from discord.ext import commands
+from discord import app_commands
+from discord.ext import commands, tasks
 import logging
 from typing import Optional, Tuple, Dict, List, Any
 import mysql.connector
-import json
 import asyncio
+import contextlib
+import time
 
 from models.session_models import SessionModel, SessionPlayerModel
+from models.hub_model import HubModel
 from core.game_session import GameSession  # New GameSession object
+from utils.minimap import build_floor_grid, drop_session_grids
+from utils.helpers import load_config, approx_size
+from utils import save_codec
 
 logger = logging.getLogger("SessionManager")
-logger.setLevel(logging.DEBUG)
 
 def build_main_menu_view(is_active_turn: bool, vendor_id: Optional[int] = None) -> discord.ui.View:
     """
@@ -77,8 +82,22 @@ class SessionManager(commands.Cog):
         self.bot = bot
         # In-memory sessions: keys are session IDs; values are GameSession instances.
         self.sessions: Dict[int, GameSession] = {}
+        # thread_id (str) -> session_id, so get_session() doesn't scan
+        self.thread_index: Dict[str, int] = {}
+        # thread_id (str) -> session_id for sessions persisted and evicted
+        # while idle; get_session() brings them back on next use
+        self.evicted: Dict[str, int] = {}
+        self._recovered = False
+
+        cfg = (load_config() or {}).get("sessions", {})
+        self.idle_ttl = float(cfg.get("idle_ttl_minutes", 60)) * 60
+        self.max_resident = int(cfg.get("max_resident", 200))
+        self.eviction_loop.change_interval(minutes=float(cfg.get("eviction_check_minutes", 5)))
         logger.info("SessionManager cog initialized. In-memory sessions dict created.")
 
+    async def cog_unload(self) -> None:
+        self.eviction_loop.cancel()
+
     def db_connect(self) -> mysql.connector.connection.MySQLConnection:
         logger.debug("SessionManager.db_connect called.")
         from models.database import Database
@@ -176,7 +195,7 @@ class SessionManager(commands.Cog):
             )
             new_session.players = current_players
             new_session.current_turn = owner.id
-            self.sessions[session_id] = new_session
+            self.store_session(new_session)
             logger.info("GameSession %s created and stored in memory.", session_id)
 
             await thread.add_user(owner)
@@ -244,19 +263,62 @@ class SessionManager(commands.Cog):
         if session:
             for key, val in new_state.items():
                 setattr(session, key, val)
-            logger.info("Session %s state updated: %s", session_id, new_state)
+            # keys only: values can be whole room / battle dicts
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Session %s state updated: %s", session_id, ", ".join(new_state))
+
+    def store_session(self, session: GameSession) -> None:
+        """Keep a session in memory and index it by its thread."""
+        old = self.sessions.get(session.session_id)
+        if old is not None:
+            self.thread_index.pop(old.thread_id, None)
+        self.sessions[session.session_id] = session
+        self.thread_index[str(session.thread_id)] = session.session_id
+
+    def release_session_caches(self, session_id: int, thread_id: Optional[str]) -> None:
+        """
+        Drop everything other cogs keep per session / per thread, so an
+        ended or evicted session leaves nothing behind.
+        """
+        drop_session_grids(session_id)
+        autosave = self.bot.get_cog("Autosave")
+        if autosave:
+            autosave.forget(session_id)
+        hub = self.bot.get_cog("HubManager")
+        if hub:
+            hub.lfg_posts.pop(session_id, None)      # lfg_posts table still has them
+        if thread_id is not None:
+            em = self.bot.get_cog("EmbedManager")
+            if em:
+                em.release_channel(int(thread_id))
+            gm = self.bot.get_cog("GameMaster")
+            if gm:
+                gm.intro_data.pop(int(thread_id), None)
 
     def delete_session_state(self, session_id: int) -> None:
-        if session_id in self.sessions:
+        session = self.sessions.get(session_id)
+        self.release_session_caches(session_id, session.thread_id if session else None)
+        # an evicted session is not in self.sessions, so match it by id
+        for thread_id in [t for t, sid in self.evicted.items() if sid == session_id]:
+            del self.evicted[thread_id]
+        if session is not None:
+            self.thread_index.pop(str(session.thread_id), None)
             del self.sessions[session_id]
             logger.info("Session %s removed from memory.", session_id)
 
-    async def terminate_session(self, session_id: int, reason: str) -> None:
+    async def terminate_session(self, session_id: int, reason: str, record_scores: bool = True) -> None:
         logger.debug("terminate_session called for %s: %s", session_id, reason)
+        if record_scores:
+            # must run before the status flips to 'ended' (that is what dedups it)
+            rows = HubModel.record_session_scores(session_id)
+            hub = self.bot.get_cog("HubManager")
+            if rows and hub:
+                hub.leaderboard.record(rows)
         try:
             conn = self.db_connect()
             cur = conn.cursor()
             cur.execute("UPDATE sessions SET status='ended' WHERE session_id=%s", (session_id,))
+            cur.execute("DELETE FROM session_deltas WHERE session_id=%s", (session_id,))
             conn.commit()
             cur.close()
             conn.close()
@@ -267,9 +329,11 @@ class SessionManager(commands.Cog):
             self.delete_session_state(session_id)
 
     def get_session(self, thread_id: int) -> Optional[GameSession]:
-        for s in self.sessions.values():
-            if s.thread_id == str(thread_id):
-                return s
+        session = self.sessions.get(self.thread_index.get(str(thread_id)))
+        if session is not None and session.thread_id == str(thread_id):
+            return session
+        if str(thread_id) in self.evicted:
+            return self._rehydrate(str(thread_id))
         return None
 
     async def refresh_current_state(self, interaction: discord.Interaction) -> None:
@@ -473,7 +537,7 @@ class SessionManager(commands.Cog):
             tid = int(row["thread_id"])
             # 2) End it in the DB and in‑memory
             try:
-                await self.terminate_session(sid, "Cleaned up unsaved session")
+                await self.terminate_session(sid, "Cleaned up unsaved session", record_scores=False)
             except Exception as e:
                 errors.append(f"• Failed to terminate session {sid}: {e}")
                 continue
@@ -521,50 +585,20 @@ class SessionManager(commands.Cog):
         # 2) update the DB thread pointer
         SessionModel.update_thread_id(session_id, str(thread.id))
 
-        # 3) Rehydrate full session state from saved JSON
-        raw = SessionModel.get_game_state(session_id)
-
-        # ——— Normalize whatever get_game_state returned ———
-
-        # Case A: no state found
+        # 3) Rehydrate full session state (save blob, or legacy JSON)
+        raw = SessionModel.load_session_state(session_id, GameSession.SCHEMA_VERSION)
         if raw is None:
             return await interaction.response.send_message(
                 "❌ Could not find saved session state.", ephemeral=True
             )
 
-        # Case B: raw is a row‐dict with only a 'game_state' column
-        if isinstance(raw, dict) and "session_id" not in raw:
-            if "game_state" in raw and isinstance(raw["game_state"], str):
-                try:
-                    raw = json.loads(raw["game_state"])
-                except Exception as e:
-                    logger.error(
-                        "Failed to parse game_state for session %s: %s",
-                        session_id, e, exc_info=True
-                    )
-                    raw = {}
-            else:
-                # unexpected shape: start fresh
-                raw = {}
-
-        # Case C: raw is a JSON string
-        elif isinstance(raw, str):
-            try:
-                raw = json.loads(raw)
-            except Exception as e:
-                logger.error(
-                    "Failed to parse game_state string for session %s: %s",
-                    session_id, e, exc_info=True
-                )
-                raw = {}
-
         # ─── **NEW**: ensure the dict actually has session_id for from_dict() ───────────
         raw.setdefault("session_id", session_id)
         raw["guild_id"]  = guild.id
         raw["thread_id"] = str(thread.id)
         # 4) now rebuild the in‐memory session exactly as before
         session = GameSession.from_dict(raw)
-        self.sessions[session.session_id] = session
+        self.store_session(session)
 
         # 5) re‑invite all players
         for pid in session.players:
@@ -612,6 +646,191 @@ class SessionManager(commands.Cog):
 
 
 
+    # ──────────────────────────────────────────────────────────────────
+    #  Idle eviction
+    # ──────────────────────────────────────────────────────────────────
+    @commands.Cog.listener()
+    async def on_interaction(self, interaction: discord.Interaction) -> None:
+        if interaction.channel_id is None:
+            return
+        session = self.get_session(interaction.channel_id)
+        if session:
+            session.touch()
+
+    @tasks.loop(minutes=5)
+    async def eviction_loop(self) -> None:
+        try:
+            await self.evict_idle_sessions()
+        except Exception as e:
+            logger.error("Idle eviction pass failed: %s", e, exc_info=True)
+
+    async def evict_idle_sessions(self) -> int:
+        """
+        Persist and evict sessions idle for longer than idle_ttl, then the
+        least recently active ones while more than max_resident remain.
+        Returns how many sessions were evicted.
+        """
+        now = time.monotonic()
+        by_age = sorted(self.sessions.values(), key=lambda s: s.last_active)
+        over_cap = len(by_age) - self.max_resident
+        victims = [
+            s for i, s in enumerate(by_age)
+            if i < over_cap or now - s.last_active > self.idle_ttl
+        ]
+        for session in victims:
+            await self.evict_session(session)
+        if victims:
+            logger.info("Evicted %d idle session(s); %d resident.", len(victims), len(self.sessions))
+        return len(victims)
+
+    async def evict_session(self, session: GameSession) -> None:
+        """Write a full save for `session`, then drop it and its caches from memory."""
+        seen = session.last_active
+        bs = self.bot.get_cog("BattleSystem")
+        if bs and session.battle_state:
+            bs._flush_combatants(session)        # pending HP lives only in the snapshot
+        autosave = self.bot.get_cog("Autosave")
+        async with autosave.session_lock(session.session_id) if autosave else contextlib.nullcontext():
+            payload = save_codec.snapshot(session.to_dict())
+            blob = save_codec.seal(payload, schema_version=GameSession.SCHEMA_VERSION)
+            await asyncio.to_thread(SessionModel.write_session_blob, session.session_id, blob, False)
+
+        # it may have been touched or ended while we were writing
+        if self.sessions.get(session.session_id) is not session or session.last_active != seen:
+            return
+        self.release_session_caches(session.session_id, session.thread_id)
+        self.thread_index.pop(str(session.thread_id), None)
+        del self.sessions[session.session_id]
+        self.evicted[str(session.thread_id)] = session.session_id
+        logger.debug("Session %s evicted (%d bytes saved).", session.session_id, len(blob))
+
+    def _rehydrate(self, thread_id: str) -> Optional[GameSession]:
+        """Reload an evicted session from its save on first use."""
+        session_id = self.evicted.pop(thread_id)
+        state = SessionModel.load_session_state(
+            session_id, GameSession.SCHEMA_VERSION, active_only=True
+        )
+        if state is None:
+            logger.warning("Evicted session %s has no save or is no longer active; dropping it.", session_id)
+            return None
+        session = GameSession.from_dict(state)
+        session.players = SessionPlayerModel.get_players(session_id) or session.players
+        self.store_session(session)
+        logger.debug("Session %s rehydrated for thread %s.", session_id, thread_id)
+        return session
+
+    @app_commands.command(
+        name="sessionstats",
+        description="Show how many game sessions are resident and roughly how much memory they use."
+    )
+    @app_commands.checks.has_permissions(administrator=True)
+    async def sessionstats(self, interaction: discord.Interaction) -> None:
+        now = time.monotonic()
+        sizes = {sid: approx_size(s.to_dict()) for sid, s in self.sessions.items()}
+        idle = sorted(now - s.last_active for s in self.sessions.values())
+        lines = [
+            f"Resident sessions: **{len(self.sessions)}** / cap {self.max_resident}",
+            f"Evicted (reload on use): **{len(self.evicted)}**",
+            f"Approx. memory: **{sum(sizes.values()) / 1024:.1f} KiB**",
+            f"Idle TTL: {self.idle_ttl / 60:.0f} min",
+        ]
+        if idle:
+            lines.append(f"Idle: median {idle[len(idle) // 2] / 60:.1f} min, max {idle[-1] / 60:.1f} min")
+        if sizes:
+            biggest = max(sizes, key=sizes.get)
+            lines.append(f"Largest: session {biggest} ({sizes[biggest] / 1024:.1f} KiB)")
+        await interaction.response.send_message("\n".join(lines), ephemeral=True)
+
+    # ──────────────────────────────────────────────────────────────────
+    #  Crash recovery
+    # ──────────────────────────────────────────────────────────────────
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        # on_ready fires again after every reconnect; recover only once
+        if not self.eviction_loop.is_running():
+            self.eviction_loop.start()
+        if self._recovered:
+            return
+        self._recovered = True
+        try:
+            await self.recover_active_sessions()
+        except Exception as e:
+            logger.error("Session recovery failed: %s", e, exc_info=True)
+
+    async def recover_active_sessions(self) -> int:
+        """
+        Rebuild every status='active' session after a restart so games
+        carry on in their existing threads. State comes from the latest
+        save blob plus autosave deltas (see Autosave); everything is read
+        in one batch off the event loop, then the threads are resolved
+        concurrently. Returns the number of sessions recovered.
+        """
+        start = time.perf_counter()
+        loaded = await asyncio.to_thread(
+            SessionModel.load_active_sessions, GameSession.SCHEMA_VERSION
+        )
+        db_ms = (time.perf_counter() - start) * 1000
+
+        sessions = []
+        for entry in loaded:
+            state = entry["state"]
+            if state["session_id"] in self.sessions:
+                continue
+            try:
+                session = GameSession.from_dict(state)
+            except Exception as e:
+                logger.error("Could not rebuild session %s: %s",
+                             state["session_id"], e, exc_info=True)
+                continue
+            if entry["players"]:
+                session.players = entry["players"]
+                session.num_players = len(entry["players"])
+            if session.current_turn not in session.players and session.players:
+                session.current_turn = session.players[0]
+            for floor_id, rows in entry["rooms"].items():
+                build_floor_grid(floor_id, rows, session.session_id)
+            sessions.append(session)
+
+        threads_start = time.perf_counter()
+        threads = await asyncio.gather(
+            *(self._resolve_thread(s.thread_id) for s in sessions)
+        )
+        threads_ms = (time.perf_counter() - threads_start) * 1000
+
+        recovered = 0
+        for session, thread in zip(sessions, threads):
+            if thread is None:
+                logger.warning("Session %s: thread %s is gone; leaving it for the hub loader.",
+                               session.session_id, session.thread_id)
+                drop_session_grids(session.session_id)
+                continue
+            self.store_session(session)
+            recovered += 1
+
+        logger.info(
+            "Recovered %d/%d active session(s) in %.1f ms (db %.1f ms, threads %.1f ms).",
+            recovered, len(loaded), (time.perf_counter() - start) * 1000, db_ms, threads_ms
+        )
+        return recovered
+
+    async def _resolve_thread(self, thread_id: str) -> Optional[discord.Thread]:
+        """Find a session thread, un-archiving it if it went idle while we were down."""
+        try:
+            tid = int(thread_id)
+            thread = self.bot.get_channel(tid) or await self.bot.fetch_channel(tid)
+        except (ValueError, discord.NotFound, discord.Forbidden):
+            return None
+        except discord.HTTPException as e:
+            logger.warning("Could not fetch thread %s: %s", thread_id, e)
+            return None
+        if isinstance(thread, discord.Thread) and thread.archived:
+            try:
+                await thread.edit(archived=False)
+            except discord.HTTPException as e:
+                logger.warning("Could not unarchive thread %s: %s", thread_id, e)
+        return thread
+
+
 async def setup(bot: commands.Bot) -> None:
     await bot.add_cog(SessionManager(bot))
     logger.info("SessionManager cog loaded ✔")
@@ -10,9 +10,9 @@ import discord
 from discord.ext import commands
 
 from models.database import Database  # project DB wrapper
+from utils import tracing
 
 logger = logging.getLogger("TreasureChest")
-logger.setLevel(logging.DEBUG)
 
 # ──────────────────────────────────────────────────────────────
 #  Helper functions
@@ -175,9 +175,11 @@ class StartChestUnlockView(discord.ui.View):
         if img:
             embed.set_image(url=f"{img}?t={int(time.time())}")
 
-        await interaction.message.edit(
-            embed=embed, view=UnlockChestView(self.instance_id)
-        )
+        with tracing.span("discord_edit"):
+            await interaction.message.edit(
+                embed=embed, view=UnlockChestView(self.instance_id)
+            )
+        tracing.finish()
 
 
 # ──────────────────────────────────────────────────────────────
@@ -350,20 +352,8 @@ class UnlockChestView(discord.ui.View):
                                 discord.ui.Button(label=label, style=style, custom_id=cid, row=row)
                             )
 
-                    # fetch floor rooms for mini-map
-                    floor_rooms = []
+                    # mini-map comes from the floor's cached glyph grid
                     if gm:
-                        conn2 = gm.db_connect()
-                        with conn2.cursor(dictionary=True) as cur2:
-                            cur2.execute(
-                                "SELECT coord_x, coord_y, room_type "
-                                "FROM rooms "
-                                "WHERE session_id=%s AND floor_id=%s",
-                                (inst["session_id"], inst["floor_id"]),
-                            )
-                            floor_rooms = cur2.fetchall()
-                        conn2.close()
-
                         discovered_here = {
                             (x, y) for (f, x, y) in discovered_3d if f == inst["floor_id"]
                         }
@@ -375,7 +365,8 @@ class UnlockChestView(discord.ui.View):
                         }
                         visible = discovered_here | neighbours
                         local_map = gm._render_local_map(
-                            all_rooms=floor_rooms,
+                            session_id=inst["session_id"],
+                            floor_id=inst["floor_id"],
                             center=(inst["coord_x"], inst["coord_y"]),
                             discovered=discovered_here,
                             reveal=visible,
@@ -449,20 +440,8 @@ class UnlockChestView(discord.ui.View):
                                 discord.ui.Button(label=label, style=style, custom_id=cid, row=row)
                             )
 
-                    # fetch floor rooms for mini-map
-                    floor_rooms = []
+                    # mini-map comes from the floor's cached glyph grid
                     if gm:
-                        conn3 = gm.db_connect()
-                        with conn3.cursor(dictionary=True) as cur3:
-                            cur3.execute(
-                                "SELECT coord_x, coord_y, room_type "
-                                "FROM rooms "
-                                "WHERE session_id=%s AND floor_id=%s",
-                                (inst["session_id"], inst["floor_id"]),
-                            )
-                            floor_rooms = cur3.fetchall()
-                        conn3.close()
-
                         discovered_3d = await gm.update_permanent_discovered_room(
                             interaction.user.id,
                             inst["session_id"],
@@ -479,7 +458,8 @@ class UnlockChestView(discord.ui.View):
                         }
                         visible = discovered_here | neighbours
                         local_map = gm._render_local_map(
-                            all_rooms=floor_rooms,
+                            session_id=inst["session_id"],
+                            floor_id=inst["floor_id"],
                             center=(inst["coord_x"], inst["coord_y"]),
                             discovered=discovered_here,
                             reveal=visible,
@@ -1,134 +1,122 @@
 import discord
 import json
 import logging
-from models.database import Database  # Centralized database helper
+from typing import List, Optional
+
+from models.hub_model import HubModel
 
 logger = logging.getLogger("HubEmbed")
-logger.setLevel(logging.DEBUG)
+
+# ──────────────────────────────────────────────────────────────────────
+# Prebuilt hub content (loaded once, replaced only by reload_hub_content)
+# ──────────────────────────────────────────────────────────────────────
+_main_embed: Optional[discord.Embed] = None
+_tutorial_pages: Optional[List[discord.Embed]] = None
+
+TUTORIAL_FOOTER = "Use the Next and Previous buttons to navigate, or Back to return to the main menu."
+
+
+def _build_main_embed(config) -> discord.Embed:
+    embed = discord.Embed(
+        title=config.get("title") or "Welcome to AdventureBot!",
+        description=config.get("description") or "Select an option below to start or join a game.",
+        color=discord.Color.blue()
+    )
+    if config.get("image_url"):
+        embed.set_image(url=config["image_url"])
+    if config.get("text_field"):
+        embed.add_field(name="**__News__**", value=config["text_field"], inline=False)
+    return embed
+
+
+def _build_tutorial_page(step, page: int) -> discord.Embed:
+    embed = discord.Embed(
+        title=step.get("title", f"Tutorial - Step {page}"),
+        description=step.get("description", "Learn how to play the game here."),
+        color=discord.Color.purple()
+    )
+    if step.get("image_url"):
+        embed.set_image(url=step["image_url"])
+    embed.set_footer(text=TUTORIAL_FOOTER)
+    return embed
+
+
+def reload_hub_content() -> int:
+    """
+    (Re)loads the 'hub_embeds' rows and prebuilds the main hub embed and every
+    tutorial page. Returns the number of tutorial pages.
+    """
+    global _main_embed, _tutorial_pages
+    config = HubModel.get_main_hub_config()
+    steps = HubModel.get_tutorial_steps()
+    _main_embed = _build_main_embed(config or {})
+    _tutorial_pages = [_build_tutorial_page(step, i) for i, step in enumerate(steps, start=1)]
+    logger.info("Hub content loaded (%d tutorial pages).", len(_tutorial_pages))
+    return len(_tutorial_pages)
+
 
 def get_main_hub_embed():
     """
-    Retrieves the main hub embed configuration from the 'hub_embeds' table
-    where embed_type is 'main'. If not found, returns a fallback embed.
+    Returns a copy of the prebuilt main hub embed (from the 'hub_embeds' row
+    where embed_type is 'main', or the fallback embed).
     """
-    db = Database()
-    conn = db.get_connection()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        sql = "SELECT * FROM hub_embeds WHERE embed_type = 'main' LIMIT 1"
-        cursor.execute(sql)
-        result = cursor.fetchone()
-        if result:
-            embed = discord.Embed(
-                title=result.get("title", "Welcome to AdventureBot!"),
-                description=result.get("description", "Select an option below:"),
-                color=discord.Color.blue()
-            )
-            if result.get("image_url"):
-                embed.set_image(url=result["image_url"])
-            if result.get("text_field"):
-                embed.add_field(name="**__News__**", value=result["text_field"], inline=False)
-            return embed
-        else:
-            embed = discord.Embed(
-                title="Welcome to AdventureBot!",
-                description="Select an option below to start or join a game.",
-                color=discord.Color.blue()
-            )
-            embed.set_image(url="https://yourdomain.com/path/to/large_logo.jpg")
-            embed.add_field(name="**__News__**", value="Game Hub configured via backend.", inline=False)
-            return embed
-    except Exception as e:
-        logger.error("Error retrieving main hub embed: %s", e, exc_info=True)
-        return discord.Embed(
-            title="Welcome to AdventureBot!",
-            description="Select an option below to start or join a game.",
-            color=discord.Color.blue()
-        )
-    finally:
-        cursor.close()
-        conn.close()
+    if _main_embed is None:
+        reload_hub_content()
+    return _main_embed.copy()
 
 def get_tutorial_embed(page: int):
     """
-    Retrieves the tutorial embed for the specified page.
-    Queries the 'hub_embeds' table for entries with embed_type 'tutorial'
-    ordered by step_order and returns the embed for the given page.
+    Returns a copy of the prebuilt tutorial embed for the specified page
+    (pages wrap around).
     """
-    db = Database()
-    conn = db.get_connection()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        sql = "SELECT * FROM hub_embeds WHERE embed_type = 'tutorial' ORDER BY step_order ASC"
-        cursor.execute(sql)
-        steps = cursor.fetchall()
-        total_pages = len(steps)
-        if total_pages == 0:
-            embed = discord.Embed(
-                title=f"Tutorial - Step {page}",
-                description="No tutorial content found in the backend.",
-                color=discord.Color.purple()
-            )
-            return embed
-
-        index = (page - 1) % total_pages
-        step = steps[index]
-        embed = discord.Embed(
-            title=step.get("title", f"Tutorial - Step {page}"),
-            description=step.get("description", "Learn how to play the game here."),
-            color=discord.Color.purple()
-        )
-        if step.get("image_url"):
-            embed.set_image(url=step["image_url"])
-        embed.set_footer(text="Use the Next and Previous buttons to navigate, or Back to return to the main menu.")
-        return embed
-    except Exception as e:
-        logger.error("Error retrieving tutorial embed: %s", e, exc_info=True)
+    if _tutorial_pages is None:
+        reload_hub_content()
+    if not _tutorial_pages:
         return discord.Embed(
             title=f"Tutorial - Step {page}",
-            description="An error occurred while loading the tutorial.",
+            description="No tutorial content found in the backend.",
             color=discord.Color.purple()
         )
-    finally:
-        cursor.close()
-        conn.close()
+    return _tutorial_pages[(page - 1) % len(_tutorial_pages)].copy()
 
 def get_tutorial_page_count() -> int:
     """
-    Retrieves the number of tutorial pages from the 'hub_embeds' table.
+    Returns the number of prebuilt tutorial pages.
     """
-    db = Database()
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    try:
-        sql = "SELECT COUNT(*) FROM hub_embeds WHERE embed_type = 'tutorial'"
-        cursor.execute(sql)
-        count = cursor.fetchone()[0]
-        return count
-    except Exception as e:
-        logger.error("Error retrieving tutorial page count: %s", e, exc_info=True)
-        return 0
-    finally:
-        cursor.close()
-        conn.close()
+    if _tutorial_pages is None:
+        reload_hub_content()
+    return len(_tutorial_pages)
 
-def get_high_scores_embed(high_scores_data):
+def get_high_scores_embed(high_scores_data, sort_by="play_time"):
     """
     Constructs an embed to display high scores.
-    Expects high_scores_data as a list of dictionaries containing score info.
+    Expects high_scores_data as a list of dictionaries containing score info,
+    already ordered by `sort_by`.
     """
+    sort_titles = {
+        "play_time": "fastest completed runs",
+        "enemies_defeated": "most enemies defeated",
+        "gil": "most gil",
+        "player_level": "highest level",
+    }
     embed = discord.Embed(
         title="High Scores",
-        description="Top players and session stats:",
+        description=f"Top players by {sort_titles.get(sort_by, 'fastest runs')}:",
         color=discord.Color.gold()
     )
     if not high_scores_data:
         embed.add_field(name="No scores available", value="Be the first to set a record!", inline=False)
     else:
-        for entry in high_scores_data:
+        for rank, entry in enumerate(high_scores_data, start=1):
+            minutes, seconds = divmod(entry.get("play_time") or 0, 60)
             embed.add_field(
-                name=f"{entry.get('player_name', 'Unknown')} ({entry.get('player_class', 'N/A')})",
-                value=f"Rooms: {entry.get('rooms', 'N/A')}\nEnemies: {entry.get('enemies', 'N/A')}\nGil: {entry.get('gil', 'N/A')}",
+                name=f"#{rank} {entry.get('player_name', 'Unknown')} ({entry.get('player_class') or 'N/A'})",
+                value=(
+                    f"Level: {entry.get('player_level', 'N/A')}\n"
+                    f"Enemies: {entry.get('enemies_defeated', 'N/A')}\n"
+                    f"Gil: {entry.get('gil', 'N/A')}\n"
+                    f"Time: {minutes}m {seconds:02d}s"
+                ),
                 inline=False
             )
     embed.set_footer(text="Press 'Back' to return to the main menu.")
@@ -2,15 +2,16 @@ import discord
 from discord.ext import commands
 from discord import app_commands, InteractionType
 import logging
-from typing import Any, Dict, List
-from models.session_models import SessionModel, SessionPlayerModel, ClassModel
+from typing import Any, Dict, List, Optional
+from models.session_models import SessionModel
+from models.hub_model import HubModel
 # Import hub_embed here (helper module for constructing hub embeds)
 from hub import hub_embed
+from hub.leaderboard import Leaderboard, SORT_KEYS
 # Import queue‐embed helpers from GameMaster
 from game.game_master import build_queue_embed, _build_queue_view
 
 logger = logging.getLogger("HubManager")
-logger.setLevel(logging.DEBUG)
 
 def is_admin_or_mod():
     async def predicate(interaction: discord.Interaction) -> bool:
@@ -29,8 +30,15 @@ class HubManager(commands.Cog):
         self.bot = bot
         self.hub_channel_id = None  # Stores hub channel ID.
         self.hub_message_id = None  # Stores main hub message ID.
+        self.leaderboard = Leaderboard(top_n=10)
+        # session_id ➜ {hub_channel_id, hub_message_id, queue_message_id}
+        self.lfg_posts: Dict[int, Dict[str, Optional[int]]] = {}
         logger.debug("HubManager cog initialized: bot=%s", bot)
 
+    def warm_caches(self) -> None:
+        """Prebuild the hub and tutorial embeds before the first click (run in a thread at startup)."""
+        hub_embed.reload_hub_content()
+
     @app_commands.command(
         name="adventuresetup",
         description="Run the AdventureBot setup wizard to create or update the game hub."
@@ -76,9 +84,9 @@ class HubManager(commands.Cog):
                 overwrites=overwrites,
                 reason="Setting up AdventureBot hub for Dungeon Adventure."
             )
-            logger.info(f"★ Created hub channel: {hub_channel.name} (ID: {hub_channel.id})")
+            logger.info("★ Created hub channel: %s (ID: %s)", hub_channel.name, hub_channel.id)
         else:
-            logger.info(f"★ Using existing hub channel: {hub_channel.name} (ID: {hub_channel.id})")
+            logger.info("★ Using existing hub channel: %s (ID: %s)", hub_channel.name, hub_channel.id)
 
         self.hub_channel_id = hub_channel.id
 
@@ -97,10 +105,10 @@ class HubManager(commands.Cog):
 
         if hub_message:
             await hub_message.edit(embed=embed, view=view)
-            logger.info(f"★ Updated existing hub message (ID: {hub_message.id})")
+            logger.info("★ Updated existing hub message (ID: %s)", hub_message.id)
         else:
             hub_message = await hub_channel.send(embed=embed, view=view)
-            logger.info(f"★ Posted new hub message (ID: {hub_message.id})")
+            logger.info("★ Posted new hub message (ID: %s)", hub_message.id)
 
         self.hub_message_id = hub_message.id
         await interaction.response.send_message(
@@ -108,6 +116,34 @@ class HubManager(commands.Cog):
             ephemeral=True
         )
 
+    @app_commands.command(
+        name="hubreload",
+        description="Reload the hub and tutorial embeds from the database."
+    )
+    @is_admin_or_mod()
+    async def hubreload(self, interaction: discord.Interaction) -> None:
+        """
+        Rebuilds the cached hub/tutorial embeds after `hub_embeds` was edited
+        and refreshes the posted hub message if this process knows it.
+        """
+        pages = hub_embed.reload_hub_content()
+
+        if self.hub_channel_id and self.hub_message_id:
+            hub_channel = self.bot.get_channel(self.hub_channel_id)
+            if hub_channel:
+                try:
+                    await hub_channel.get_partial_message(self.hub_message_id).edit(
+                        embed=hub_embed.get_main_hub_embed(),
+                        view=HubView()
+                    )
+                except discord.HTTPException as e:
+                    logger.warning("hubreload: could not refresh hub message: %s", e)
+
+        await interaction.response.send_message(
+            f"✅ Hub content reloaded ({pages} tutorial page(s)).",
+            ephemeral=True
+        )
+
     async def post_lfg_post(
         self,
         interaction: discord.Interaction,
@@ -150,28 +186,49 @@ class HubManager(commands.Cog):
         )
         lfg_msg = await hub_channel.send(embed=lfg_embed, view=lfg_view)
         lfg_view.lfg_message_id = lfg_msg.id
+        self.record_lfg_message(
+            session_id,
+            hub_channel_id=hub_channel.id,
+            hub_message_id=lfg_msg.id
+        )
 
-        logger.info(f"★ Posted LFG post (ID: {lfg_msg.id}) in hub for session {session_id} by {starter_name}")
+        logger.info("★ Posted LFG post (ID: %s) in hub for session %s by %s", lfg_msg.id, session_id, starter_name)
 
-    async def cleanup_lfg_posts(self, starter_name: str, thread_id: int):
+    # ──────────────────────────────────────────────────────────────────
+    # LFG message ids (memory first, lfg_posts table after a restart)
+    # ──────────────────────────────────────────────────────────────────
+    def get_lfg_record(self, session_id: int) -> Dict[str, Optional[int]]:
+        rec = self.lfg_posts.get(session_id)
+        if rec is None:
+            rec = HubModel.get_lfg_post(session_id) or {}
+            self.lfg_posts[session_id] = rec
+        return rec
+
+    def record_lfg_message(self, session_id: int, **ids: int) -> None:
+        """Remember LFG-related message ids (hub post / thread queue embed) for a session."""
+        self.get_lfg_record(session_id).update(ids)
+        HubModel.save_lfg_post(session_id, **ids)
+
+    async def cleanup_lfg_posts(self, session_id: int):
         """
-        Cleans up any LFG posts in the hub channel for a given session starter and thread.
+        Deletes the LFG post of a session from the hub channel using its recorded message id.
         """
-        if not self.hub_channel_id:
+        rec = self.get_lfg_record(session_id)
+        self.lfg_posts.pop(session_id, None)
+        HubModel.delete_lfg_post(session_id)
+
+        message_id = rec.get("hub_message_id")
+        hub_channel = self.bot.get_channel(rec.get("hub_channel_id") or self.hub_channel_id or 0)
+        if not message_id or not hub_channel:
+            logger.debug("No LFG post recorded for session %s.", session_id)
             return
-        hub_channel = self.bot.get_channel(self.hub_channel_id)
-        if not hub_channel:
-            return
-
-        thread_id_str = str(thread_id)
-        async for message in hub_channel.history(limit=100):
-            if message.author.id != self.bot.user.id or not message.embeds:
-                continue
-            for embed in message.embeds:
-                footer = embed.footer.text or ""
-                if f"Starter: {starter_name}" in footer and f"Session Thread ID: {thread_id_str}" in footer:
-                    await message.delete()
-                    logger.info(f"★ Deleted LFG post (message ID: {message.id})")
+        try:
+            await hub_channel.get_partial_message(message_id).delete()
+            logger.info("★ Deleted LFG post (message ID: %s)", message_id)
+        except discord.NotFound:
+            logger.debug("LFG post %s for session %s was already gone.", message_id, session_id)
+        except discord.HTTPException as e:
+            logger.warning("Could not delete LFG post %s: %s", message_id, e)
 
     @commands.Cog.listener()
     async def on_interaction(self, interaction: discord.Interaction) -> None:
@@ -196,7 +253,7 @@ class HubManager(commands.Cog):
 
         # ——— EPHEMERAL MENU: LOAD GAME ———
         if cid == "hub_load_game":
-            saved = SessionModel.get_saved_sessions_for_user(interaction.user.id)
+            saved = SessionModel.get_saved_session_summaries(interaction.user.id)
             if not saved:
                 return await interaction.response.send_message(
                     "❌ You have no saved adventures to load.",
@@ -210,10 +267,9 @@ class HubManager(commands.Cog):
                 color=discord.Color.blue()
             )
             for idx, s in enumerate(saved, start=1):
-                players = SessionPlayerModel.get_player_states(s["session_id"])
                 lines = [
-                    f"<@{p['player_id']}> **{ClassModel.get_class_name(p['class_id'])} Lv {p['level']}**"
-                    for p in players
+                    f"<@{p['player_id']}> **{p['class_name']} Lv {p['level']}**"
+                    for p in s["players"]
                 ]
                 embed.add_field(
                     name=f"Slot {idx}: Session #{s['session_id']} ({s['difficulty']})",
@@ -259,13 +315,13 @@ class HubManager(commands.Cog):
                 view=TutorialView(current_page=1)
             )
 
-        if cid == "hub_high_scores":
-            from sessions import session_manager  # adjust as needed
-            high_scores = await session_manager.get_high_scores()
-            new_embed = hub_embed.get_high_scores_embed(high_scores)
+        if cid == "hub_high_scores" or cid.startswith("hub_high_scores_"):
+            sort_by = cid[len("hub_high_scores_"):] or "play_time"
+            high_scores = self.leaderboard.top(interaction.guild_id, sort_by)
+            new_embed = hub_embed.get_high_scores_embed(high_scores, sort_by)
             return await interaction.response.edit_message(
                 embed=new_embed,
-                view=None
+                view=HighScoresView()
             )
 
         if cid == "hub_back":
@@ -275,7 +331,7 @@ class HubManager(commands.Cog):
                 view=HubView()
             )
 
-        logger.debug(f"HubManager: unhandled custom_id='{cid}'")
+        logger.debug("HubManager: unhandled custom_id=%r", cid)
 
 
 
@@ -300,6 +356,27 @@ class HubView(discord.ui.View):
         ))
 
 
+class HighScoresView(discord.ui.View):
+    LABELS = {
+        "play_time": "Fastest",
+        "enemies_defeated": "Enemies",
+        "gil": "Gil",
+        "player_level": "Level",
+    }
+
+    def __init__(self):
+        super().__init__(timeout=None)
+        for key in SORT_KEYS:
+            self.add_item(discord.ui.Button(
+                label=self.LABELS.get(key, key), style=discord.ButtonStyle.primary,
+                custom_id=f"hub_high_scores_{key}", row=0
+            ))
+        self.add_item(discord.ui.Button(
+            label="Back", style=discord.ButtonStyle.secondary,
+            custom_id="hub_back", row=1
+        ))
+
+
 class LoadSessionView(discord.ui.View):
     def __init__(self, sessions: List[Dict[str, Any]]):
         super().__init__(timeout=None)
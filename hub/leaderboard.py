@@ -0,0 +1,85 @@
+# hub/leaderboard.py
+# Per-guild top-N high score lists, kept in memory and updated as sessions end
+import bisect
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from models.hub_model import HubModel
+
+logger = logging.getLogger("Leaderboard")
+
+# sort key ➜ rank tuple (smaller ranks higher); mirrors HubModel.HIGH_SCORE_ORDER
+SORT_KEYS: Dict[str, Callable[[Dict[str, Any]], Tuple]] = {
+    "play_time":        lambda r: (r["play_time"] or 0, -(r["enemies_defeated"] or 0)),
+    "enemies_defeated": lambda r: (-(r["enemies_defeated"] or 0), r["play_time"] or 0),
+    "gil":              lambda r: (-(r["gil"] or 0), r["play_time"] or 0),
+    "player_level":     lambda r: (-(r["player_level"] or 0), r["play_time"] or 0),
+}
+
+
+class _Board:
+    """One sorted top-N list: parallel rank keys and rows."""
+    __slots__ = ("ranks", "rows")
+
+    def __init__(self):
+        self.ranks: List[Tuple] = []
+        self.rows: List[Dict[str, Any]] = []
+
+    def insert(self, rank: Tuple, row: Dict[str, Any], limit: int) -> None:
+        # bisect_right keeps older scores ahead of equal newer ones (score_id order)
+        idx = bisect.bisect_right(self.ranks, rank)
+        if idx >= limit:
+            return
+        self.ranks.insert(idx, rank)
+        self.rows.insert(idx, row)
+        del self.ranks[limit:], self.rows[limit:]
+
+
+class Leaderboard:
+    """
+    Keeps the top `top_n` scores of each guild for every sort key.
+    A guild is read from `high_scores` (one indexed LIMIT query per key) the
+    first time its board is opened; after that new scores are merged in as
+    sessions end, so opening the board never touches the database.
+    """
+
+    def __init__(self, top_n: int = 10):
+        self.top_n = top_n
+        self._guilds: Dict[int, Dict[str, _Board]] = {}
+
+    def _load(self, guild_id: int) -> Dict[str, _Board]:
+        boards: Dict[str, _Board] = {}
+        for key, rank in SORT_KEYS.items():
+            board = _Board()
+            for row in HubModel.get_high_scores(guild_id, key, self.top_n):
+                board.ranks.append(rank(row))
+                board.rows.append(row)
+            boards[key] = board
+        self._guilds[guild_id] = boards
+        logger.debug("Leaderboard loaded for guild %s.", guild_id)
+        return boards
+
+    def top(self, guild_id: int, sort_by: str = "play_time") -> List[Dict[str, Any]]:
+        """Return the current top list for `guild_id` ordered by `sort_by`."""
+        if sort_by not in SORT_KEYS:
+            sort_by = "play_time"
+        boards = self._guilds.get(guild_id) or self._load(guild_id)
+        return list(boards[sort_by].rows)
+
+    def record(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """
+        Merge freshly inserted high_scores rows into any loaded guild boards.
+        Guilds that were never opened are skipped; they load from the table.
+        """
+        for row in rows:
+            boards = self._guilds.get(row["guild_id"])
+            if boards is None:
+                continue
+            for key, rank in SORT_KEYS.items():
+                if key == "play_time" and not row.get("completed"):
+                    continue    # fastest runs: completed games only (see HubModel.get_high_scores)
+                boards[key].insert(rank(row), row, self.top_n)
+
+    def forget(self, guild_id: int) -> None:
+        """Drop a guild's boards so the next open re-reads the table."""
+        self._guilds.pop(guild_id, None)
@@ -0,0 +1,2 @@
+# loadtest/__init__.py
+"""Offline load testing against the real cogs; run with `python -m loadtest --help`."""
@@ -0,0 +1,407 @@
+# loadtest/fakes.py
+"""
+Just enough of the Discord object model to run the real cogs offline.
+
+Every API call a cog makes (send, edit, defer, followup…) is recorded on
+the World, optionally delayed by a fixed round-trip to mimic Discord, and
+the newest message carrying a view in each channel is kept as that
+channel's "screen" – the buttons a simulated player can press next.
+
+The fakes follow discord.py's rules where the cogs could get them wrong:
+responding twice raises InteractionResponded and a followup before any
+response raises NotFound, so such bugs show up as errors in the report
+instead of being hidden.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import discord
+from discord.utils import MISSING
+
+
+def _not_found(what: str) -> discord.NotFound:
+    return discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), what)
+
+
+class World:
+    """Registry of fake guilds/channels/users plus the API-call recorder."""
+
+    def __init__(self, api_latency: float = 0.0):
+        self.api_latency = api_latency
+        # snowflake-like ids, so nothing collides with rows from earlier runs
+        self._ids = itertools.count(int(time.time() * 1000) << 22)
+        self.channels: Dict[int, "FakeTextChannel"] = {}
+        self.users: Dict[int, "FakeMember"] = {}
+        self.screens: Dict[int, "FakeMessage"] = {}
+        self.api_calls: Counter = Counter()
+        self.guild = FakeGuild(self, "Load Test")
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    async def api(self, kind: str) -> None:
+        self.api_calls[kind] += 1
+        if self.api_latency:
+            await asyncio.sleep(self.api_latency)
+
+    def show(self, message: "FakeMessage") -> None:
+        self.screens[message.channel.id] = message
+
+    def add_user(self, name: str) -> "FakeMember":
+        user = FakeMember(self, self.next_id(), name)
+        self.users[user.id] = user
+        return user
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Messages
+# ──────────────────────────────────────────────────────────────────────────
+class FakeMessage:
+    def __init__(self, channel: "FakeTextChannel", *, content: Optional[str] = None,
+                 embeds: Optional[List[discord.Embed]] = None, view: Optional[discord.ui.View] = None,
+                 ephemeral: bool = False, author: Any = None):
+        self.channel = channel
+        self.guild = channel.guild
+        self.id = channel.world.next_id()
+        self.content = content or ""
+        self.embeds = list(embeds or [])
+        self.view = view
+        self.ephemeral = ephemeral
+        self.author = author
+        self.deleted = False
+
+    def __repr__(self) -> str:
+        return f"<FakeMessage id={self.id} channel={self.channel.id}>"
+
+    @property
+    def jump_url(self) -> str:
+        return f"https://discord.com/channels/{self.guild.id}/{self.channel.id}/{self.id}"
+
+    @property
+    def buttons(self) -> List[discord.ui.Button]:
+        """Enabled buttons with a custom_id (what a player can press)."""
+        if self.view is None or self.deleted:
+            return []
+        return [
+            item for item in self.view.children
+            if isinstance(item, discord.ui.Button) and item.custom_id and not item.disabled
+        ]
+
+    def _apply(self, content=MISSING, embed=MISSING, embeds=MISSING, view=MISSING) -> None:
+        if content is not MISSING:
+            self.content = content or ""
+        if embed is not MISSING:
+            self.embeds = [embed] if embed is not None else []
+        if embeds is not MISSING:
+            self.embeds = list(embeds or [])
+        if view is not MISSING:
+            self.view = view
+            self.channel.world.show(self)
+
+    async def edit(self, *, content=MISSING, embed=MISSING, embeds=MISSING, view=MISSING, **_: Any) -> "FakeMessage":
+        await self.channel.world.api("message_edit")
+        if self.deleted:
+            raise _not_found("Unknown Message")
+        self._apply(content, embed, embeds, view)
+        return self
+
+    async def delete(self, *, delay: Optional[float] = None) -> None:
+        await self.channel.world.api("message_delete")
+        self.deleted = True
+        self.channel.messages.pop(self.id, None)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Channels
+# ──────────────────────────────────────────────────────────────────────────
+class FakeTextChannel:
+    # class-level defaults shadow discord.Thread's slots/properties in FakeThread
+    id = 0
+    name = ""
+    guild = None
+    parent_id = None
+    archived = False
+    locked = False
+    owner_id = None
+    members = None
+    messages = None
+    type = discord.ChannelType.text
+
+    def __init__(self, world: World, guild: "FakeGuild", name: str):
+        self.world = world
+        self.guild = guild
+        self.id = world.next_id()
+        self.name = name
+        self.messages: Dict[int, FakeMessage] = {}
+        self.members: List["FakeMember"] = []
+        world.channels[self.id] = self
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} id={self.id} name={self.name!r}>"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, FakeTextChannel) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    @property
+    def mention(self) -> str:
+        return f"<#{self.id}>"
+
+    @property
+    def jump_url(self) -> str:
+        return f"https://discord.com/channels/{self.guild.id}/{self.id}"
+
+    async def send(self, content: Optional[str] = None, *, embed: Optional[discord.Embed] = None,
+                   embeds: Optional[List[discord.Embed]] = None, view: Optional[discord.ui.View] = None,
+                   **_: Any) -> FakeMessage:
+        await self.world.api("channel_send")
+        msg = FakeMessage(self, content=content, embeds=embeds or ([embed] if embed else []), view=view)
+        self.messages[msg.id] = msg
+        if view is not None:
+            self.world.show(msg)
+        return msg
+
+    def get_partial_message(self, message_id: int) -> FakeMessage:
+        msg = self.messages.get(message_id)
+        if msg is None:
+            # a partial for a message we never saw: edits will 404 like Discord's
+            msg = FakeMessage(self)
+            msg.id = message_id
+            msg.deleted = True
+        return msg
+
+    async def fetch_message(self, message_id: int) -> FakeMessage:
+        await self.world.api("fetch_message")
+        msg = self.messages.get(message_id)
+        if msg is None:
+            raise _not_found("Unknown Message")
+        return msg
+
+    async def history(self, *, limit: Optional[int] = 100, **_: Any):
+        await self.world.api("history")
+        for msg in list(reversed(self.messages.values()))[:limit]:
+            yield msg
+
+    async def create_thread(self, *, name: str, **_: Any) -> "FakeThread":
+        await self.world.api("create_thread")
+        return FakeThread(self.world, self.guild, name, parent=self)
+
+    async def edit(self, **kwargs: Any) -> "FakeTextChannel":
+        await self.world.api("channel_edit")
+        for key in ("name", "archived", "locked"):
+            if key in kwargs:
+                setattr(self, key, kwargs[key])
+        return self
+
+    async def delete(self, **_: Any) -> None:
+        await self.world.api("channel_delete")
+        self.world.channels.pop(self.id, None)
+        self.world.screens.pop(self.id, None)
+
+    async def set_permissions(self, *_: Any, **__: Any) -> None:
+        await self.world.api("set_permissions")
+
+
+class FakeThread(FakeTextChannel, discord.Thread):
+    """Passes isinstance(…, discord.Thread); behaviour comes from FakeTextChannel."""
+    type = discord.ChannelType.private_thread
+
+    def __init__(self, world: World, guild: "FakeGuild", name: str, parent: FakeTextChannel):
+        super().__init__(world, guild, name)
+        self.parent_id = parent.id
+
+    @property
+    def parent(self) -> Optional[FakeTextChannel]:
+        return self.world.channels.get(self.parent_id)
+
+    async def add_user(self, user: "FakeMember") -> None:
+        await self.world.api("thread_add_user")
+        if user not in self.members:
+            self.members.append(user)
+
+    async def remove_user(self, user: "FakeMember") -> None:
+        await self.world.api("thread_remove_user")
+        if user in self.members:
+            self.members.remove(user)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Guild / members
+# ──────────────────────────────────────────────────────────────────────────
+class FakeMember:
+    bot = False
+
+    def __init__(self, world: World, user_id: int, name: str):
+        self.world = world
+        self.id = user_id
+        self.name = name
+        self.display_name = name
+        self.global_name = name
+        self.guild_permissions = discord.Permissions.none()
+
+    def __repr__(self) -> str:
+        return f"<FakeMember id={self.id} name={self.name!r}>"
+
+    def __eq__(self, other: Any) -> bool:
+        return getattr(other, "id", None) == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    @property
+    def guild(self) -> "FakeGuild":
+        return self.world.guild
+
+
+class FakeGuild:
+    def __init__(self, world: World, name: str):
+        self.world = world
+        self.id = world.next_id()
+        self.name = name
+        self.default_role = SimpleNamespace(id=self.id, name="@everyone")
+        self.me = SimpleNamespace(id=0, name="AdventureBot", display_name="AdventureBot")
+
+    @property
+    def text_channels(self) -> List[FakeTextChannel]:
+        return [c for c in self.world.channels.values() if not isinstance(c, FakeThread)]
+
+    @property
+    def members(self) -> List[FakeMember]:
+        return list(self.world.users.values())
+
+    def get_member(self, user_id: int) -> Optional[FakeMember]:
+        return self.world.users.get(user_id)
+
+    def get_channel(self, channel_id: int) -> Optional[FakeTextChannel]:
+        return self.world.channels.get(channel_id)
+
+    def get_thread(self, thread_id: int) -> Optional[FakeThread]:
+        chan = self.world.channels.get(thread_id)
+        return chan if isinstance(chan, FakeThread) else None
+
+    async def create_text_channel(self, name: str, **_: Any) -> FakeTextChannel:
+        await self.world.api("create_channel")
+        return FakeTextChannel(self.world, self, name)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Interactions
+# ──────────────────────────────────────────────────────────────────────────
+class FakeResponse:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    def _ack(self) -> None:
+        if self._done:
+            raise discord.InteractionResponded(self._interaction)
+        self._done = True
+
+    async def defer(self, *, ephemeral: bool = False, thinking: bool = False) -> None:
+        self._ack()
+        await self._interaction.world.api("defer")
+        if thinking:
+            self._interaction._original = FakeMessage(self._interaction.channel, ephemeral=ephemeral)
+
+    async def send_message(self, content: Optional[str] = None, *, embed: Optional[discord.Embed] = None,
+                           embeds: Optional[List[discord.Embed]] = None, view: Optional[discord.ui.View] = None,
+                           ephemeral: bool = False, **_: Any) -> None:
+        self._ack()
+        await self._interaction.world.api("response_send")
+        msg = FakeMessage(self._interaction.channel, content=content,
+                          embeds=embeds or ([embed] if embed else []), view=view, ephemeral=ephemeral)
+        self._interaction._original = msg
+        if not ephemeral:
+            self._interaction.channel.messages[msg.id] = msg
+        if view is not None:
+            self._interaction.world.show(msg)
+
+    async def edit_message(self, *, content=MISSING, embed=MISSING, embeds=MISSING, view=MISSING, **_: Any) -> None:
+        self._ack()
+        await self._interaction.world.api("response_edit")
+        msg = self._interaction.message
+        if msg is not None:
+            msg._apply(content, embed, embeds, view)
+            self._interaction._original = msg
+
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+
+    async def send(self, content: Optional[str] = None, *, embed: Optional[discord.Embed] = None,
+                   embeds: Optional[List[discord.Embed]] = None, view: Optional[discord.ui.View] = None,
+                   ephemeral: bool = False, **_: Any) -> FakeMessage:
+        inter = self._interaction
+        await inter.world.api("followup_send")
+        if not inter.response.is_done():
+            raise _not_found("Unknown Webhook")      # no followups before the initial response
+        msg = FakeMessage(inter.channel, content=content,
+                          embeds=embeds or ([embed] if embed else []), view=view, ephemeral=ephemeral)
+        if not ephemeral:
+            inter.channel.messages[msg.id] = msg
+        if view is not None:
+            inter.world.show(msg)
+        return msg
+
+
+class FakeInteraction:
+    """A button press by `user` on `message` in `channel`."""
+
+    def __init__(self, world: World, client: Any, user: FakeMember, channel: FakeTextChannel,
+                 message: Optional[FakeMessage], custom_id: str):
+        self.world = world
+        self.client = client
+        self.id = world.next_id()
+        self.application_id = 0
+        self.type = discord.InteractionType.component
+        self.data = {"custom_id": custom_id, "component_type": discord.ComponentType.button.value}
+        self.user = user
+        self.guild = channel.guild
+        self.guild_id = channel.guild.id
+        self.channel = channel
+        self.channel_id = channel.id
+        self.message = message
+        self.locale = discord.Locale.american_english
+        self.created_at = discord.utils.utcnow()
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self._original: Optional[FakeMessage] = None
+
+    def __repr__(self) -> str:
+        return f"<FakeInteraction custom_id={self.data['custom_id']!r} user={self.user.id}>"
+
+    async def original_response(self) -> FakeMessage:
+        await self.world.api("original_response")
+        if self._original is None:
+            raise _not_found("Unknown Message")
+        return self._original
+
+    async def edit_original_response(self, *, content=MISSING, embed=MISSING, embeds=MISSING,
+                                     view=MISSING, **_: Any) -> FakeMessage:
+        await self.world.api("original_edit")
+        if self._original is None:
+            if not self.response.is_done():
+                raise _not_found("Unknown Webhook")
+            self._original = self.message or FakeMessage(self.channel)
+        self._original._apply(content, embed, embeds, view)
+        return self._original
+
+    async def delete_original_response(self) -> None:
+        await self.world.api("original_delete")
+        self._original = None
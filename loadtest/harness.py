@@ -0,0 +1,471 @@
+# loadtest/harness.py
+"""
+Offline load test: N simulated players each start a session and play it
+through the real cogs, with Discord replaced by loadtest.fakes and a real
+MySQL/MariaDB behind models/.
+
+    python -m loadtest --mysql-database adventure_loadtest --sessions 25 --actions 80 --load-dump
+
+Each player reads the buttons on its thread's current screen and presses
+one (difficulty → start → class → intro → move / fight / shop / stairs),
+exactly as a person would. Reports interactions per second, wall-clock
+latency per custom_id, the receipt → first update numbers from
+utils.tracing, DB usage from utils.db_metrics and Discord API call counts.
+
+The SQL is MySQL-specific (JSON functions, ON DUPLICATE KEY, ENUMs), so
+there is no SQLite mode; --mysql-database is required and must name a
+scratch database (the dump drops and recreates every table). The bot's
+own database from config.json is refused.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import glob
+import json
+import logging
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+
+import discord
+from discord.ext import commands
+
+from loadtest.fakes import FakeInteraction, FakeMessage, FakeTextChannel, World, _not_found
+from utils import db_metrics, tracing
+from utils.cog_discovery import COG_DIRECTORIES, discover_cogs
+from utils.helpers import get_bot_root, load_config
+from utils.log_config import configure_logging
+
+logger = logging.getLogger("LoadTest")
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Bot
+# ──────────────────────────────────────────────────────────────────────────
+class HarnessBot(commands.Bot):
+    """commands.Bot whose channels live in a World and whose events can be awaited."""
+
+    def __init__(self, world: World):
+        super().__init__(command_prefix="/", intents=discord.Intents.default())
+        self.world = world
+        self.errors: Counter = Counter()
+        self._collect: Optional[List[asyncio.Task]] = None
+
+    def get_channel(self, id: int) -> Optional[FakeTextChannel]:
+        return self.world.channels.get(id)
+
+    async def fetch_channel(self, channel_id: int) -> FakeTextChannel:
+        await self.world.api("fetch_channel")
+        chan = self.world.channels.get(channel_id)
+        if chan is None:
+            raise _not_found("Unknown Channel")
+        return chan
+
+    def _schedule_event(self, coro, event_name, *args, **kwargs) -> asyncio.Task:
+        task = super()._schedule_event(coro, event_name, *args, **kwargs)
+        if self._collect is not None:
+            self._collect.append(task)
+        return task
+
+    async def on_error(self, event_method: str, /, *args: Any, **kwargs: Any) -> None:
+        label = db_metrics.interaction_label(args[0]) if args else event_method
+        self.errors[label] += 1
+        logger.error("Unhandled error in %s (%s)", event_method, label, exc_info=True)
+
+    async def press(self, interaction: FakeInteraction) -> None:
+        """
+        Deliver one button press the way the gateway would: every
+        on_interaction listener plus the view callback of the pressed item,
+        under one DB scope and trace (as bot.AdventureBot.dispatch does).
+        Returns once all of them have finished.
+        """
+        label = db_metrics.interaction_label(interaction)
+        with db_metrics.interaction_scope(label), tracing.interaction_trace(label):
+            self._collect = []
+            try:
+                self.dispatch("interaction", interaction)
+            finally:
+                pending, self._collect = self._collect, None
+            item = self._view_item(interaction)
+            if item is not None:
+                pending.append(asyncio.create_task(self._run_view_item(item, interaction, label)))
+        if pending:
+            await asyncio.gather(*pending)
+
+    @staticmethod
+    def _view_item(interaction: FakeInteraction) -> Optional[discord.ui.Button]:
+        msg = interaction.message
+        if msg is None or msg.view is None:
+            return None
+        for item in msg.view.children:
+            if getattr(item, "custom_id", None) != interaction.data["custom_id"]:
+                continue
+            # plain Buttons only exist to carry a custom_id for on_interaction
+            if getattr(item.callback, "__func__", None) is discord.ui.Button.callback:
+                return None
+            return item
+        return None
+
+    async def _run_view_item(self, item: discord.ui.Button, interaction: FakeInteraction, label: str) -> None:
+        try:
+            if await item.view.interaction_check(interaction):
+                await item.callback(interaction)
+        except Exception:
+            self.errors[label] += 1
+            logger.error("Unhandled error in view callback (%s)", label, exc_info=True)
+
+
+def discover_extensions() -> List[str]:
+    """Same rule as bot.py: every module under game/ and hub/ with a setup(), dependencies first."""
+    return [cog.name for cog in discover_cogs(COG_DIRECTORIES)]
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Database
+# ──────────────────────────────────────────────────────────────────────────
+def apply_db_config(overrides: Dict[str, Any], bot: Optional[commands.Bot] = None) -> None:
+    """Point every place that holds a copy of config["mysql"] at the test DB."""
+    from models import database
+    from utils import stat_levelup
+
+    database.DB_CONFIG.update(overrides)
+    stat_levelup.db_config.update(overrides)
+    if bot is not None:
+        for name in ("GameMaster", "BattleSystem"):
+            cog = bot.get_cog(name)
+            if cog is not None:
+                cog.db_config = {**cog.db_config, **overrides}
+
+
+def prepare_database(db: Dict[str, Any], dump: str) -> None:
+    """Load a dump into db["database"] with the mysql client, then apply newer tables/columns."""
+    if dump == "latest":
+        dumps = sorted(glob.glob(os.path.join(get_bot_root(), "database", "dump-adventure-*.sql")))
+        if not dumps:
+            raise SystemExit("No database/dump-adventure-*.sql found.")
+        dump = dumps[-1]
+
+    base = ["mysql", "-h", str(db.get("host", "localhost")), "-u", str(db.get("user", "root"))]
+    if db.get("port"):
+        base += ["-P", str(db["port"])]
+    env = {**os.environ, "MYSQL_PWD": str(db.get("password", ""))}
+    logger.info("Loading %s into `%s`…", os.path.basename(dump), db["database"])
+    subprocess.run(base + ["-e", f"CREATE DATABASE IF NOT EXISTS `{db['database']}`"], env=env, check=True)
+    with open(dump, "rb") as fh:
+        subprocess.run(base + [db["database"]], stdin=fh, env=env, check=True)
+
+    import mysql.connector
+    from database import database_setup
+    with mysql.connector.connect(**db) as cnx:
+        with cnx.cursor() as cur:
+            for tbl in database_setup.TABLE_ORDER:
+                cur.execute(database_setup.TABLES[tbl])
+            database_setup.ensure_added_columns(cur)
+            database_setup.ensure_added_indexes(cur)
+        cnx.commit()
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Players
+# ──────────────────────────────────────────────────────────────────────────
+class Results:
+    def __init__(self):
+        self.latency: Dict[str, List[float]] = defaultdict(list)
+        self.outcomes: Counter = Counter()
+        self.stuck_on: Counter = Counter()
+
+    def record(self, label: str, seconds: float) -> None:
+        self.latency[label].append(seconds)
+
+    @property
+    def interactions(self) -> int:
+        return sum(len(v) for v in self.latency.values())
+
+
+class Player:
+    """One simulated session owner pressing whatever their screen offers."""
+
+    def __init__(self, bot: HarnessBot, hub: FakeTextChannel, index: int,
+                 args: argparse.Namespace, results: Results):
+        self.bot = bot
+        self.world = bot.world
+        self.hub = hub
+        self.args = args
+        self.results = results
+        self.user = self.world.add_user(f"loadtest-{index}")
+        self.rng = random.Random(f"{args.seed}-{index}")
+        self.thread: Optional[FakeTextChannel] = None
+        self.shop_steps = 0
+        self.outcome = "running"
+
+    async def press(self, channel: FakeTextChannel, message: Optional[FakeMessage], custom_id: str) -> None:
+        interaction = FakeInteraction(self.world, self.bot, self.user, channel, message, custom_id)
+        start = time.perf_counter()
+        await self.bot.press(interaction)
+        self.results.record(db_metrics.interaction_label(interaction), time.perf_counter() - start)
+        # a paced battle replies in its own task; let it land before reading the screen
+        battle = self.bot.get_cog("BattleSystem")
+        sm = self.bot.get_cog("SessionManager")
+        session = sm.get_session(channel.id) if battle and sm else None
+        task = battle.pending_enemy_turn(session) if session else None
+        if task is not None:
+            await asyncio.wait([task])
+
+    async def screen(self) -> Optional[FakeMessage]:
+        """The thread's current message with buttons, waiting a little for late updates."""
+        deadline = time.perf_counter() + self.args.idle_timeout
+        while True:
+            msg = self.world.screens.get(self.thread.id)
+            if msg is not None and msg.buttons:
+                return msg
+            if time.perf_counter() >= deadline:
+                return msg
+            await asyncio.sleep(0.05)
+
+    def choose(self, ids: List[str]) -> Optional[str]:
+        def starting(*prefixes: str) -> List[str]:
+            return [i for i in ids if i.startswith(prefixes)]
+
+        if starting("death_"):
+            self.outcome = "died"
+            return None
+        wanted = f"difficulty_{self.args.difficulty}" if self.args.difficulty else None
+        if wanted in ids:
+            return wanted
+        for prefix in ("difficulty_", "start_game", "class_", "intro_skip", "intro_",
+                       "battle_victory_continue", "combat_attack"):
+            picks = starting(prefix)
+            if picks:
+                return self.rng.choice(picks)
+
+        # shop: open the buy list, buy one thing, go back
+        if starting("shop_buy_", "buy_") or "shop_back_room" in ids:
+            self.shop_steps += 1
+            if self.shop_steps == 1 and starting("shop_buy_"):
+                return starting("shop_buy_")[0]
+            if self.shop_steps == 2 and starting("buy_"):
+                return self.rng.choice(starting("buy_"))
+            return "shop_back_room" if "shop_back_room" in ids else None
+        self.shop_steps = 0
+
+        if "action_use_stairs" in ids and self.rng.random() < self.args.stairs_rate:
+            return "action_use_stairs"
+        shops = starting("action_shop_")
+        if shops and self.rng.random() < self.args.shop_rate:
+            return self.rng.choice(shops)
+        moves = starting("move_")
+        if moves:
+            return self.rng.choice(moves)
+        if "action_end_turn" in ids:
+            return "action_end_turn"
+        return None
+
+    async def run(self) -> None:
+        try:
+            await self._run()
+        except Exception as e:
+            self.outcome = "crashed"
+            logger.error("Player %s crashed: %s", self.user.name, e, exc_info=True)
+        self.results.outcomes[self.outcome] += 1
+
+    async def _run(self) -> None:
+        hub_message = FakeMessage(self.hub)
+        await self.press(self.hub, hub_message, "setup_new_game")
+        sm = self.bot.get_cog("SessionManager")
+        session = next((s for s in sm.sessions.values() if s.owner_id == self.user.id), None)
+        if session is None:
+            self.outcome = "no_session"
+            return
+        self.thread = self.world.channels.get(int(session.thread_id))
+
+        for _ in range(self.args.actions):
+            msg = await self.screen()
+            ids = [b.custom_id for b in msg.buttons] if msg else []
+            custom_id = self.choose(ids)
+            if custom_id is None:
+                if self.outcome == "running":
+                    self.outcome = "stuck"
+                    self.results.stuck_on[" ".join(sorted(re.sub(r"\d+", "#", i) for i in ids)) or "-"] += 1
+                return
+            await self.press(self.thread, msg, custom_id)
+            if self.args.think_ms:
+                await asyncio.sleep(self.rng.uniform(0.5, 1.5) * self.args.think_ms / 1000)
+        self.outcome = "finished"
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Report
+# ──────────────────────────────────────────────────────────────────────────
+def _pct(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))] if ordered else 0.0
+
+
+def build_report(results: Results, bot: HarnessBot, wall: float, args: argparse.Namespace) -> Dict[str, Any]:
+    per_label = {}
+    for label, samples in results.latency.items():
+        ordered = sorted(samples)
+        per_label[label] = {
+            "count": len(ordered),
+            "p50_ms": _pct(ordered, 50) * 1000,
+            "p95_ms": _pct(ordered, 95) * 1000,
+            "p99_ms": _pct(ordered, 99) * 1000,
+            "max_ms": ordered[-1] * 1000,
+        }
+    return {
+        "sessions": args.sessions,
+        "wall_seconds": wall,
+        "interactions": results.interactions,
+        "throughput_per_s": results.interactions / wall if wall else 0.0,
+        "errors": dict(bot.errors),
+        "outcomes": dict(results.outcomes),
+        "stuck_on": dict(results.stuck_on),
+        "latency": per_label,
+        "first_update": [
+            {"label": label, "count": n, "p50_ms": p50 * 1000, "p95_ms": p95 * 1000, "p99_ms": p99 * 1000}
+            for label, n, p50, p95, p99 in tracing.percentiles("total")
+        ],
+        "db": [
+            {"label": s.label, "queries_per": s.queries_per, "ms_per": s.ms_per, "max_queries": s.max_queries}
+            for s in db_metrics.top_interactions(limit=50)
+        ],
+        "api_calls": dict(bot.world.api_calls),
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"\n{report['sessions']} sessions · {report['interactions']} interactions in "
+          f"{report['wall_seconds']:.1f}s → {report['throughput_per_s']:.1f}/s · "
+          f"{sum(report['errors'].values())} unhandled errors")
+    print("outcomes: " + ", ".join(f"{k} {v}" for k, v in sorted(report["outcomes"].items())))
+    for ids, n in sorted(report["stuck_on"].items(), key=lambda kv: -kv[1]):
+        print(f"  stuck ×{n} on: {ids}")
+
+    print(f"\n{'custom_id':<28}{'n':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}   (wall ms, press → handlers done)")
+    for label, row in sorted(report["latency"].items(), key=lambda kv: -kv[1]["count"]):
+        print(f"{label:<28}{row['count']:>7}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+              f"{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}")
+
+    if report["first_update"]:
+        print("\nreceipt → first update (utils.tracing)")
+        for row in report["first_update"]:
+            print(f"  {row['label']:<26}{row['count']:>7}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}")
+    print("\n" + "\n".join(db_metrics.summary_lines()))
+    if report["errors"]:
+        print("\nunhandled errors: " + ", ".join(f"{k} ×{v}" for k, v in report["errors"].items()))
+    print("\nDiscord API calls: " + ", ".join(f"{k} {v}" for k, v in sorted(report["api_calls"].items())))
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Entry point
+# ──────────────────────────────────────────────────────────────────────────
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    mysql_cfg = (load_config() or {}).get("mysql", {})
+    p = argparse.ArgumentParser(prog="python -m loadtest", description=__doc__.split("\n\n")[0])
+    p.add_argument("--sessions", type=int, default=20, help="concurrent simulated sessions")
+    p.add_argument("--actions", type=int, default=60, help="button presses per session after setup")
+    p.add_argument("--ramp", type=float, default=2.0, help="seconds over which sessions start")
+    p.add_argument("--think-ms", type=float, default=0, help="average pause between presses")
+    p.add_argument("--api-latency-ms", type=float, default=0, help="simulated Discord round-trip per API call")
+    p.add_argument("--difficulty", default=None, help="difficulty name to pick (default: random)")
+    p.add_argument("--shop-rate", type=float, default=0.15, help="chance to enter a shop when offered")
+    p.add_argument("--stairs-rate", type=float, default=0.3, help="chance to take stairs when offered")
+    p.add_argument("--idle-timeout", type=float, default=2.0, help="seconds to wait for a screen with buttons")
+    p.add_argument("--autosave", type=float, default=0, help="run the Autosave loop every N seconds")
+    p.add_argument("--battle-pace", choices=("fast", "normal", "slow"),
+                   help="default battle pace (default: config.json)")
+    p.add_argument("--seed", default="loadtest")
+    p.add_argument("--keep", action="store_true", help="leave the sessions active in the DB afterwards")
+    p.add_argument("--json", dest="json_path", help="also write the report here")
+    p.add_argument("--log-level", default="WARNING")
+    db = p.add_argument_group("database (connection defaults from config.json)")
+    db.add_argument("--mysql-host", default=mysql_cfg.get("host", "localhost"))
+    db.add_argument("--mysql-port", type=int, default=mysql_cfg.get("port"))
+    db.add_argument("--mysql-user", default=mysql_cfg.get("user", "root"))
+    db.add_argument("--mysql-password", default=mysql_cfg.get("password", ""))
+    db.add_argument("--mysql-database", required=True,
+                    help="scratch database to run against; never the bot's own")
+    db.add_argument("--load-dump", nargs="?", const="latest", metavar="PATH",
+                    help="load database/dump-adventure-*.sql (newest, or PATH) first")
+    args = p.parse_args(argv)
+    if args.mysql_database == mysql_cfg.get("database"):
+        p.error(f"--mysql-database {args.mysql_database!r} is the bot's database from config.json; "
+                "use a scratch database (--load-dump drops every table)")
+    return args
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    db = {
+        "host": args.mysql_host,
+        "user": args.mysql_user,
+        "password": args.mysql_password,
+        "database": args.mysql_database,
+    }
+    if args.mysql_port:
+        db["port"] = args.mysql_port
+    if args.load_dump:
+        prepare_database(db, args.load_dump)
+    apply_db_config(db)
+
+    world = World(api_latency=args.api_latency_ms / 1000)
+    bot = HarnessBot(world)
+    async with bot:
+        for module in discover_extensions():
+            try:
+                await bot.load_extension(module)
+            except Exception as e:
+                logger.error("Failed to load %s: %s", module, e)
+        apply_db_config(db, bot)
+
+        hub = FakeTextChannel(world, world.guild, "adventurebot")
+        hub_mgr = bot.get_cog("HubManager")
+        if hub_mgr:
+            hub_mgr.hub_channel_id = hub.id
+        battle = bot.get_cog("BattleSystem")
+        if battle and args.battle_pace:
+            battle.default_pace = args.battle_pace
+        autosave = bot.get_cog("Autosave")
+        if autosave and args.autosave > 0:
+            autosave.autosave_loop.change_interval(seconds=args.autosave)
+            autosave.autosave_loop.start()
+
+        db_metrics.reset()
+        tracing.reset()
+        results = Results()
+        players = [Player(bot, hub, i, args, results) for i in range(args.sessions)]
+        step = args.ramp / max(1, len(players))
+
+        async def start(i: int, player: Player) -> None:
+            await asyncio.sleep(i * step)
+            await player.run()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(start(i, p) for i, p in enumerate(players)))
+        wall = time.perf_counter() - started
+        report = build_report(results, bot, wall, args)
+
+        if autosave and autosave.autosave_loop.is_running():
+            autosave.autosave_loop.cancel()
+        sm = bot.get_cog("SessionManager")
+        if sm and not args.keep:
+            for session in list(sm.sessions.values()):
+                if session.owner_id in world.users:
+                    await sm.terminate_session(session.session_id, "Load test finished", record_scores=False)
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    configure_logging({"level": args.log_level})
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    sys.exit(1 if report["errors"] else 0)
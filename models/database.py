@@ -1,23 +1,23 @@
 import os
-import json
 import logging
 import mysql.connector
 
+from utils.db_metrics import instrument
+from utils.helpers import get_bot_root, load_config as _shared_config
+
 logger = logging.getLogger("Database")
-logger.setLevel(logging.DEBUG)
 
 def load_config():
     """
-    Loads config.json from the project root (one directory up from this file).
+    config.json from the project root, shared with the rest of the bot
+    (see utils.helpers.load_config).
     """
-    script_dir = os.path.dirname(os.path.abspath(__file__))  # e.g. .../AdventureBot/models
-    bot_root = os.path.dirname(script_dir)                   # e.g. .../AdventureBot
-    config_path = os.path.join(bot_root, 'config.json')
-    if not os.path.exists(config_path):
+    config = _shared_config()
+    if config is None:
+        config_path = os.path.join(get_bot_root(), 'config.json')
         logger.error("❌ Config file missing at %s", config_path)
         raise FileNotFoundError(f"Config file not found: {config_path}")
-    with open(config_path, 'r') as f:
-        return json.load(f)
+    return config
 
 config = load_config()
 DB_CONFIG = config['mysql']
@@ -33,7 +33,7 @@ class Database:
     def get_connection(self):
         try:
             conn = mysql.connector.connect(**self.config)
-            return conn
+            return instrument(conn)
         except mysql.connector.Error as err:
             logger.error("Database connection error in Database: %s", err)
             raise
@@ -3,7 +3,6 @@ import logging
 from models.database import Database
 
 logger = logging.getLogger("HubModel")
-logger.setLevel(logging.DEBUG)
 
 class HubModel:
     @staticmethod
@@ -25,10 +24,10 @@ class HubModel:
             else:
                 # Fallback configuration if no row is found.
                 return {
-                    "title": "Welcome to Dungeon Adventure!",
-                    "description": "Select an option below:",
+                    "title": "Welcome to AdventureBot!",
+                    "description": "Select an option below to start or join a game.",
                     "image_url": "https://yourdomain.com/path/to/large_logo.jpg",
-                    "text_field": "Your journey starts here."
+                    "text_field": "Game Hub configured via backend."
                 }
         except Exception as e:
             logger.error("Error retrieving main hub config: %s", e, exc_info=True)
@@ -58,19 +57,38 @@ class HubModel:
             cursor.close()
             conn.close()
 
+    # sort key ➜ ORDER BY clause; every leading column has a (guild_id, col) index
+    # (play_time's is (guild_id, completed, play_time): only cleared runs race)
+    HIGH_SCORE_ORDER = {
+        "play_time":        "play_time ASC, enemies_defeated DESC, score_id ASC",
+        "enemies_defeated": "enemies_defeated DESC, play_time ASC, score_id ASC",
+        "gil":              "gil DESC, play_time ASC, score_id ASC",
+        "player_level":     "player_level DESC, play_time ASC, score_id ASC",
+    }
+
     @staticmethod
-    def get_high_scores():
+    def get_high_scores(guild_id: int, sort_by: str = "play_time", limit: int = 10):
         """
-        Retrieves the top 10 high scores from the 'high_scores' table,
-        ordered primarily by play_time ascending and then enemies_defeated descending.
-        Returns a list of dictionaries.
+        Retrieves the top `limit` high scores of one guild from the 'high_scores'
+        table, ordered by `sort_by` (play_time, enemies_defeated, gil or
+        player_level). The play_time board only lists completed runs, so a
+        game quit after a few seconds can't top it. Returns a list of dictionaries.
         """
+        if sort_by not in HubModel.HIGH_SCORE_ORDER:
+            sort_by = "play_time"
+        order = HubModel.HIGH_SCORE_ORDER[sort_by]
+        where = "guild_id = %s AND completed = 1" if sort_by == "play_time" else "guild_id = %s"
         db = Database()
         conn = db.get_connection()
         cursor = conn.cursor(dictionary=True)
         try:
-            sql = "SELECT * FROM high_scores ORDER BY play_time ASC, enemies_defeated DESC LIMIT 10"
-            cursor.execute(sql)
+            sql = (
+                "SELECT score_id, player_name, guild_id, player_level, player_class, "
+                "       gil, enemies_defeated, play_time, completed, completed_at "
+                f"  FROM high_scores WHERE {where} "
+                f"ORDER BY {order} LIMIT %s"
+            )
+            cursor.execute(sql, (guild_id, limit))
             scores = cursor.fetchall()
             return scores
         except Exception as e:
@@ -79,3 +97,124 @@ class HubModel:
         finally:
             cursor.close()
             conn.close()
+
+    @staticmethod
+    def record_session_scores(session_id: int):
+        """
+        Inserts one 'high_scores' row per player of a session that is about to
+        end (sessions already marked 'ended' are skipped, so a session is only
+        scored once). A run counts as completed when its dungeon had a boss
+        room and none is left (a defeated boss's room becomes 'safe').
+        Returns the inserted rows.
+        """
+        db = Database()
+        conn = db.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute(
+                """
+                SELECT p.username AS player_name, s.guild_id,
+                       p.level AS player_level, c.class_name AS player_class,
+                       p.gil, p.enemies_defeated,
+                       TIMESTAMPDIFF(SECOND, s.created_at, NOW()) AS play_time,
+                       EXISTS (SELECT 1 FROM rooms r
+                                WHERE r.session_id = s.session_id)
+                       AND NOT EXISTS (SELECT 1 FROM rooms r
+                                        WHERE r.session_id = s.session_id
+                                          AND r.room_type = 'boss') AS completed
+                  FROM players p
+                  JOIN sessions s ON s.session_id = p.session_id
+                  LEFT JOIN classes c ON c.class_id = p.class_id
+                 WHERE p.session_id = %s AND s.status <> 'ended'
+                """,
+                (session_id,)
+            )
+            rows = cursor.fetchall()
+            for row in rows:
+                cursor.execute(
+                    """
+                    INSERT INTO high_scores
+                        (player_name, guild_id, player_level, player_class,
+                         gil, enemies_defeated, play_time, completed)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    """,
+                    (row["player_name"], row["guild_id"], row["player_level"],
+                     row["player_class"], row["gil"], row["enemies_defeated"],
+                     row["play_time"], row["completed"])
+                )
+                row["score_id"] = cursor.lastrowid
+            conn.commit()
+            return rows
+        except Exception as e:
+            logger.error("Error recording high scores for session %s: %s", session_id, e, exc_info=True)
+            return []
+        finally:
+            cursor.close()
+            conn.close()
+
+    @staticmethod
+    def save_lfg_post(session_id: int, **ids):
+        """
+        Records the Discord message ids belonging to a session's LFG flow
+        (hub_channel_id, hub_message_id, queue_message_id) in 'lfg_posts'.
+        Only the ids passed are overwritten.
+        """
+        cols = [c for c in ("hub_channel_id", "hub_message_id", "queue_message_id") if c in ids]
+        if not cols:
+            return
+        db = Database()
+        conn = db.get_connection()
+        cursor = conn.cursor()
+        try:
+            sql = (
+                f"INSERT INTO lfg_posts (session_id, {', '.join(cols)}) "
+                f"VALUES (%s, {', '.join('%s' for _ in cols)}) "
+                "ON DUPLICATE KEY UPDATE "
+                + ", ".join(f"{c} = VALUES({c})" for c in cols)
+            )
+            cursor.execute(sql, (session_id, *(ids[c] for c in cols)))
+            conn.commit()
+        except Exception as e:
+            logger.error("Error saving LFG post for session %s: %s", session_id, e, exc_info=True)
+        finally:
+            cursor.close()
+            conn.close()
+
+    @staticmethod
+    def get_lfg_post(session_id: int):
+        """
+        Retrieves the recorded LFG message ids for a session, or None.
+        """
+        db = Database()
+        conn = db.get_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute(
+                "SELECT hub_channel_id, hub_message_id, queue_message_id "
+                "FROM lfg_posts WHERE session_id = %s",
+                (session_id,)
+            )
+            return cursor.fetchone()
+        except Exception as e:
+            logger.error("Error retrieving LFG post for session %s: %s", session_id, e, exc_info=True)
+            return None
+        finally:
+            cursor.close()
+            conn.close()
+
+    @staticmethod
+    def delete_lfg_post(session_id: int):
+        """
+        Removes a session's LFG record once its posts are gone.
+        """
+        db = Database()
+        conn = db.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("DELETE FROM lfg_posts WHERE session_id = %s", (session_id,))
+            conn.commit()
+        except Exception as e:
+            logger.error("Error deleting LFG post for session %s: %s", session_id, e, exc_info=True)
+        finally:
+            cursor.close()
+            conn.close()
@@ -1,11 +1,12 @@
 import json
 import logging
+from zlib import error as zlib_error
 from typing import Union, Optional, Dict, Any, List
 
 from models.database import Database
+from utils import save_codec
 
 logger = logging.getLogger("SessionModels")
-logger.setLevel(logging.DEBUG)
 
 # ────────────────────────────────────────────────────────────────────────
 #  SessionModel
@@ -150,6 +151,239 @@ class SessionModel:
             cur.close()
             conn.close()
 
+    @staticmethod
+    def save_session_blob(session_id: int, state: dict, schema_version: int,
+                          mark_saved: bool = True) -> int:
+        """
+        Persist GameSession.to_dict() as a typed, compressed save blob
+        (utils.save_codec). See write_session_blob. Returns the blob size.
+        """
+        blob = save_codec.dumps(state, schema_version=schema_version)
+        SessionModel.write_session_blob(session_id, blob, mark_saved)
+        return len(blob)
+
+    @staticmethod
+    def write_session_blob(session_id: int, blob: bytes, mark_saved: bool = True) -> None:
+        """
+        Store an encoded save blob and drop the autosave deltas it supersedes.
+        Marks saved=1 unless `mark_saved` is False (autosave compaction).
+        game_state is left alone since it still carries the dungeon layout.
+        """
+        conn = Database().get_connection()
+        cur = conn.cursor()
+        try:
+            if mark_saved:
+                cur.execute(
+                    "UPDATE sessions SET save_blob = %s, saved = 1 WHERE session_id = %s",
+                    (blob, session_id)
+                )
+            else:
+                cur.execute(
+                    "UPDATE sessions SET save_blob = %s WHERE session_id = %s",
+                    (blob, session_id)
+                )
+            cur.execute("DELETE FROM session_deltas WHERE session_id = %s", (session_id,))
+            conn.commit()
+        finally:
+            cur.close()
+            conn.close()
+
+    @staticmethod
+    def append_session_deltas(session_id: int, deltas: Dict[str, bytes]) -> int:
+        """
+        Append autosave deltas ({section: save blob}) for one session in a
+        single insert. Returns the total payload size in bytes.
+        """
+        if not deltas:
+            return 0
+        conn = Database().get_connection()
+        cur = conn.cursor()
+        try:
+            cur.executemany(
+                "INSERT INTO session_deltas (session_id, section, payload) VALUES (%s, %s, %s)",
+                [(session_id, section, payload) for section, payload in deltas.items()]
+            )
+            conn.commit()
+            return sum(len(p) for p in deltas.values())
+        finally:
+            cur.close()
+            conn.close()
+
+    @staticmethod
+    def _decode_saved_state(session_id: int, row: dict, deltas: List[bytes],
+                            schema_version: int) -> Optional[dict]:
+        """
+        Build a session dict from a sessions row (save_blob / game_state) and
+        its autosave deltas in write order, upgraded to `schema_version`.
+        """
+        state = None
+        if row.get("save_blob"):
+            try:
+                version, state = save_codec.loads(row["save_blob"])
+                state = save_codec.upgrade(state, version, schema_version)
+            except (save_codec.SaveCodecError, zlib_error) as e:
+                logger.error("Corrupt save blob for session %s: %s", session_id, e)
+                state = None
+
+        if state is None:
+            raw = row.get("game_state")
+            if isinstance(raw, (str, bytes, bytearray)):
+                try:
+                    raw = json.loads(raw)
+                except json.JSONDecodeError as e:
+                    logger.error("Failed to parse game_state for session %s: %s", session_id, e)
+                    raw = None
+            if not isinstance(raw, dict):
+                return None
+            state = save_codec.upgrade(raw, 0, schema_version)
+
+        for payload in deltas:
+            try:
+                version, section = save_codec.loads(payload)
+            except (save_codec.SaveCodecError, zlib_error) as e:
+                logger.error("Skipping corrupt delta for session %s: %s", session_id, e)
+                continue
+            state.update(save_codec.upgrade(section, version, schema_version))
+        return state
+
+    @staticmethod
+    def load_session_state(session_id: int, schema_version: int,
+                           active_only: bool = False) -> Optional[dict]:
+        """
+        Return the saved GameSession dict for `session_id`, upgraded to
+        `schema_version`, or None when nothing usable is stored (or, with
+        `active_only`, when the session's status is no longer 'active').
+        Reads save_blob plus any autosave deltas on top of it; older saves
+        that only have the JSON game_state are treated as schema 0.
+        """
+        conn = Database().get_connection()
+        cur = conn.cursor(dictionary=True)
+        try:
+            cur.execute(
+                "SELECT save_blob, game_state, status FROM sessions WHERE session_id = %s",
+                (session_id,)
+            )
+            row = cur.fetchone()
+            if row and active_only and row["status"] != "active":
+                return None
+            cur.execute(
+                "SELECT payload FROM session_deltas WHERE session_id = %s ORDER BY delta_id",
+                (session_id,)
+            )
+            deltas = [r["payload"] for r in cur.fetchall()]
+        finally:
+            cur.close()
+            conn.close()
+        if not row:
+            return None
+        return SessionModel._decode_saved_state(session_id, row, deltas, schema_version)
+
+    @staticmethod
+    def load_active_sessions(schema_version: int) -> List[Dict[str, Any]]:
+        """
+        Bulk-load everything needed to rebuild every status='active' session
+        after a restart, in four queries on one connection:
+        sessions, their autosave deltas, their players and their rooms.
+
+        Returns [{"state": session dict, "players": [player_id, ...],
+                  "rooms": {floor_id: [{coord_x, coord_y, room_type}, ...]}}].
+        Sessions that were never saved as a blob are rebuilt from the
+        sessions columns, with game_state holding the dungeon layout.
+        """
+        conn = Database().get_connection()
+        cur = conn.cursor(dictionary=True)
+        try:
+            cur.execute(
+                "SELECT session_id, guild_id, thread_id, owner_id, num_players, current_turn, "
+                "       status, current_floor, total_floors, difficulty, message_id, "
+                "       game_log, game_state, save_blob "
+                "  FROM sessions WHERE status = 'active'"
+            )
+            rows = cur.fetchall()
+            if not rows:
+                return []
+            ids = [r["session_id"] for r in rows]
+            marks = ",".join(["%s"] * len(ids))
+
+            cur.execute(
+                f"SELECT session_id, payload FROM session_deltas "
+                f"WHERE session_id IN ({marks}) ORDER BY delta_id",
+                ids
+            )
+            deltas: Dict[int, List[bytes]] = {}
+            for r in cur.fetchall():
+                deltas.setdefault(r["session_id"], []).append(r["payload"])
+
+            cur.execute(
+                f"SELECT session_id, player_id FROM session_players "
+                f"WHERE session_id IN ({marks}) ORDER BY joined_at ASC",
+                ids
+            )
+            players: Dict[int, List[int]] = {}
+            for r in cur.fetchall():
+                players.setdefault(r["session_id"], []).append(r["player_id"])
+
+            cur.execute(
+                f"SELECT session_id, floor_id, coord_x, coord_y, room_type FROM rooms "
+                f"WHERE session_id IN ({marks})",
+                ids
+            )
+            rooms: Dict[int, Dict[int, List[Dict[str, Any]]]] = {}
+            for r in cur.fetchall():
+                sid = r.pop("session_id")
+                rooms.setdefault(sid, {}).setdefault(r["floor_id"], []).append(r)
+        finally:
+            cur.close()
+            conn.close()
+
+        out = []
+        for row in rows:
+            sid = row["session_id"]
+            layout = row.get("game_state")
+            if isinstance(layout, (str, bytes, bytearray)):
+                try:
+                    layout = json.loads(layout)
+                except json.JSONDecodeError:
+                    layout = None
+
+            state = None
+            if row.get("save_blob") or deltas.get(sid) or (
+                isinstance(layout, dict) and "session_id" in layout
+            ):
+                state = SessionModel._decode_saved_state(
+                    sid, row, deltas.get(sid, []), schema_version
+                )
+            if state is None:
+                log = row.get("game_log")
+                if isinstance(log, (str, bytes, bytearray)):
+                    try:
+                        log = json.loads(log)
+                    except json.JSONDecodeError:
+                        log = []
+                state = {
+                    "current_turn":  row["current_turn"],
+                    "current_floor": row["current_floor"] or 1,
+                    "total_floors":  row["total_floors"] or 1,
+                    "difficulty":    row["difficulty"] or "Easy",
+                    "num_players":   row["num_players"],
+                    "message_id":    row["message_id"],
+                    "game_log":      log or [],
+                    "game_state":    layout if isinstance(layout, dict) else {},
+                }
+
+            # the sessions row is authoritative for identity and placement
+            state["session_id"] = sid
+            state["guild_id"]   = row["guild_id"]
+            state["thread_id"]  = row["thread_id"]
+            state["owner"]      = row["owner_id"]
+            state["status"]     = row["status"]
+            out.append({
+                "state":   state,
+                "players": players.get(sid, []),
+                "rooms":   rooms.get(sid, {}),
+            })
+        return out
+
     @staticmethod
     def is_owner(session_id: int, player_id: int) -> bool:
         db = Database()
@@ -223,6 +457,50 @@ class SessionModel:
             cur.close()
             conn.close()
 
+    @staticmethod
+    def get_saved_session_summaries(player_id: int) -> list[dict]:
+        """
+        Saved sessions this player has joined, each with a light roster for
+        the hub-load menu, in one query (no JSON columns):
+          [{session_id, difficulty, players: [{player_id, class_name, level}]}]
+        """
+        db = Database()
+        conn = db.get_connection()
+        try:
+            cur = conn.cursor(dictionary=True)
+            cur.execute(
+                """
+                SELECT s.session_id, s.difficulty,
+                       p.player_id, p.level,
+                       COALESCE(c.class_name, 'Unknown') AS class_name
+                  FROM session_players me
+                  JOIN sessions s ON s.session_id = me.session_id
+                  LEFT JOIN players p ON p.session_id = s.session_id
+                  LEFT JOIN classes c ON c.class_id = p.class_id
+                 WHERE me.player_id = %s
+                   AND s.saved = 1
+                 ORDER BY s.session_id ASC, p.player_id ASC
+                """,
+                (player_id,)
+            )
+            summaries: Dict[int, dict] = {}
+            for row in cur.fetchall():
+                entry = summaries.setdefault(row["session_id"], {
+                    "session_id": row["session_id"],
+                    "difficulty": row["difficulty"],
+                    "players":    [],
+                })
+                if row["player_id"] is not None:
+                    entry["players"].append({
+                        "player_id":  row["player_id"],
+                        "class_name": row["class_name"],
+                        "level":      row["level"],
+                    })
+            return list(summaries.values())
+        finally:
+            cur.close()
+            conn.close()
+
     @staticmethod
     def update_thread_id(session_id: int, new_thread_id: str) -> None:
         """Point this session record at a freshly‑created thread."""
@@ -240,6 +518,98 @@ class SessionModel:
             conn.close()
 
 
+# ────────────────────────────────────────────────────────────────────────
+#  SessionSaveModel  (session_saves slots)
+# ────────────────────────────────────────────────────────────────────────
+class SessionSaveModel:
+    # to_dict() keys copied into saved_state, so listing never reads blobs.
+    # Legacy rows hold the whole state JSON there, which has the same keys.
+    SUMMARY_KEYS = ("difficulty", "current_floor", "total_floors", "num_players")
+
+    @staticmethod
+    def save_slot(session_id: int, slot: int, save_title: str, blob: bytes,
+                  summary: Dict[str, Any], is_auto_save: bool = False) -> None:
+        """Write (or overwrite) one slot and mark the session saved."""
+        conn = Database().get_connection()
+        cur = conn.cursor()
+        try:
+            cur.execute(
+                "REPLACE INTO session_saves "
+                "  (session_id, slot, save_title, is_auto_save, saved_state, save_blob) "
+                "VALUES (%s, %s, %s, %s, %s, %s)",
+                (session_id, slot, save_title, is_auto_save, json.dumps(summary), blob)
+            )
+            cur.execute("UPDATE sessions SET saved = 1 WHERE session_id = %s", (session_id,))
+            conn.commit()
+        finally:
+            cur.close()
+            conn.close()
+
+    @staticmethod
+    def list_slots(session_id: int) -> List[Dict[str, Any]]:
+        """Slot metadata only – save_blob is never read."""
+        conn = Database().get_connection()
+        cur = conn.cursor(dictionary=True)
+        try:
+            cur.execute(
+                """
+                SELECT slot, save_title, is_auto_save, timestamp,
+                       JSON_UNQUOTE(JSON_EXTRACT(saved_state, '$.difficulty')) AS difficulty,
+                       JSON_EXTRACT(saved_state, '$.current_floor')  AS current_floor,
+                       JSON_EXTRACT(saved_state, '$.total_floors')   AS total_floors,
+                       JSON_EXTRACT(saved_state, '$.num_players')    AS num_players
+                  FROM session_saves
+                 WHERE session_id = %s
+                 ORDER BY slot
+                """,
+                (session_id,)
+            )
+            return cur.fetchall()
+        finally:
+            cur.close()
+            conn.close()
+
+    @staticmethod
+    def load_slot(session_id: int, slot: int, schema_version: int) -> Optional[dict]:
+        """
+        Return the GameSession dict saved in `slot`, upgraded to
+        `schema_version`. Slots written before save_blob existed keep the
+        whole state as JSON in saved_state and load as schema 0.
+        """
+        conn = Database().get_connection()
+        cur = conn.cursor(dictionary=True)
+        try:
+            cur.execute(
+                "SELECT save_blob, saved_state FROM session_saves "
+                "WHERE session_id = %s AND slot = %s",
+                (session_id, slot)
+            )
+            row = cur.fetchone()
+        finally:
+            cur.close()
+            conn.close()
+        if not row:
+            return None
+
+        if row.get("save_blob"):
+            try:
+                version, state = save_codec.loads(row["save_blob"])
+                return save_codec.upgrade(state, version, schema_version)
+            except (save_codec.SaveCodecError, zlib_error) as e:
+                logger.error("Corrupt save in slot %s of session %s: %s", slot, session_id, e)
+                return None
+
+        raw = row.get("saved_state")
+        if isinstance(raw, (str, bytes, bytearray)):
+            try:
+                raw = json.loads(raw)
+            except json.JSONDecodeError:
+                return None
+        if not isinstance(raw, dict) or "session_id" not in raw:
+            return None
+        return save_codec.upgrade(raw, 0, schema_version)
+
+
 # ────────────────────────────────────────────────────────────────────────
 #  SessionPlayerModel
 # ────────────────────────────────────────────────────────────────────────
@@ -542,6 +912,36 @@ class SessionPlayerModel:
             cur.close()
             conn.close()
 
+    @staticmethod
+    def get_alive_players(session_id: int) -> List[int]:
+        """
+        Players in join order who are not marked dead, in one query
+        (a player without a players row counts as alive).
+        """
+        conn = Database().get_connection()
+        cur  = conn.cursor()
+        try:
+            cur.execute(
+                """
+                SELECT sp.player_id
+                  FROM session_players sp
+                  LEFT JOIN players p
+                    ON p.session_id = sp.session_id
+                   AND p.player_id  = sp.player_id
+                 WHERE sp.session_id = %s
+                   AND COALESCE(p.is_dead, 0) = 0
+                 ORDER BY sp.joined_at ASC
+                """,
+                (session_id,),
+            )
+            return [r[0] for r in cur.fetchall()]
+        except Exception:
+            logger.exception("Error fetching alive players for session %s", session_id)
+            return []
+        finally:
+            cur.close()
+            conn.close()
+
     @staticmethod
     def get_player_states(session_id: int) -> List[dict]:
         db = Database()
@@ -617,7 +1017,75 @@ class SessionPlayerModel:
             cur.close()
             conn.close()
 
-            
+    @staticmethod
+    def get_status_effects_many(session_id: int,
+                                player_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Same as get_status_effects, for several players in one query.
+        Players with no (or unreadable) effects map to [].
+        """
+        out: Dict[int, List[Dict[str, Any]]] = {pid: [] for pid in player_ids}
+        if not player_ids:
+            return out
+        conn = Database().get_connection()
+        try:
+            cur = conn.cursor(dictionary=True)
+            placeholders = ",".join("%s" for _ in player_ids)
+            cur.execute(
+                "SELECT player_id, status_effects "
+                "  FROM players "
+                " WHERE session_id = %s "
+                f"  AND player_id IN ({placeholders})",
+                (session_id, *player_ids)
+            )
+            rows = cur.fetchall()
+            cur.close()
+
+            for row in rows:
+                if not row.get("status_effects"):
+                    continue
+                raw = json.loads(row["status_effects"])
+                if isinstance(raw, list):
+                    out[row["player_id"]] = raw
+            return out
+        except Exception:
+            logger.exception("Error fetching status effects")
+            return out
+        finally:
+            conn.close()
+
+    @staticmethod
+    def apply_status_ticks(session_id: int,
+                           ticks: Dict[int, Any]) -> None:
+        """
+        Persist one status tick for each player in a single transaction.
+        `ticks` maps player_id ➜ (net_hp_delta, effects); the delta is
+        clamped to [0, max_hp] and the effects JSON overwritten together.
+        """
+        if not ticks:
+            return
+        conn = Database().get_connection()
+        try:
+            cur = conn.cursor()
+            cur.executemany(
+                """
+                UPDATE players
+                   SET hp = LEAST(max_hp, GREATEST(0, hp + %s)),
+                       status_effects = %s
+                 WHERE session_id=%s AND player_id=%s
+                """,
+                [
+                    (delta, json.dumps(effects), session_id, pid)
+                    for pid, (delta, effects) in ticks.items()
+                ]
+            )
+            conn.commit()
+        except Exception:
+            logger.exception("Error applying status ticks")
+        finally:
+            cur.close()
+            conn.close()
+
     @staticmethod
     def modify_hp(session_id: int, player_id: int, heal: int = 0, damage: int = 0):
         """Apply a heal or damage to a player’s HP in the database."""
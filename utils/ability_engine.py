@@ -1,7 +1,11 @@
 import random
 import json
+import logging
 import mysql.connector
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("AbilityEngine")
 
 
 class AbilityResult:
@@ -28,6 +32,41 @@ class AbilityResult:
         self.status_effects = status_effects or []
 
 
+class EffectPlan:
+    """
+    Immutable, pre‑parsed form of one ability row.
+    kind: which resolver handles the JSON effect (None ⇒ plain physical hit)
+    params: the values that resolver needs, already pulled out of the JSON
+    table_effects: (effect_id, effect_name, icon_url) pre‑joined from
+                   abilities.status_effect_id + ability_status_effects
+    """
+    __slots__ = ("name", "kind", "params", "resolver", "breaks",
+                 "target_type", "status_duration", "table_effects")
+
+    def __init__(
+        self,
+        name: str,
+        kind: Optional[str],
+        params: Dict[str, Any],
+        breaks: bool,
+        target_type: Optional[str],
+        status_duration: int,
+        table_effects: Tuple[Tuple[int, str, Optional[str]], ...],
+    ):
+        set_ = object.__setattr__
+        set_(self, "name", name)
+        set_(self, "kind", kind)
+        set_(self, "params", MappingProxyType(dict(params)))
+        set_(self, "resolver", AbilityEngine._RESOLVERS.get(kind))
+        set_(self, "breaks", breaks)
+        set_(self, "target_type", target_type)
+        set_(self, "status_duration", status_duration)
+        set_(self, "table_effects", table_effects)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("EffectPlan is immutable")
+
+
 class AbilityEngine:
     def __init__(self, db_connect, damage_variance: float = 0.0):
         """
@@ -36,6 +75,13 @@ class AbilityEngine:
         """
         self.db_connect = db_connect
         self.variance = damage_variance
+        # enemy_id ➜ merged enemy_abilities + abilities rows
+        self._enemy_kits: Dict[int, List[Dict[str, Any]]] = {}
+        # compiled catalog, filled by load_catalog() on first resolve
+        self._plans: Optional[Dict[Any, EffectPlan]] = None
+        self._effects_by_id: Dict[int, Dict[str, Any]] = {}
+        self._effects_by_name: Dict[str, Dict[str, Any]] = {}
+        self._ability_links: Dict[int, List[Dict[str, Any]]] = {}
 
     def jrpg_damage(
         self,
@@ -64,28 +110,167 @@ class AbilityEngine:
 
         return max(int(dmg), 1)
 
-    def _enrich_status_effects(self, result: AbilityResult) -> AbilityResult:
+    # ------------------------------------------------------------------ #
+    #  Catalog + compiled effect plans                                     #
+    # ------------------------------------------------------------------ #
+    def load_catalog(self) -> None:
         """
-        Look up each status_effect['effect_name'] in the single `status_effects`
-        table and fill in effect_id + icon_url.
+        Load the status effect catalog and compile every ability and
+        temporary ability into an EffectPlan. Four queries, run once;
+        call again to pick up edited ability data.
         """
-        if not result.status_effects:
-            return result
-
-        names = [se["effect_name"] for se in result.status_effects]
-        placeholders = ",".join("%s" for _ in names)
-
         conn = self.db_connect()
         cur  = conn.cursor(dictionary=True)
-        cur.execute(
-            f"SELECT effect_id, effect_name, icon_url FROM status_effects "
-            f"WHERE effect_name IN ({placeholders})",
-            tuple(names),
-        )
-        meta = { row["effect_name"]: row for row in cur.fetchall() }
+
+        cur.execute("SELECT effect_id, effect_name, icon_url FROM status_effects")
+        by_id: Dict[int, Dict[str, Any]] = {}
+        by_name: Dict[str, Dict[str, Any]] = {}
+        for row in cur.fetchall():
+            by_id[row["effect_id"]] = row
+            by_name[row["effect_name"]] = row
+
+        cur.execute("SELECT ability_id, effect_id FROM ability_status_effects")
+        links: Dict[int, List[Dict[str, Any]]] = {}
+        for row in cur.fetchall():
+            meta = by_id.get(row["effect_id"])
+            if meta:
+                links.setdefault(row["ability_id"], []).append(meta)
+
+        cur.execute("SELECT * FROM abilities")
+        abilities = cur.fetchall()
+        cur.execute("SELECT * FROM temporary_abilities")
+        temps = cur.fetchall()
         cur.close()
         conn.close()
 
+        self._effects_by_id = by_id
+        self._effects_by_name = by_name
+        self._ability_links = links
+        self._plans = {}
+        for row in abilities + temps:
+            self._plans[self._plan_key(row)] = self._compile(row)
+        logger.debug("Compiled %d ability plans, %d status effects.", len(self._plans), len(by_name))
+
+    @staticmethod
+    def _plan_key(ability: Dict[str, Any]) -> Any:
+        # temp first: BattleSystem copies temp_ability_id into ability_id,
+        # and the two id spaces overlap
+        if ability.get("temp_ability_id"):
+            return ("temp", ability["temp_ability_id"])
+        # enemy kit rows compile without the table status effects (see _compile)
+        if "weight" in ability and ability.get("ability_id"):
+            return ("enemy", ability["ability_id"])
+        if ability.get("ability_id"):
+            return ability["ability_id"]
+        return None
+
+    def plan_for(self, ability: Dict[str, Any]) -> "EffectPlan":
+        """Return the compiled plan for an ability row, compiling it on first sight."""
+        if self._plans is None:
+            self.load_catalog()
+        key = self._plan_key(ability)
+        plan = self._plans.get(key) if key is not None else None
+        if plan is None:
+            plan = self._compile(ability)
+            if key is not None:
+                self._plans[key] = plan
+        return plan
+
+    def _compile(self, ability: Dict[str, Any]) -> "EffectPlan":
+        """Parse the effect JSON and pick the resolver exactly once."""
+        name = ability["ability_name"]
+        raw = ability.get("effect")
+        effect_data: Dict[str, Any] = {}
+        if isinstance(raw, dict):
+            effect_data = raw
+        elif raw:
+            try:
+                effect_data = json.loads(raw)
+            except (json.JSONDecodeError, TypeError):
+                effect_data = {}
+        if not isinstance(effect_data, dict):
+            effect_data = {}
+
+        kind: Optional[str] = None
+        params: Dict[str, Any] = {}
+        if "flat_damage" in effect_data:
+            kind, params = "flat_damage", {"amount": int(effect_data.get("flat_damage", 0))}
+        elif "base_damage" in effect_data or "damage" in effect_data:
+            kind, params = "damage", {
+                "base":   effect_data.get("base_damage", effect_data.get("damage", 0)),
+                "stat":   effect_data.get("scaling_stat", "attack_power"),
+                "factor": effect_data.get("scaling_factor", 1.0),
+            }
+        elif "heal_current_pct" in effect_data:
+            kind, params = "heal_current_pct", {"pct": effect_data["heal_current_pct"]}
+        elif effect_data.get("lucky_7"):
+            kind = "lucky_7"
+        elif "percent_damage" in effect_data:
+            kind, params = "percent_damage", {"pct": effect_data["percent_damage"]}
+        elif "damage_over_time" in effect_data:
+            dot_cfg = effect_data["damage_over_time"]
+            if isinstance(dot_cfg, (int, float)):
+                dot_cfg = {"damage_per_turn": dot_cfg, "duration": 1}
+            kind, params = "dot", {
+                "damage_per_turn": dot_cfg["damage_per_turn"],
+                "duration":        dot_cfg["duration"],
+                "effect_name":     effect_data.get("dot_name", name),
+            }
+        elif "healing_over_time" in effect_data:
+            hot_cfg = effect_data["healing_over_time"]
+            if isinstance(hot_cfg, (int, float)):
+                heal_per_turn, percent = None, hot_cfg
+                duration = effect_data.get("duration", 1)
+            else:
+                duration = hot_cfg.get("duration", 1)
+                heal_per_turn = hot_cfg.get("heal_per_turn")
+                percent = hot_cfg.get("percent", 0)
+            kind, params = "hot", {
+                "heal_per_turn": heal_per_turn,
+                "percent":       percent,
+                "duration":      duration,
+                "effect_name":   effect_data.get("hot_name", name),
+            }
+        elif effect_data.get("pilfer_gil"):
+            kind = "pilfer_gil"
+        elif "mug" in effect_data:
+            kind, params = "mug", {"base": effect_data["mug"].get("damage", 0)}
+
+        # table‑driven effects (single link first, then many‑to‑many extras)
+        table: List[Dict[str, Any]] = []
+        # enemy casts never carried them (load_enemy_kit rows have no
+        # status columns; kits saved in older battle_states might)
+        aid = ability.get("ability_id")
+        dur = ability.get("status_duration") or 0
+        if "weight" in ability:
+            dur = 0
+        if aid and dur > 0:
+            se = self._effects_by_id.get(ability.get("status_effect_id"))
+            if se:
+                table.append(se)
+            table.extend(self._ability_links.get(aid, ()))
+
+        return EffectPlan(
+            name=name,
+            kind=kind,
+            params=params,
+            breaks=ability.get("special_effect") == "break",
+            target_type=ability.get("target_type"),
+            status_duration=dur,
+            table_effects=tuple(
+                (m["effect_id"], m["effect_name"], m["icon_url"]) for m in table
+            ),
+        )
+
+    def _enrich_status_effects(self, result: AbilityResult) -> AbilityResult:
+        """
+        Look up each status_effect['effect_name'] in the cached `status_effects`
+        catalog and fill in effect_id + icon_url.
+        """
+        if not result.status_effects:
+            return result
+
+        meta = self._effects_by_name
         for inst in result.status_effects:
             m = meta.get(inst["effect_name"])
             if m:
@@ -99,85 +284,165 @@ class AbilityEngine:
             # remove any stray duration keys
             inst.pop("remaining_turns", None)
         return result
-    
+
     def _attach_table_status_effects(
         self,
         result: AbilityResult,
-        ability: Dict[str, Any]
+        plan: "EffectPlan"
     ) -> AbilityResult:
         """
         Instead of unconditionally appending, we:
-        1) Fetch all table‑driven effects for this ability.
+        1) Take the table‑driven effects pre‑joined into the plan.
         2) For each, if an effect with the same name is already in result.status_effects,
             we update its effect_id/icon_url.
         3) Otherwise we append it as a brand‐new status_effect.
         """
-        aid = ability.get("ability_id")
-        dur = ability.get("status_duration") or 0
-        if not aid or dur <= 0:
-            return result
-
-        # 1) load all the legacy table links
-        conn = self.db_connect()
-        cur  = conn.cursor(dictionary=True)
-
-        to_attach = []
-        # a) single-link
-        se_id = ability.get("status_effect_id")
-        if se_id:
-            cur.execute(
-                "SELECT effect_id, effect_name, icon_url "
-                "FROM status_effects WHERE effect_id=%s",
-                (se_id,)
-            )
-            row = cur.fetchone()
-            if row:
-                to_attach.append(row)
-
-        # b) many-to-many extras
-        cur.execute(
-            """
-            SELECT se.effect_id, se.effect_name, se.icon_url
-            FROM ability_status_effects ase
-            JOIN status_effects se USING (effect_id)
-            WHERE ase.ability_id = %s
-            """,
-            (aid,)
-        )
-        to_attach.extend(cur.fetchall())
-
-        cur.close()
-        conn.close()
-
-        # 2) merge or append
-        for meta in to_attach:
-            inst = {
-                "effect_id":       meta["effect_id"],
-                "effect_name":     meta["effect_name"],
-                "icon_url":        meta["icon_url"],
-                "remaining_turns": dur,
-                "target":          ability.get("target_type", "enemy"),
-            }
-
+        dur = plan.status_duration
+        for effect_id, effect_name, icon_url in plan.table_effects:
             # look for an existing JSON‑driven effect with the same name
             merged = False
             for existing in result.status_effects:
-                if existing.get("effect_name") == inst["effect_name"]:
+                if existing.get("effect_name") == effect_name:
                     # update it in-place
-                    existing["effect_id"]       = inst["effect_id"]
-                    existing["icon_url"]        = inst["icon_url"]
+                    existing["effect_id"]       = effect_id
+                    existing["icon_url"]        = icon_url
                     # also normalize the duration key if you want consistency
-                    existing["remaining"]       = inst["remaining_turns"]
+                    existing["remaining"]       = dur
                     existing.pop("remaining_turns", None)
                     merged = True
                     break
 
             # if nothing matched, append as new
             if not merged:
-                result.status_effects.append(inst)
+                result.status_effects.append({
+                    "effect_id":       effect_id,
+                    "effect_name":     effect_name,
+                    "icon_url":        icon_url,
+                    "remaining_turns": dur,
+                    "target":          plan.target_type or "enemy",
+                })
 
         return result
 
+    # ------------------------------------------------------------------ #
+    #  Per‑kind resolvers (plan, user, target, logs) -> AbilityResult      #
+    # ------------------------------------------------------------------ #
+    def _r_flat_damage(self, plan, user, target, logs):
+        # flat, defense‑ignoring damage (e.g., Cactuar's Needles)
+        dmg = plan.params["amount"]
+        logs.append(f"{plan.name} deals {dmg} damage.")
+        return AbilityResult(type="damage", amount=dmg, logs=logs)
+
+    def _r_damage(self, plan, user, target, logs):
+        # stat‑scaled base damage from JSON
+        p = plan.params
+        dmg = self.jrpg_damage(user, target, p["base"], p["stat"], p["factor"])
+        logs.append(f"{plan.name} deals {dmg} damage.")
+        return AbilityResult(type="damage", amount=dmg, logs=logs)
+
+    def _r_heal_current_pct(self, plan, user, target, logs):
+        amt = int(target["hp"] * plan.params["pct"])
+        logs.append(f"{plan.name} restores {amt} HP.")
+        return AbilityResult(type="heal", amount=amt, logs=logs)
+
+    def _r_lucky_7(self, plan, user, target, logs):
+        if "7" not in str(user["hp"]):
+            dmg = 1
+            logs.append(f"{plan.name}: no ‘7’ in {user['hp']} → deals {dmg}.")
+        else:
+            dmg = random.choice([7, 77, 777, 7777])
+            logs.append(f"{plan.name} JACKPOT! Deals {dmg}.")
+        return AbilityResult(type="damage", amount=dmg, logs=logs)
+
+    def _r_percent_damage(self, plan, user, target, logs):
+        pct = plan.params["pct"]
+        dmg = int(target["hp"] * pct)
+        logs.append(f"{plan.name} deals {dmg} ({int(pct*100)}%).")
+        return AbilityResult(type="damage", amount=dmg, logs=logs)
+
+    def _r_dot(self, plan, user, target, logs):
+        p = plan.params
+        dot_inst = {
+            "damage_per_turn":  p["damage_per_turn"],
+            "remaining":        p["duration"],
+            "effect_name":      p["effect_name"],
+            "icon":             "",  # filled in by _enrich
+        }
+        logs.append(
+            f"{plan.name} applies **{dot_inst['effect_name']}** "
+            f"for {dot_inst['remaining']} turn(s)."
+        )
+        return AbilityResult(
+            type="dot",
+            dot=dot_inst,
+            logs=logs,
+            status_effects=[{
+                "effect_name": dot_inst["effect_name"],
+                "remaining":   dot_inst["remaining"],
+                "target":      plan.target_type or "enemy",
+            }]
+        )
+
+    def _r_hot(self, plan, user, target, logs):
+        p = plan.params
+        heal_each = p["heal_per_turn"]
+        if heal_each is None:
+            heal_each = int(target["max_hp"] * p["percent"])
+        hot_inst = {
+            "heal_per_turn":   heal_each,
+            "remaining":       p["duration"],
+            "effect_name":     p["effect_name"],
+            "icon":            "",
+        }
+        logs.append(
+            f"{plan.name} grants **{hot_inst['effect_name']}** "
+            f"for {hot_inst['remaining']} turn(s)."
+        )
+        return AbilityResult(
+            type="hot",
+            dot=hot_inst,
+            logs=logs,
+            status_effects=[{
+                "effect_name": hot_inst["effect_name"],
+                "remaining":   hot_inst["remaining"],
+                "heal_per_turn": hot_inst["heal_per_turn"],
+                "target":      plan.target_type or "self",
+            }]
+        )
+
+    @staticmethod
+    def _steal_amount(pool: int) -> int:
+        low  = max(1, int(pool*0.1))
+        high = max(low, int(pool*0.25))
+        return min(pool, random.randint(low, high))
+
+    def _r_pilfer_gil(self, plan, user, target, logs):
+        pool = target.get("gil_pool", 0)
+        if pool <= 0:
+            logs.append(f"{plan.name} finds no Gil.")
+            return AbilityResult(type="pilfer", amount=0, logs=logs)
+        steal = self._steal_amount(pool)
+        logs.append(f"{plan.name} pilfers {steal} Gil!")
+        return AbilityResult(type="pilfer", amount=steal, logs=logs)
+
+    def _r_mug(self, plan, user, target, logs):
+        dmg  = self.jrpg_damage(user, target, plan.params["base"], "attack_power", 1.0)
+        pool = target.get("gil_pool", 0)
+        steal = self._steal_amount(pool) if pool > 0 else 0
+        logs.append(f"{plan.name} deals {dmg} and pilfers {steal} Gil!")
+        return AbilityResult(type="mug", amount=dmg, logs=logs)
+
+    _RESOLVERS = {
+        "flat_damage":      _r_flat_damage,
+        "damage":           _r_damage,
+        "heal_current_pct": _r_heal_current_pct,
+        "lucky_7":          _r_lucky_7,
+        "percent_damage":   _r_percent_damage,
+        "dot":              _r_dot,
+        "hot":              _r_hot,
+        "pilfer_gil":       _r_pilfer_gil,
+        "mug":              _r_mug,
+    }
 
     def resolve(
         self,
@@ -188,9 +453,11 @@ class AbilityEngine:
         """
         Unify player & enemy abilities. Expects `ability` to include
         any enemy_abilities columns as well as normal `abilities` fields.
+        Runs entirely off the compiled EffectPlan: no queries, no JSON parsing.
         """
+        plan = self.plan_for(ability)
         logs: List[str] = []
-        name = ability["ability_name"]
+        name = plan.name
         result: Optional[AbilityResult] = None
 
         # 1) Healing (enemy only)
@@ -198,7 +465,7 @@ class AbilityEngine:
             pct = user["hp"] / user["max_hp"]
             if pct <= (ability.get("heal_threshold_pct") or 0):
                 amt = int(user["max_hp"] * (ability.get("heal_amount_pct") or 0))
-                logs.append(f"{name} heals for {amt} HP.")
+                logs.append(f"{name} heals for {amt} HP.")
                 result = AbilityResult(type="heal", amount=amt, logs=logs)
 
         # 2) Accuracy / miss
@@ -210,142 +477,13 @@ class AbilityEngine:
                 result = AbilityResult(type="miss", logs=logs)
 
         # 3) Special "break" effect
-        if result is None and ability.get("special_effect") == "break":
+        if result is None and plan.breaks:
             logs.append(f"{name} shatters guard—sets HP to 1!")
             result = AbilityResult(type="set_hp", amount=1, logs=logs)
 
-        # 4) JSON‑driven effects
-        effect_data: Dict[str, Any] = {}
-        if result is None and ability.get("effect"):
-            try:
-                effect_data = json.loads(ability["effect"])
-            except json.JSONDecodeError:
-                effect_data = {}
-
-            # flat, defense‑ignoring damage (e.g., Cactuar's Needles)
-            if result is None and "flat_damage" in effect_data:
-                dmg = int(effect_data.get("flat_damage", 0))
-                logs.append(f"{name} deals {dmg} damage.")
-                result = AbilityResult(type="damage", amount=dmg, logs=logs)
-
-            # stat‑scaled base damage from JSON
-            if result is None and ("base_damage" in effect_data or "damage" in effect_data):
-                base = effect_data.get("base_damage", effect_data.get("damage", 0))
-                stat = effect_data.get("scaling_stat", "attack_power")
-                factor = effect_data.get("scaling_factor", 1.0)
-                dmg = self.jrpg_damage(user, target, base, stat, factor)
-                logs.append(f"{name} deals {dmg} damage.")
-                result = AbilityResult(type="damage", amount=dmg, logs=logs)
-
-            if result is None and "heal_current_pct" in effect_data:
-                pct = effect_data["heal_current_pct"]
-                amt = int(target["hp"] * pct)
-                logs.append(f"{name} restores {amt} HP.")
-                result = AbilityResult(type="heal", amount=amt, logs=logs)
-
-            # lucky_7
-            if result is None and effect_data.get("lucky_7"):
-                hp_str = str(user["hp"])
-                if "7" not in hp_str:
-                    dmg = 1
-                    logs.append(f"{name}: no ‘7’ in {user['hp']} → deals {dmg}.")
-                else:
-                    dmg = random.choice([7, 77, 777, 7777])
-                    logs.append(f"{name} JACKPOT! Deals {dmg}.")
-                result = AbilityResult(type="damage", amount=dmg, logs=logs)
-
-            # percent_damage
-            elif result is None and "percent_damage" in effect_data:
-                pct = effect_data["percent_damage"]
-                dmg = int(target["hp"] * pct)
-                logs.append(f"{name} deals {dmg} ({int(pct*100)}%).")
-                result = AbilityResult(type="damage", amount=dmg, logs=logs)
-
-            # damage_over_time (DoT)
-            elif result is None and "damage_over_time" in effect_data:
-                dot_cfg = effect_data["damage_over_time"]
-                if isinstance(dot_cfg, (int, float)):
-                    dot_cfg = {"damage_per_turn": dot_cfg, "duration": 1}
-                dot_inst = {
-                    "damage_per_turn":  dot_cfg["damage_per_turn"],
-                    "remaining":        dot_cfg["duration"],
-                    "effect_name":      effect_data.get("dot_name", name),
-                    "icon":             "",  # filled in by _enrich
-                }
-                logs.append(
-                    f"{name} applies **{dot_inst['effect_name']}** "
-                    f"for {dot_inst['remaining']} turn(s)."
-                )
-                result = AbilityResult(
-                    type="dot",
-                    dot=dot_inst,
-                    logs=logs,
-                    status_effects=[{
-                        "effect_name": dot_inst["effect_name"],
-                        "remaining":   dot_inst["remaining"],
-                        "target":      ability.get("target_type", "enemy"),
-                    }]
-                )
-
-            # healing_over_time (HoT)
-            elif result is None and "healing_over_time" in effect_data:
-                hot_cfg = effect_data["healing_over_time"]
-                if isinstance(hot_cfg, (int, float)):
-                    heal_each = int(target["max_hp"] * hot_cfg)
-                    duration = effect_data.get("duration", 1)
-                else:
-                    duration = hot_cfg.get("duration", 1)
-                    if "heal_per_turn" in hot_cfg:
-                        heal_each = hot_cfg["heal_per_turn"]
-                    else:
-                        heal_each = int(target["max_hp"] * hot_cfg.get("percent", 0))
-                hot_inst = {
-                    "heal_per_turn":   heal_each,
-                    "remaining":       duration,
-                    "effect_name":     effect_data.get("hot_name", name),
-                    "icon":            "",
-                }
-                logs.append(
-                    f"{name} grants **{hot_inst['effect_name']}** "
-                    f"for {hot_inst['remaining']} turn(s)."
-                )
-                result = AbilityResult(
-                    type="hot",
-                    dot=hot_inst,
-                    logs=logs,
-                    status_effects=[{
-                        "effect_name": hot_inst["effect_name"],
-                        "remaining":   hot_inst["remaining"],
-                        "heal_per_turn": hot_inst["heal_per_turn"],
-                        "target":      ability.get("target_type", "self"),
-                    }]
-                )
-
-            # pilfer_gil
-            elif result is None and effect_data.get("pilfer_gil"):
-                pool = target.get("gil_pool", 0)
-                if pool <= 0:
-                    logs.append(f"{name} finds no Gil.")
-                    result = AbilityResult(type="pilfer", amount=0, logs=logs)
-                else:
-                    low  = max(1, int(pool*0.1))
-                    high = max(low, int(pool*0.25))
-                    steal = min(pool, random.randint(low, high))
-                    logs.append(f"{name} pilfers {steal} Gil!")
-                    result = AbilityResult(type="pilfer", amount=steal, logs=logs)
-
-            # mug
-            elif result is None and "mug" in effect_data:
-                base = effect_data["mug"].get("damage", 0)
-                dmg  = self.jrpg_damage(user, target, base, "attack_power", 1.0)
-                pool = target.get("gil_pool", 0)
-                steal = 0
-                if pool > 0:
-                    low  = max(1, int(pool*0.1))
-                    high = max(low, int(pool*0.25))
-                    steal = min(pool, random.randint(low, high))
-                logs.append(f"{name} deals {dmg} and pilfers {steal} Gil!")
-                result = AbilityResult(type="mug", amount=dmg, logs=logs)
+        # 4) Effect resolver chosen at compile time
+        if result is None and plan.resolver is not None:
+            result = plan.resolver(self, plan, user, target, logs)
 
         # 5) Fallback physical damage
         if result is None:
@@ -353,91 +491,109 @@ class AbilityEngine:
             logs.append(f"{name} deals {dmg} damage.")
             result = AbilityResult(type="damage", amount=dmg, logs=logs)
 
-        
         # 6) Attach any table‑driven status effects (single + many‑to‑many)
-        result = self._attach_table_status_effects(result, ability)
+        result = self._attach_table_status_effects(result, plan)
 
         # 7) Enrich and normalize *all* status effects
         result = self._enrich_status_effects(result)
         return result
 
-    def choose_enemy_ability(self, session: Any, enemy: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # ------------------------------------------------------------------ #
+    #  Enemy ability kits                                                  #
+    # ------------------------------------------------------------------ #
+    def load_enemy_kit(self, enemy_id: int) -> List[Dict[str, Any]]:
         """
-        Pick one of this enemy’s abilities by:
-         1) If Silenced → no ability
-         2) Else load enemy_abilities rows
-         3) If any healers and HP% ≤ their threshold → choose from healers
-         4) Otherwise choose from offensives
-         5) Weighted‐random by `weight`
-         6) Return the merged ability row (abilities + selected enemy_abilities cols)
+        Return every ability this enemy can use, already merged with its
+        enemy_abilities row (weight, heal threshold/amount). The row's
+        accuracy comes back as ability_accuracy, unused by resolve(): enemy
+        casts roll against the enemy's own accuracy stat.
+        Enemy kits are static reference data, so each enemy is queried once
+        per process.
         """
-        # 1) Silence check
-        if any(e["effect_name"] == "Silence" for e in session.battle_state.get("enemy_effects", [])):
-            return None
+        kit = self._enemy_kits.get(enemy_id)
+        if kit is not None:
+            return kit
 
-        # 2) Fetch all configured enemy_abilities
         conn = self.db_connect()
         cur = conn.cursor(dictionary=True)
         cur.execute("""
-            SELECT
-              ea.ability_id,
-              ea.weight,
-              ea.can_heal,
-              ea.heal_threshold_pct,
-              ea.heal_amount_pct,
-              ea.accuracy AS ability_accuracy
-            FROM enemy_abilities ea
-            WHERE ea.enemy_id = %s
-        """, (enemy["enemy_id"],))
-        rows = cur.fetchall()
+            SELECT ea.ability_id, ea.weight,
+                   ea.can_heal, ea.heal_threshold_pct,
+                   ea.heal_amount_pct, ea.accuracy AS ability_accuracy,
+                   a.ability_name, a.effect, a.cooldown,
+                   a.special_effect, a.target_type, a.icon_url,
+                   a.element_id
+              FROM enemy_abilities ea
+              JOIN abilities a USING (ability_id)
+             WHERE ea.enemy_id = %s
+        """, (enemy_id,))
+        kit = cur.fetchall()
         cur.close()
         conn.close()
-        if not rows:
+
+        self._enemy_kits[enemy_id] = kit
+        return kit
+
+    def choose_enemy_ability(
+        self,
+        session: Any,
+        enemy: Dict[str, Any],
+        kit: Optional[List[Dict[str, Any]]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Pick one of this enemy’s abilities, respecting:
+          – Silence status on enemy_effects
+          – Per‐turn cooldowns (–1 each turn, +cooldown on use)
+          – Healing only when hp% ≤ heal_threshold_pct & can_heal=1
+          – Weighted random choice by ea.weight
+        `kit` is the preloaded list from load_enemy_kit (normally kept in
+        battle_state); no DB access happens when it is supplied.
+        Returns None to fall back to a plain Attack.
+        """
+        eid = enemy["enemy_id"]
+
+        # 1) If silenced, no spells at all
+        if any(eff.get("effect_name") == "Silence"
+               for eff in (session.battle_state or {}).get("enemy_effects", [])):
             return None
 
-        # 3) Split healers vs offensives
-        hp_pct     = enemy["hp"] / float(enemy["max_hp"])
-        healers    = [r for r in rows if r["can_heal"] and hp_pct <= (r["heal_threshold_pct"] or 0)]
-        offensives = [r for r in rows if not r["can_heal"]]
-        pool       = healers if healers else offensives
+        # 2) Decrement this enemy’s cooldowns by 1
+        session.ability_cooldowns = getattr(session, "ability_cooldowns", {}) or {}
+        cds = session.ability_cooldowns.get(eid, {})
+        for aid in list(cds):
+            cds[aid] = max(cds[aid] - 1, 0)
+        session.ability_cooldowns[eid] = cds
+
+        # 3) Filter out on‐cooldown & out‐of‐threshold heals
+        if kit is None:
+            kit = self.load_enemy_kit(eid)
+        pct = enemy["hp"] / enemy["max_hp"] if enemy.get("max_hp") else 1.0
+        pool = [
+            r for r in kit
+            if cds.get(r["ability_id"], 0) <= 0
+            and not (r["can_heal"] and pct > (r["heal_threshold_pct"] or 0))
+        ]
         if not pool:
             return None
 
-        # 4) Weighted pick
+        # 4) Weighted random pick by cumulative walk; an all-zero pool
+        #    (several seeded enemies) always casts its first ability
         total = sum(r["weight"] for r in pool)
-        pick  = random.uniform(0, total)
-        upto  = 0
-        chosen = pool[-1]
+        pick = random.uniform(0, total)
+        upto = 0.0
+        chosen = None
         for r in pool:
             upto += r["weight"]
             if pick <= upto:
                 chosen = r
                 break
-
-        # 5) Load the base ability info
-        conn = self.db_connect()
-        cur = conn.cursor(dictionary=True)
-        cur.execute("""
-            SELECT
-              ability_id,
-              ability_name,
-              effect,
-              cooldown,
-              icon_url,
-              target_type,
-              special_effect
-            FROM abilities
-            WHERE ability_id = %s
-        """, (chosen["ability_id"],))
-        ab = cur.fetchone()
-        cur.close()
-        conn.close()
-        if not ab:
+        if chosen is None:
             return None
 
-        # 6) Merge in the enemy‑specific fields
-        ab["can_heal"]           = chosen["can_heal"]
-        ab["heal_threshold_pct"] = chosen["heal_threshold_pct"]
-        ab["heal_amount_pct"]    = chosen["heal_amount_pct"]
-        ab["accuracy"]           = chosen["ability_accuracy"]
-        return ab
+        # 5) Apply its cooldown
+        cd = chosen.get("cooldown") or 0
+        if cd > 0:
+            cds[chosen["ability_id"]] = cd
+        chosen = dict(chosen)
+        chosen.pop("accuracy", None)    # kits preloaded before the alias
+        return chosen
@@ -0,0 +1,254 @@
+# utils/battle_engine.py
+"""
+The combat rules with no Discord and no database in them.
+
+BattleSystem keeps the embeds, pauses and persistence and calls in here
+for what an action actually does; the battle simulator
+(benchmarks/battle_sim.py) drives the same methods directly.
+
+A "fight" is anything shaped like a GameSession for combat purposes:
+`battle_state` with "enemy", "player_effects" and "enemy_effects", and an
+`ability_cooldowns` dict keyed by player_id / enemy_id. Enemy HP, enemy
+gil and both effect lists are changed in place; player HP is returned on
+the outcome so the caller decides where it is stored.
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+from utils.ability_engine import AbilityEngine, AbilityResult
+from utils.status_engine import StatusEffectEngine
+
+logger = logging.getLogger("BattleEngine")
+
+
+class TurnOutcome:
+    """
+    What one action did.
+    kind: 'attack' for a plain hit, otherwise the AbilityResult type
+    amount: the result amount (damage, heal, stolen gil …)
+    lines: battle log lines, in order
+    player_hp: the acting/targeted player's new HP, or None if unchanged
+    gil_stolen: gil the player gained from Pilfer
+    player_effects_changed: a buff landed on the player (persist the list)
+    """
+    __slots__ = ("kind", "amount", "lines", "player_hp", "gil_stolen", "player_effects_changed")
+
+    def __init__(self, kind: str, amount: int = 0, lines: Optional[List[str]] = None,
+                 player_hp: Optional[int] = None):
+        self.kind = kind
+        self.amount = amount
+        self.lines = lines or []
+        self.player_hp = player_hp
+        self.gil_stolen = 0
+        self.player_effects_changed = False
+
+
+class BattleEngine:
+    def __init__(self, ability: AbilityEngine):
+        self.ability = ability
+
+    # ------------------------------------------------------------------ #
+    #  Helpers                                                             #
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def normalize_se(raw: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Turn raw engine output into exactly the 3 keys our UI helper wants:
+          - icon (str)
+          - effect_name (str)
+          - remaining (int)
+        plus anything else your engine attaches (damage_per_turn, etc.)
+        """
+        out = {
+            "effect_id":   raw.get("effect_id"),
+            "effect_name": raw.get("effect_name"),
+            "remaining":   raw.get("remaining", raw.get("remaining_turns", 0)),
+            "icon":        raw.get("icon") or raw.get("icon_url",""),
+            # preserve any extra tick fields
+            **{k: v for k,v in raw.items() if k in ("damage_per_turn","heal_per_turn")}
+        }
+        out["target"] = raw.get("target", "self")
+        return out
+
+    @staticmethod
+    def reduce_player_cooldowns(fight: Any, player_id: int, player: Dict[str, Any]) -> None:
+        """Cooldowns drop by speed / base_speed per player action."""
+        if not getattr(fight, "ability_cooldowns", None):
+            fight.ability_cooldowns = {}
+        cds = fight.ability_cooldowns.get(player_id, {})
+
+        base = player.get("base_speed") or 10
+        multiplier = player["speed"] / base
+        for aid in list(cds):
+            cds[aid] = max(cds[aid] - multiplier, 0)
+
+        fight.ability_cooldowns[player_id] = cds
+
+    @staticmethod
+    def tick_statuses(fight: Any, player: Dict[str, Any]) -> List[str]:
+        """
+        The start of the enemy's turn: enemy effects tick (stop here if that
+        kills it), then the player's, with StatusEffectEngine's rules.
+        Player HP is changed in place on `player`.
+        """
+        state = fight.battle_state
+        enemy = state["enemy"]
+        lines: List[str] = []
+        state["enemy_effects"] = StatusEffectEngine._tick_enemy(
+            enemy, state.get("enemy_effects") or [], lines
+        )
+        if enemy["hp"] <= 0:
+            return lines
+        damage, heal, state["player_effects"] = StatusEffectEngine._tick_entries(
+            state.get("player_effects") or [], lines,
+            "{name} deals {amount} damage to you!",
+            "{name} heals you for {amount} HP!",
+        )
+        if damage or heal:
+            player["hp"] = min(player["max_hp"], max(0, player["hp"] + heal - damage))
+        return lines
+
+    # ------------------------------------------------------------------ #
+    #  Player actions                                                      #
+    # ------------------------------------------------------------------ #
+    def player_attack(self, fight: Any, player_id: int,
+                      player: Dict[str, Any], enemy: Dict[str, Any]) -> TurnOutcome:
+        dmg = self.ability.jrpg_damage(player, enemy, base_damage=0,
+                                       scaling_stat="attack_power", scaling_factor=1.0)
+        enemy["hp"] = max(enemy["hp"] - dmg, 0)
+        self.reduce_player_cooldowns(fight, player_id, player)
+        return TurnOutcome("attack", dmg, [f"You strike the {enemy['enemy_name']} for {dmg} damage!"])
+
+    def player_skill(self, fight: Any, player_id: int, player: Dict[str, Any],
+                     enemy: Dict[str, Any], ability: Dict[str, Any]) -> TurnOutcome:
+        result = self.ability.resolve(player, enemy, ability)
+        return self.apply_player_skill(fight, player_id, player, enemy, ability, result)
+
+    def apply_player_skill(self, fight: Any, player_id: int, player: Dict[str, Any],
+                           enemy: Dict[str, Any], ability: Dict[str, Any],
+                           result: AbilityResult) -> TurnOutcome:
+        """Apply an already resolved in-battle skill: log, status effects, cooldown, HP."""
+        state = fight.battle_state
+        target = ability.get("target_type", "self")
+        out = TurnOutcome(result.type, result.amount)
+
+        # 1) exactly one log line per result.type, engine logs for the rest
+        if result.type == "damage":
+            out.lines.append(f"You use {ability['ability_name']} and deal {result.amount} damage!")
+        elif result.type == "dot":
+            out.lines.append(f"{enemy['enemy_name']} has been afflicted by {result.dot['effect_name']}.")
+        else:
+            out.lines.extend(result.logs)
+
+        # 2) returned status effects
+        for raw_se in result.status_effects or []:
+            raw_se.setdefault("target", target)
+            se = self.normalize_se(raw_se)
+            if se["target"] == "self":
+                state["player_effects"].append(se)
+                out.player_effects_changed = True
+                out.lines.append(f"{se['effect_name']} has been applied to <@{player_id}>.")
+            else:
+                state["enemy_effects"].append(se)
+                out.lines.append(
+                    f"{enemy.get('enemy_name', 'The enemy')} has been afflicted by {se['effect_name']}."
+                )
+
+        # 3) burn the cooldown, then this action's cooldown reduction
+        if not getattr(fight, "ability_cooldowns", None):
+            fight.ability_cooldowns = {}
+        fight.ability_cooldowns.setdefault(player_id, {})[ability["ability_id"]] = ability.get("cooldown", 0)
+        self.reduce_player_cooldowns(fight, player_id, player)
+
+        # 4) HP / gil
+        if result.type == "damage":
+            enemy["hp"] = max(enemy["hp"] - result.amount, 0)
+        elif result.type == "heal":
+            if target in ("self", "ally"):
+                out.player_hp = min(player["hp"] + result.amount, player["max_hp"])
+                out.lines.append(f"You restore {result.amount} HP to yourself!")
+            else:
+                enemy["hp"] = min(enemy["hp"] + result.amount, enemy["max_hp"])
+                out.lines.append(f"{enemy['enemy_name']} recovers {result.amount} HP!")
+        elif result.type == "set_hp":
+            enemy["hp"] = result.amount
+        elif result.type == "dot":
+            enemy.setdefault("dot_effects", []).append(result.dot)
+            enemy["hp"] = max(enemy["hp"] - result.dot["damage_per_turn"], 0)
+        elif result.type == "pilfer":
+            out.gil_stolen = result.amount
+            enemy["gil_pool"] = enemy.get("gil_pool", 0) - result.amount
+        elif result.type == "mug":
+            enemy["hp"] = max(enemy["hp"] - result.amount, 0)
+        return out
+
+    # ------------------------------------------------------------------ #
+    #  Enemy action                                                        #
+    # ------------------------------------------------------------------ #
+    def enemy_action(self, fight: Any, player_id: int, player: Dict[str, Any],
+                     enemy: Dict[str, Any], kit: List[Dict[str, Any]]) -> TurnOutcome:
+        """
+        Pick from `kit` with AbilityEngine.choose_enemy_ability (weights,
+        cooldowns, Silence, heal thresholds) and resolve it against the
+        player; no ability means a plain attack.
+        """
+        ability = self.ability.choose_enemy_ability(fight, enemy, kit)
+        name = enemy["enemy_name"]
+
+        if not ability:
+            dmg = self.ability.jrpg_damage(
+                enemy, player,
+                base_damage=0,
+                scaling_stat="attack_power",
+                scaling_factor=1.0
+            )
+            return TurnOutcome("attack", dmg, [f"{name} attacks for {dmg} damage!"],
+                               player_hp=max(player["hp"] - dmg, 0))
+
+        result = self.ability.resolve(enemy, player, ability)
+        out = TurnOutcome(result.type, result.amount)
+        player_effects = fight.battle_state["player_effects"]
+
+        # status effects first: coming from the enemy, they always land on the player
+        for raw_se in result.status_effects:
+            se = self.normalize_se(raw_se)
+            player_effects.append(se)
+            out.lines.append(f"{name} inflicts **{se['effect_name']}** on you for {se['remaining']} turns.")
+
+        if result.type == "miss":
+            out.lines.append(f"{name} uses {ability['ability_name']} but misses!")
+
+        elif result.type == "heal":
+            enemy["hp"] = min(enemy["hp"] + result.amount, enemy["max_hp"])
+            out.lines.append(f"{name} uses {ability['ability_name']} and heals for {result.amount} HP!")
+
+        elif result.type == "set_hp":
+            enemy["hp"] = result.amount
+            out.lines.append(f"{name} is reduced to 1 HP by {ability['ability_name']}!")
+
+        elif result.type == "dot":
+            dot = result.dot
+            player_effects.append(dot)
+            # immediate first tick
+            out.player_hp = max(player["hp"] - dot["damage_per_turn"], 0)
+            out.lines.append(f"<@{player_id}> has been hurt from {dot['effect_name']} for {dot['damage_per_turn']} HP.")
+
+        elif result.type == "damage":
+            dmg = result.amount
+            if any(b["effect_name"] == "Barrier" for b in player_effects):
+                dmg //= 2
+                out.lines.append("🛡️ Barrier halves the incoming damage!")
+            out.amount = dmg
+            out.player_hp = max(player["hp"] - dmg, 0)
+            out.lines.append(f"{name} uses {ability['ability_name']} and deals {dmg} damage!")
+
+        elif result.type == "pilfer":
+            out.gil_stolen = result.amount
+            enemy["gil_pool"] = enemy.get("gil_pool", 0) - result.amount
+            out.lines.append(f"{name} uses {ability['ability_name']} and pilfers {result.amount} Gil!")
+
+        elif result.type == "mug":
+            enemy["hp"] = max(enemy["hp"] - result.amount, 0)
+            out.lines.append(f"{name} uses {ability['ability_name']} and deals {result.amount} damage!")
+
+        return out
@@ -0,0 +1,205 @@
+# utils/cog_discovery.py
+"""
+Find the cog modules under game/ and hub/ without importing them.
+
+Each .py file is parsed with `ast` and counts as a cog when it defines a
+top-level `setup` function. Imports between cog modules are read from the
+same tree and the list comes back in dependency order, so when
+bot.load_extension() executes a module, every cog it imports is already
+in sys.modules and no module body runs twice.
+
+load_cogs(concurrent=True) imports the cogs' third-party and utils/models
+dependencies in a worker thread first, then loads each dependency level
+with asyncio.gather, so the event loop stays free for the login request.
+"""
+import ast
+import asyncio
+import importlib
+import logging
+import os
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from utils.helpers import get_bot_root
+
+logger = logging.getLogger("CogDiscovery")
+
+COG_DIRECTORIES = ("game", "hub")
+
+
+class CogModule(NamedTuple):
+    name: str              # dotted module path, e.g. "game.game_master"
+    path: str
+    deps: Tuple[str, ...]  # other cog modules it imports
+    imports: Tuple[str, ...] = ()  # module-level imports outside the cog directories
+
+
+def _has_setup(tree: ast.Module) -> bool:
+    return any(
+        isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == "setup"
+        for node in tree.body
+    )
+
+
+def _imported_modules(nodes: Iterable[ast.AST], module: str) -> Set[str]:
+    """Every module name imported by the statements in `nodes`."""
+    package = module.rsplit(".", 1)[0]
+    found: Set[str] = set()
+    for node in nodes:
+        if isinstance(node, ast.Import):
+            found.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parts = package.split(".")
+                parent = ".".join(parts[: len(parts) - node.level + 1])
+                base = f"{parent}.{base}" if base else parent
+            found.add(base)
+            # "from hub import leaderboard" imports the submodule
+            found.update(f"{base}.{alias.name}" for alias in node.names)
+    return found
+
+
+def _dependency_order(cogs: Dict[str, CogModule]) -> List[CogModule]:
+    ordered: List[CogModule] = []
+    state: Dict[str, int] = {}          # 1 = visiting, 2 = done
+
+    def visit(name: str) -> None:
+        if state.get(name) == 2:
+            return
+        if state.get(name) == 1:
+            logger.warning("Import cycle between cogs at %s; loading in file order.", name)
+            return
+        state[name] = 1
+        for dep in cogs[name].deps:
+            visit(dep)
+        state[name] = 2
+        ordered.append(cogs[name])
+
+    for name in cogs:
+        visit(name)
+    return ordered
+
+
+def discover_cogs(root_dirs: Iterable[str] = COG_DIRECTORIES,
+                  root: Optional[str] = None) -> List[CogModule]:
+    """
+    Every module under `root_dirs` (relative to the bot root) that defines
+    setup(), with the cogs it imports listed first.
+    """
+    root = root or get_bot_root()
+    trees: Dict[str, Tuple[str, ast.Module]] = {}
+    for directory in root_dirs:
+        dir_path = os.path.join(root, directory)
+        if not os.path.exists(dir_path):
+            logger.debug("Directory not found (skipping): %s", dir_path)
+            continue
+        for dirpath, _, files in os.walk(dir_path):
+            for file in sorted(files):
+                if not file.endswith(".py") or file == "__init__.py":
+                    continue
+                path = os.path.join(dirpath, file)
+                module = os.path.relpath(path, root)[:-3].replace(os.sep, ".")
+                try:
+                    with open(path, "rb") as fh:
+                        trees[module] = (path, ast.parse(fh.read(), filename=path))
+                except (OSError, SyntaxError) as e:
+                    logger.error("Error reading module %s: %s", module, e)
+
+    names = {m for m, (_, tree) in trees.items() if _has_setup(tree)}
+    for module in trees.keys() - names:
+        logger.debug("Skipping non-cog module: %s", module)
+    # never prefetch anything under the cog directories: load_extension
+    # executes a cog module itself, importing it first would run it twice
+    local = tuple(f"{d.replace(os.sep, '.')}." for d in root_dirs)
+    cogs = {
+        m: CogModule(
+            m, path,
+            tuple(sorted((_imported_modules(ast.walk(tree), m) & names) - {m})),
+            tuple(sorted(
+                name for name in _imported_modules(tree.body, m)
+                if name and not name.startswith(local) and name not in names
+            )),
+        )
+        for m, (path, tree) in trees.items() if m in names
+    }
+    return _dependency_order(cogs)
+
+
+def dependency_levels(cogs: List[CogModule]) -> List[List[CogModule]]:
+    """
+    Group an ordered cog list so each cog sits one level above the deepest
+    cog it imports; the cogs within a level can load in any order.
+    """
+    level: Dict[str, int] = {}
+    levels: List[List[CogModule]] = []
+    for cog in cogs:
+        # a dep missing from `level` is part of a cycle, already warned about
+        n = max((level[d] + 1 for d in cog.deps if d in level), default=0)
+        level[cog.name] = n
+        if n == len(levels):
+            levels.append([])
+        levels[n].append(cog)
+    return levels
+
+
+def prefetch_imports(cogs: Iterable[CogModule]) -> int:
+    """
+    Import what the cogs import at module level, outside game/ and hub/.
+    Failures are left for load_extension to report. Returns the number of
+    modules imported.
+    """
+    names = sorted({name for cog in cogs for name in cog.imports})
+    count = 0
+    for name in names:
+        try:
+            importlib.import_module(name)
+            count += 1
+        except Exception:
+            # "from x import y" also lists x.y, which is usually not a module
+            pass
+    return count
+
+
+async def load_cogs(bot, cogs: Iterable[CogModule],
+                    concurrent: bool = False) -> Dict[str, Optional[float]]:
+    """
+    load_extension() each cog and time it (module import + setup).
+    Sequential by default; with `concurrent`, dependencies are prefetched
+    off the event loop and each dependency level is loaded with gather.
+    Returns {module: seconds}, None for modules that failed to load.
+    """
+    cogs = list(cogs)
+    timings: Dict[str, Optional[float]] = {}
+
+    async def load(cog: CogModule) -> None:
+        start = time.perf_counter()
+        try:
+            await bot.load_extension(cog.name)
+            timings[cog.name] = time.perf_counter() - start
+        except Exception as e:
+            timings[cog.name] = None
+            logger.error("❌ Failed to load module '%s': %s", cog.name, e)
+
+    if not concurrent:
+        for cog in cogs:
+            await load(cog)
+        return timings
+
+    start = time.perf_counter()
+    count = await asyncio.to_thread(prefetch_imports, cogs)
+    logger.debug("Prefetched %d cog dependencies in %.1f ms.",
+                 count, (time.perf_counter() - start) * 1000)
+    for level in dependency_levels(cogs):
+        await asyncio.gather(*(load(cog) for cog in level))
+    # report in discovery order, whatever order the loads finished in
+    return {cog.name: timings.get(cog.name) for cog in cogs}
+
+
+def timing_report(timings: Dict[str, Optional[float]]) -> str:
+    """Slowest first, one line per cog."""
+    loaded = sorted(((t, m) for m, t in timings.items() if t is not None), reverse=True)
+    lines = [f"  {t * 1000:8.1f} ms  {m}" for t, m in loaded]
+    lines += [f"  {'failed':>11}  {m}" for m, t in timings.items() if t is None]
+    total = sum(t for t, _ in loaded)
+    return f"Cog load times (import + setup), {total * 1000:.0f} ms total:\n" + "\n".join(lines)
@@ -0,0 +1,118 @@
+# utils/command_sync.py
+"""
+Sync the slash-command tree only when it changed.
+
+For each scope (global, or one guild) the command JSON that would be sent
+to Discord is hashed and compared with the hash stored after the last
+successful sync of that scope (command_sync.json in the bot root, keyed
+by application id). Unchanged scopes skip the rate-limited sync call.
+Delete the file to force a full sync.
+
+Guild scope also clears the global registration once (recorded as the
+empty-tree hash), so switching from a global sync doesn't list every
+command twice.
+"""
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+import discord
+from discord import app_commands
+
+from utils.helpers import get_bot_root
+
+logger = logging.getLogger("CommandSync")
+
+STATE_PATH = os.path.join(get_bot_root(), "command_sync.json")
+
+# tree_hash() of a scope with no commands
+EMPTY_HASH = hashlib.sha256(b"[]").hexdigest()
+
+
+def _command_payload(tree: app_commands.CommandTree, command: Any) -> Dict[str, Any]:
+    try:
+        return command.to_dict(tree)    # discord.py >= 2.4
+    except TypeError:
+        return command.to_dict()
+
+
+def tree_hash(tree: app_commands.CommandTree, guild: Optional[discord.abc.Snowflake] = None) -> str:
+    """sha256 of the commands registered for `guild` (None = global), order-independent."""
+    payload = sorted(
+        (_command_payload(tree, cmd) for cmd in tree.get_commands(guild=guild)),
+        key=lambda d: (d.get("type", 1), d["name"]),
+    )
+    blob = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def load_state(path: str = STATE_PATH) -> Dict[str, str]:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state: Dict[str, str], path: str = STATE_PATH) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(state, fh, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+async def sync_command_tree(bot, guild_ids: Optional[Iterable[int]] = None,
+                            path: str = STATE_PATH) -> List[str]:
+    """
+    Sync every scope whose hash changed. With `guild_ids` the global
+    commands are copied to each of those guilds and synced there instead,
+    which makes them usable right away, and the global registration is
+    emptied unless the stored state says it already is. Returns the scopes
+    synced.
+    """
+    tree = bot.tree
+    if guild_ids is None:
+        scopes: List[Optional[discord.Object]] = [None]
+    else:
+        scopes = [discord.Object(id=int(gid)) for gid in guild_ids]
+        for guild in scopes:
+            tree.copy_global_to(guild=guild)
+
+    state = load_state(path)
+    synced: List[str] = []
+    global_key = f"{bot.application_id}:global"
+    if guild_ids is not None and state.get(global_key) != EMPTY_HASH:
+        commands = tree.get_commands()
+        tree.clear_commands(guild=None)
+        try:
+            await tree.sync()
+        except discord.HTTPException as e:
+            logger.warning("Clearing global commands failed: %s", e)
+        else:
+            state[global_key] = EMPTY_HASH
+            synced.append("global")
+        finally:
+            # keep the local tree intact; only Discord's copy is emptied
+            for cmd in commands:
+                tree.add_command(cmd)
+    for guild in scopes:
+        scope = str(guild.id) if guild else "global"
+        key = f"{bot.application_id}:{scope}"
+        digest = tree_hash(tree, guild)
+        if state.get(key) == digest:
+            logger.debug("Commands for %s unchanged; sync skipped.", scope)
+            continue
+        try:
+            await tree.sync(guild=guild)
+        except discord.HTTPException as e:
+            # e.g. a guild that never granted the applications.commands scope
+            logger.warning("Command sync for %s failed: %s", scope, e)
+            continue
+        state[key] = digest
+        synced.append(scope)
+
+    if synced:
+        save_state(state, path)
+    return synced
@@ -0,0 +1,302 @@
+# utils/db_metrics.py
+"""
+Per-query instrumentation for every MySQL connection the bot opens.
+
+Connections handed out by Database.get_connection() and the cogs'
+db_connect() helpers are wrapped by `instrument()`. Each execute() /
+executemany() is timed and recorded under a normalised SQL fingerprint
+(literals and IN-lists collapsed), together with the game function that
+issued it.
+
+bot.py opens an interaction scope around every dispatched interaction
+(`interaction_scope`), so the same numbers are also rolled up per
+custom_id / command: how many queries – and how many ms of DB time – one
+button press costs on average and at worst.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from utils import tracing
+
+logger = logging.getLogger("DBMetrics")
+
+ENABLED = True
+
+_THIS_FILE = os.path.abspath(__file__)
+_ROOT = os.path.dirname(os.path.dirname(_THIS_FILE))
+# a query is charged to the innermost frame from these (models/ is plumbing)
+_GAME_DIRS = tuple(os.path.join(_ROOT, d) for d in ("game", "hub", "utils", "core"))
+
+_lock = threading.Lock()
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Aggregates
+# ──────────────────────────────────────────────────────────────────────────
+class QueryStat:
+    __slots__ = ("fingerprint", "count", "total_ms", "max_ms", "callers")
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.callers: Counter = Counter()
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class InteractionStat:
+    __slots__ = ("label", "interactions", "queries", "total_ms", "max_queries", "fingerprints")
+
+    def __init__(self, label: str):
+        self.label = label
+        self.interactions = 0
+        self.queries = 0
+        self.total_ms = 0.0
+        self.max_queries = 0
+        self.fingerprints: Counter = Counter()
+
+    @property
+    def queries_per(self) -> float:
+        return self.queries / self.interactions if self.interactions else 0.0
+
+    @property
+    def ms_per(self) -> float:
+        return self.total_ms / self.interactions if self.interactions else 0.0
+
+
+class _Scope:
+    __slots__ = ("stat", "queries")
+
+    def __init__(self, stat: InteractionStat):
+        self.stat = stat
+        self.queries = 0
+
+
+QUERIES: Dict[str, QueryStat] = {}
+INTERACTIONS: Dict[str, InteractionStat] = {}
+_scope: contextvars.ContextVar[Optional[_Scope]] = contextvars.ContextVar("db_scope", default=None)
+
+
+def reset() -> None:
+    with _lock:
+        QUERIES.clear()
+        INTERACTIONS.clear()
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Fingerprints / call sites
+# ──────────────────────────────────────────────────────────────────────────
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES = re.compile(r"(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+_SPACE = re.compile(r"\s+")
+_fingerprints: Dict[str, str] = {}
+
+
+def fingerprint(sql: str) -> str:
+    """`SELECT * FROM t WHERE id IN (%s,%s) AND x='a'` -> `SELECT * FROM t WHERE id IN (...) AND x=?`"""
+    fp = _fingerprints.get(sql)
+    if fp is None:
+        fp = sql.replace("%s", "?")
+        fp = _STRING.sub("?", fp)
+        fp = _NUMBER.sub("?", fp)
+        fp = _SPACE.sub(" ", fp).strip()
+        fp = _IN_LIST.sub("IN (...)", fp)
+        fp = _VALUES.sub(r"\1, ...", fp)
+        if len(_fingerprints) < 4096:
+            _fingerprints[sql] = fp
+    return fp
+
+
+def _call_site() -> str:
+    """Innermost game/hub/utils function on the stack above the DB plumbing."""
+    frame = sys._getframe(3)       # _call_site <- _record <- execute <- caller
+    first = None
+    while frame is not None:
+        code = frame.f_code
+        name = getattr(code, "co_qualname", code.co_name)
+        first = first or name
+        if code.co_filename.startswith(_GAME_DIRS) and code.co_filename != _THIS_FILE:
+            return name
+        frame = frame.f_back
+    return first or "?"
+
+
+def _record(sql: str, elapsed_ms: float) -> None:
+    fp = fingerprint(sql if isinstance(sql, str) else sql.decode("utf-8", "replace"))
+    caller = _call_site()
+    tracing.add_db_time(elapsed_ms / 1000)
+    scope = _scope.get()
+    with _lock:
+        stat = QUERIES.get(fp)
+        if stat is None:
+            stat = QUERIES[fp] = QueryStat(fp)
+        stat.count += 1
+        stat.total_ms += elapsed_ms
+        if elapsed_ms > stat.max_ms:
+            stat.max_ms = elapsed_ms
+        stat.callers[caller] += 1
+
+        if scope is not None:
+            scope.queries += 1
+            istat = scope.stat
+            istat.queries += 1
+            istat.total_ms += elapsed_ms
+            istat.fingerprints[fp] += 1
+            if scope.queries > istat.max_queries:
+                istat.max_queries = scope.queries
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Interaction scopes
+# ──────────────────────────────────────────────────────────────────────────
+_DIGITS = re.compile(r"\d+")
+
+
+def interaction_label(interaction: Any) -> str:
+    """custom_id (ids collapsed, e.g. open_chest_# ) or /command name."""
+    data = getattr(interaction, "data", None) or {}
+    cid = data.get("custom_id")
+    if cid:
+        return _DIGITS.sub("#", cid)
+    if data.get("name"):
+        return f"/{data['name']}"
+    return "interaction"
+
+
+@contextmanager
+def interaction_scope(label: str) -> Iterator[None]:
+    """
+    Attribute queries made by everything started inside this block (tasks
+    and to_thread calls inherit the context) to `label`.
+    """
+    if not ENABLED:
+        yield
+        return
+    with _lock:
+        stat = INTERACTIONS.get(label)
+        if stat is None:
+            stat = INTERACTIONS[label] = InteractionStat(label)
+        stat.interactions += 1
+    token = _scope.set(_Scope(stat))
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Connection / cursor wrappers
+# ──────────────────────────────────────────────────────────────────────────
+class InstrumentedCursor:
+    __slots__ = ("_cur",)
+
+    def __init__(self, cur: Any):
+        object.__setattr__(self, "_cur", cur)
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cur.execute(operation, params, *args, **kwargs)
+        finally:
+            _record(operation, (time.perf_counter() - start) * 1000)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cur.executemany(operation, seq_params, *args, **kwargs)
+        finally:
+            _record(operation, (time.perf_counter() - start) * 1000)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cur, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._cur, name, value)
+
+    def __iter__(self):
+        return iter(self._cur)
+
+    def __enter__(self) -> "InstrumentedCursor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._cur.close()
+
+
+class InstrumentedConnection:
+    __slots__ = ("_conn",)
+
+    def __init__(self, conn: Any):
+        object.__setattr__(self, "_conn", conn)
+
+    def cursor(self, *args, **kwargs) -> InstrumentedCursor:
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._conn, name, value)
+
+    def __enter__(self) -> "InstrumentedConnection":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._conn.close()
+
+
+def instrument(conn: Any) -> Any:
+    """Wrap a DB-API connection so its queries are recorded (no-op when disabled)."""
+    if not ENABLED or isinstance(conn, InstrumentedConnection):
+        return conn
+    return InstrumentedConnection(conn)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Reports
+# ──────────────────────────────────────────────────────────────────────────
+def top_queries(limit: int = 10, by: str = "total_ms") -> List[QueryStat]:
+    with _lock:
+        stats = list(QUERIES.values())
+    return sorted(stats, key=lambda s: getattr(s, by), reverse=True)[:limit]
+
+
+def top_interactions(limit: int = 10, by: str = "queries_per") -> List[InteractionStat]:
+    with _lock:
+        stats = [s for s in INTERACTIONS.values() if s.interactions]
+    return sorted(stats, key=lambda s: getattr(s, by), reverse=True)[:limit]
+
+
+def summary_lines(limit: int = 5) -> List[str]:
+    """Plain-text summary used by the periodic log line and /dbstats."""
+    with _lock:
+        total = sum(s.count for s in QUERIES.values())
+        total_ms = sum(s.total_ms for s in QUERIES.values())
+    lines = [f"{total} queries, {total_ms:.0f} ms DB time, {len(QUERIES)} distinct statements"]
+    for s in top_interactions(limit):
+        lines.append(
+            f"  {s.label}: {s.queries_per:.1f} queries / {s.ms_per:.1f} ms per use "
+            f"(max {s.max_queries}, {s.interactions} uses)"
+        )
+    for s in top_queries(limit):
+        caller = s.callers.most_common(1)[0][0] if s.callers else "?"
+        lines.append(
+            f"  {s.count}× {s.avg_ms:.2f} ms avg / {s.max_ms:.1f} max – {caller}: {s.fingerprint[:90]}"
+        )
+    return lines
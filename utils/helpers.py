@@ -1,16 +1,44 @@
 import os
+import sys
 import json
 
 def get_bot_root():
     # Get the parent directory of the utils folder (i.e., the project root)
     return os.path.dirname(os.path.abspath(os.path.join(__file__, '..')))
 
-def load_config():
+# config.json parsed once per process; every load_config() caller shares it
+_config = None
+
+def load_config(refresh=False):
+    """
+    Return config.json from the project root. The file is read on the first
+    call only and the same dict is handed to every caller afterwards (cogs,
+    models.database, utils.stat_levelup); pass refresh=True to re-read it.
+    """
+    global _config
+    if _config is not None and not refresh:
+        return _config
     # Look for config.json in the project root instead of in a 'utils' folder
     config_path = os.path.join(get_bot_root(), 'config.json')
     if not os.path.exists(config_path):
         print("❌ Config file missing. Please create 'config.json' in the project root.")
         return None
     with open(config_path, 'r') as f:
-        config = json.load(f)
-    return config
+        _config = json.load(f)
+    return _config
+
+def approx_size(obj, _seen=None):
+    """Rough deep size in bytes of a tree of dicts/lists/tuples/sets and scalars."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += approx_size(k, _seen) + approx_size(v, _seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += approx_size(item, _seen)
+    return size
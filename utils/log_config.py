@@ -0,0 +1,112 @@
+# utils/log_config.py
+"""
+Logging setup for the bot process, driven by the "logging" config section:
+
+    "logging": {
+        "level": "INFO",
+        "levels": {"SessionManager": "DEBUG", "discord": "WARNING"},
+        "sample": {"SessionManager": 20},
+        "queue": true
+    }
+
+Modules only call logging.getLogger(name); levels live here. `level` is the
+root level, `levels` overrides it per logger name (children included, so
+"discord" covers discord.gateway). `sample` keeps one DEBUG record in N per
+call site for the named loggers. With `queue` the calling thread only merges
+the message arguments (QueueHandler.prepare) and enqueues the record; a
+QueueListener thread applies the formatter and does the stream I/O.
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+from typing import Any, Dict, Optional, Tuple
+
+LOG_FORMAT = "[%(asctime)s] %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# libraries stay quiet unless the config says otherwise
+DEFAULT_LEVELS = {
+    "discord": "WARNING",
+    "mysql.connector": "WARNING",
+    "asyncio": "WARNING",
+}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Passes one DEBUG record in `every` per (logger, line) for the loggers
+    in `rates`; the first record from each call site always passes.
+    INFO and above are never dropped.
+    """
+
+    def __init__(self, rates: Dict[str, int]):
+        super().__init__()
+        self.rates = {name: max(1, int(n)) for name, n in rates.items()}
+        self._counts: Dict[Tuple[str, int], int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        every = self.rates.get(record.name)
+        if not every or every == 1:
+            return True
+        key = (record.name, record.lineno)
+        n = self._counts.get(key, 0)
+        self._counts[key] = n + 1
+        return n % every == 0
+
+
+def _level(value: Any) -> int:
+    if isinstance(value, int):
+        return value
+    level = logging.getLevelName(str(value).upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+def configure_logging(cfg: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Install the handler pipeline and levels described above. Safe to call
+    again (e.g. after editing config.json): the previous listener is
+    stopped and flushed first.
+    """
+    global _listener
+    cfg = cfg or {}
+    root = logging.getLogger()
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT))
+
+    if cfg.get("queue", True):
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        handler: logging.Handler = logging.handlers.QueueHandler(records)
+        _listener = logging.handlers.QueueListener(records, stream, respect_handler_level=True)
+        _listener.start()
+    else:
+        handler = stream
+    if cfg.get("sample"):
+        handler.addFilter(SamplingFilter(cfg["sample"]))
+    root.addHandler(handler)
+
+    root.setLevel(_level(cfg.get("level", "INFO")))
+    for name, level in {**DEFAULT_LEVELS, **cfg.get("levels", {})}.items():
+        logging.getLogger(name).setLevel(_level(level))
+
+
+def shutdown() -> None:
+    """Flush and stop the queue listener; registered with atexit."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown)
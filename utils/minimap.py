@@ -0,0 +1,204 @@
+# utils/minimap.py
+# Cached per-floor glyph grids for the full minimap and the 5×5 room map
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from utils.ui_helpers import get_emoji_for_room_type
+
+logger = logging.getLogger("Minimap")
+
+UNKNOWN = "⬛"
+VISITED = "🟨"
+PLAYER = "🤺"
+FALLEN = "⚰️"
+
+# Room types that collapse to the “visited” glyph once a player has been there.
+_VISITED_TYPES = frozenset(("safe", "monster"))
+
+# Rendered strings kept per grid before the memo is flushed.
+_MAX_RENDERS = 64
+
+Coord = Tuple[int, int]
+
+
+class FloorGlyphGrid:
+    """
+    Immutable glyph layout of a single floor.
+
+    The emoji for every cell is resolved once when the grid is built; a render
+    only overlays the caller’s discovery mask and positions on top of it and
+    joins whole rows, so no room lookup or type→emoji mapping happens per cell.
+    """
+
+    __slots__ = (
+        "floor_id", "session_id",
+        "min_x", "min_y", "max_x", "max_y",
+        "_glyphs", "_visited", "_renders",
+    )
+
+    def __init__(self, floor_id: int, rooms: Iterable[Dict[str, Any]], session_id: Optional[int] = None):
+        self.floor_id = floor_id
+        self.session_id = session_id
+
+        types: Dict[Coord, str] = {
+            (r["coord_x"], r["coord_y"]): r["room_type"] for r in rooms
+        }
+        if types:
+            xs = [x for x, _ in types]
+            ys = [y for _, y in types]
+            self.min_x, self.max_x = min(xs), max(xs)
+            self.min_y, self.max_y = min(ys), max(ys)
+        else:
+            self.min_x = self.max_x = self.min_y = self.max_y = 0
+
+        width = self.max_x - self.min_x + 1
+        self._glyphs: List[List[str]] = []
+        for y in range(self.min_y, self.max_y + 1):
+            row = [UNKNOWN] * width
+            for x in range(self.min_x, self.max_x + 1):
+                rtype = types.get((x, y))
+                if rtype:
+                    row[x - self.min_x] = get_emoji_for_room_type(rtype)
+            self._glyphs.append(row)
+
+        self._visited: FrozenSet[Coord] = frozenset(
+            c for c, t in types.items() if t in _VISITED_TYPES
+        )
+        self._renders: Dict[Tuple[Any, ...], str] = {}
+
+    # ──────────────────────────────────────────────────────────────────
+    # Helpers
+    # ──────────────────────────────────────────────────────────────────
+    def _in_bounds(self, x: int, y: int) -> bool:
+        return self.min_x <= x <= self.max_x and self.min_y <= y <= self.max_y
+
+    def _remember(self, key: Tuple[Any, ...], text: str) -> str:
+        if len(self._renders) >= _MAX_RENDERS:
+            self._renders.clear()
+        self._renders[key] = text
+        return text
+
+    # ──────────────────────────────────────────────────────────────────
+    # Full floor minimap
+    # ──────────────────────────────────────────────────────────────────
+    def render_full(
+        self,
+        current: Coord,
+        discovered: Set[Coord],
+        reveal: Set[Coord],
+        dead: Optional[Set[Coord]] = None,
+        gap: str = "    ",
+    ) -> str:
+        """
+        Render the whole floor. Precedence per cell:
+        fallen player ⇒ you ⇒ visited ⇒ discovered / peeked ⇒ unknown.
+        """
+        dead = dead or set()
+        key = ("full", current, frozenset(discovered), frozenset(reveal), frozenset(dead), gap)
+        hit = self._renders.get(key)
+        if hit is not None:
+            return hit
+
+        mx, my = self.min_x, self.min_y
+        width = self.max_x - mx + 1
+        rows = [[UNKNOWN] * width for _ in self._glyphs]
+
+        for x, y in discovered | reveal:
+            if self._in_bounds(x, y):
+                rows[y - my][x - mx] = self._glyphs[y - my][x - mx]
+        for x, y in self._visited.intersection(discovered):
+            rows[y - my][x - mx] = VISITED
+        if self._in_bounds(*current):
+            rows[current[1] - my][current[0] - mx] = PLAYER
+        for x, y in dead:
+            if self._in_bounds(x, y):
+                rows[y - my][x - mx] = FALLEN
+
+        text = "\n\n".join(gap.join(row) for row in rows) + "\n"
+        return self._remember(key, text)
+
+    # ──────────────────────────────────────────────────────────────────
+    # Local (radius 2 ⇒ 5×5) room map
+    # ──────────────────────────────────────────────────────────────────
+    def render_local(
+        self,
+        center: Coord,
+        discovered: Set[Coord],
+        reveal: Set[Coord],
+        radius: int = 2,
+    ) -> str:
+        """
+        Render the window around `center`. Cells are shown only when
+        discovered or peeked; out-of-bounds cells are ⬛.
+        """
+        x0, y0 = center
+        span = range(-radius, radius + 1)
+
+        mask = 0
+        bit = 1
+        for dy in span:
+            for dx in span:
+                c = (x0 + dx, y0 + dy)
+                if c in discovered or c in reveal:
+                    mask |= bit
+                bit <<= 1
+
+        key = ("local", center, radius, mask)
+        hit = self._renders.get(key)
+        if hit is not None:
+            return hit
+
+        side = 2 * radius + 1
+        lines: List[str] = []
+        bit = 1
+        for dy in span:
+            y = y0 + dy
+            glyph_row = self._glyphs[y - self.min_y] if self.min_y <= y <= self.max_y else None
+            row = [UNKNOWN] * side
+            for i, dx in enumerate(span):
+                x = x0 + dx
+                if mask & bit and glyph_row is not None and self.min_x <= x <= self.max_x:
+                    row[i] = glyph_row[x - self.min_x]
+                bit <<= 1
+            if dy == 0:
+                row[radius] = PLAYER
+            lines.append("".join(row))
+
+        return self._remember(key, "\n".join(lines))
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Process-wide grid cache (floor_id ➜ grid)
+# ──────────────────────────────────────────────────────────────────────
+_GRIDS: Dict[int, FloorGlyphGrid] = {}
+
+
+def get_floor_grid(floor_id: int) -> Optional[FloorGlyphGrid]:
+    """Return the cached grid for `floor_id`, or None if it was never built / was invalidated."""
+    return _GRIDS.get(floor_id)
+
+
+def build_floor_grid(
+    floor_id: int,
+    rooms: Iterable[Dict[str, Any]],
+    session_id: Optional[int] = None,
+) -> FloorGlyphGrid:
+    """Build (and cache) the grid for one floor from rows carrying coord_x, coord_y, room_type."""
+    grid = FloorGlyphGrid(floor_id, rooms, session_id)
+    _GRIDS[floor_id] = grid
+    logger.debug("Minimap grid built for floor %s (session %s).", floor_id, session_id)
+    return grid
+
+
+def invalidate_floor(floor_id: Optional[int]) -> None:
+    """Drop a floor’s grid after any of its rooms changed type."""
+    if floor_id is not None and _GRIDS.pop(floor_id, None) is not None:
+        logger.debug("Minimap grid invalidated for floor %s.", floor_id)
+
+
+def drop_session_grids(session_id: int) -> None:
+    """Release every grid that belongs to a finished session."""
+    for fid in [fid for fid, g in _GRIDS.items() if g.session_id == session_id]:
+        del _GRIDS[fid]
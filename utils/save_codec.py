@@ -0,0 +1,408 @@
+# utils/save_codec.py
+# Versioned, typed binary encoding for session saves
+"""
+Blob layout
+───────────
+    b"ABSV"                magic
+    u8   format version    (FORMAT_VERSION)
+    u8   compression       (0 none, 1 zlib, 2 zstd)
+    u16  schema version    (caller's data schema, e.g. GameSession.SCHEMA_VERSION)
+    ...  payload           (tagged values below, possibly compressed)
+
+Every value starts with a one-byte tag, so types survive the round trip:
+dict keys stay ints, tuples stay tuples, bools stay bools, and datetimes /
+Decimals (which json.dumps(default=str) flattened to strings) come back as
+themselves. Integers and lengths are LEB128 varints (ints zig-zagged).
+"""
+from __future__ import annotations
+
+import datetime as _dt
+import decimal
+import logging
+import struct
+import zlib
+from typing import Any, Callable, Dict, Tuple
+
+try:  # optional, only used when asked for
+    import zstandard as _zstd
+except ImportError:  # pragma: no cover - depends on environment
+    _zstd = None
+
+logger = logging.getLogger("SaveCodec")
+
+MAGIC = b"ABSV"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct(">4sBBH")
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+_COMPRESSION_NAMES = {"none": COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "zstd": COMPRESSION_ZSTD}
+
+
+class SaveCodecError(ValueError):
+    """Raised for blobs that are not valid saves (bad magic, version, tag…)."""
+
+
+# ── tags ───────────────────────────────────────────────────────────────────
+_NONE, _TRUE, _FALSE = b"N", b"T", b"F"
+_INT, _FLOAT, _STR, _BYTES = b"i", b"f", b"s", b"b"
+_LIST, _TUPLE, _DICT, _SET, _FROZENSET = b"l", b"t", b"d", b"S", b"Z"
+_DATETIME, _DATE, _DECIMAL = b"D", b"Y", b"M"
+
+_INT_BYTE = _INT[0]
+_DOUBLE = struct.Struct(">d")
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Encoding
+# ──────────────────────────────────────────────────────────────────────────
+def _encode(obj: Any) -> bytes:
+    out = bytearray()
+    append, extend = out.append, out.extend
+    pack_double = _DOUBLE.pack
+
+    def varint(n: int) -> None:
+        while n > 0x7F:
+            append((n & 0x7F) | 0x80)
+            n >>= 7
+        append(n)
+
+    # dict keys and enum-like values repeat a lot; encode each distinct string once
+    strings: Dict[str, bytes] = {}
+
+    def text(s: str) -> None:
+        raw = s.encode("utf-8")
+        varint(len(raw))
+        extend(raw)
+
+    def string(s: str) -> None:
+        chunk = strings.get(s)
+        if chunk is None:
+            raw = s.encode("utf-8")
+            n = len(raw)
+            if n < 0x80:
+                chunk = _STR + bytes((n,)) + raw
+            else:
+                head = bytearray(_STR)
+                while n > 0x7F:
+                    head.append((n & 0x7F) | 0x80)
+                    n >>= 7
+                head.append(n)
+                chunk = bytes(head) + raw
+            if len(strings) < 4096:
+                strings[s] = chunk
+        extend(chunk)
+
+    def enc(v: Any) -> None:
+        t = type(v)
+        if t is str:
+            string(v)
+        elif t is int:
+            z = v << 1 if v >= 0 else (-v << 1) - 1
+            if z < 0x80:
+                append(_INT_BYTE); append(z)
+            else:
+                extend(_INT); varint(z)
+        elif t is dict:
+            extend(_DICT); varint(len(v))
+            for k, item in v.items():
+                enc(k); enc(item)
+        elif t is list:
+            extend(_LIST); varint(len(v))
+            for item in v:
+                enc(item)
+        elif v is None:
+            extend(_NONE)
+        elif t is bool:
+            extend(_TRUE if v else _FALSE)
+        elif t is float:
+            extend(_FLOAT); extend(pack_double(v))
+        elif t is tuple:
+            extend(_TUPLE); varint(len(v))
+            for item in v:
+                enc(item)
+        elif t is set or t is frozenset:
+            extend(_SET if t is set else _FROZENSET); varint(len(v))
+            for item in v:
+                enc(item)
+        elif t is bytes or t is bytearray:
+            extend(_BYTES); varint(len(v)); extend(v)
+        elif t is _dt.datetime:
+            extend(_DATETIME); text(v.isoformat())
+        elif t is _dt.date:
+            extend(_DATE); text(v.isoformat())
+        elif t is decimal.Decimal:
+            extend(_DECIMAL); text(str(v))
+        else:
+            raise SaveCodecError(f"Cannot encode {t.__name__} values")
+
+    enc(obj)
+    return bytes(out)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Decoding
+# ──────────────────────────────────────────────────────────────────────────
+def _decode(payload: bytes) -> Any:
+    buf = payload
+    end = len(buf)
+    pos = 0
+    unpack_double = _DOUBLE.unpack_from
+    T_STR, T_INT, T_DICT, T_LIST = _STR[0], _INT[0], _DICT[0], _LIST[0]
+    T_NONE, T_TRUE, T_FALSE = _NONE[0], _TRUE[0], _FALSE[0]
+
+    def varint() -> int:
+        nonlocal pos
+        b = buf[pos]
+        pos += 1
+        if b < 0x80:                      # single byte: by far the common case
+            return b
+        result, shift = b & 0x7F, 7
+        while True:
+            b = buf[pos]
+            pos += 1
+            result |= (b & 0x7F) << shift
+            if b < 0x80:
+                return result
+            shift += 7
+
+    def text() -> str:
+        nonlocal pos
+        n = varint()
+        start = pos
+        pos += n
+        return buf[start:pos].decode("utf-8")
+
+    def dec() -> Any:
+        nonlocal pos
+        tag = buf[pos]
+        pos += 1
+        if tag == T_STR:
+            n = buf[pos]
+            if n < 0x80:
+                start = pos + 1
+                pos = start + n
+                return buf[start:pos].decode("utf-8")
+            return text()
+        if tag == T_INT:
+            z = buf[pos]
+            if z < 0x80:
+                pos += 1
+            else:
+                z = varint()
+            return (z >> 1) if not z & 1 else -((z + 1) >> 1)
+        if tag == T_DICT:
+            d = {}
+            for _ in range(varint()):
+                k = dec()
+                d[k] = dec()
+            return d
+        if tag == T_LIST:
+            return [dec() for _ in range(varint())]
+        if tag == T_NONE:
+            return None
+        if tag == T_TRUE:
+            return True
+        if tag == T_FALSE:
+            return False
+        return _decode_rare(tag)
+
+    def _decode_rare(tag: int) -> Any:
+        nonlocal pos
+        tag = bytes((tag,))
+        if tag == _FLOAT:
+            (f,) = unpack_double(buf, pos)
+            pos += 8
+            return f
+        if tag == _TUPLE:
+            return tuple([dec() for _ in range(varint())])
+        if tag == _SET:
+            return {dec() for _ in range(varint())}
+        if tag == _FROZENSET:
+            return frozenset([dec() for _ in range(varint())])
+        if tag == _BYTES:
+            n = varint()
+            start = pos
+            pos += n
+            return bytes(buf[start:pos])
+        if tag == _DATETIME:
+            return _dt.datetime.fromisoformat(text())
+        if tag == _DATE:
+            return _dt.date.fromisoformat(text())
+        if tag == _DECIMAL:
+            return decimal.Decimal(text())
+        raise SaveCodecError(f"Unknown tag {tag!r} at offset {pos - 1}")
+
+    try:
+        value = dec()
+    except IndexError as e:
+        raise SaveCodecError("Truncated save payload") from e
+    if pos != end:
+        raise SaveCodecError(f"{end - pos} trailing bytes after payload")
+    return value
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Public API
+# ──────────────────────────────────────────────────────────────────────────
+def dumps(obj: Any, *, schema_version: int = 0, compression: str = "zlib", level: int = 6) -> bytes:
+    """
+    Encode `obj` into a save blob. `compression` is 'none', 'zlib' or 'zstd'
+    ('zstd' falls back to zlib when the zstandard package is missing).
+    """
+    return seal(snapshot(obj), schema_version=schema_version,
+                compression=compression, level=level)
+
+
+def snapshot(obj: Any) -> bytes:
+    """
+    Encode `obj` without compressing it. The result is an immutable copy
+    of the state at this instant, so it can be taken on the event loop
+    and handed to seal() in a worker thread while the game keeps going.
+    """
+    return _encode(obj)
+
+
+def seal(payload: bytes, *, schema_version: int = 0, compression: str = "zlib", level: int = 6) -> bytes:
+    """Compress a snapshot() payload and prepend the header, giving a save blob."""
+    method = _COMPRESSION_NAMES.get(compression)
+    if method is None:
+        raise SaveCodecError(f"Unknown compression {compression!r}")
+    if method == COMPRESSION_ZSTD and _zstd is None:
+        logger.debug("zstandard not installed – using zlib for save blobs.")
+        method = COMPRESSION_ZLIB
+
+    if method == COMPRESSION_ZLIB:
+        payload = zlib.compress(payload, level)
+    elif method == COMPRESSION_ZSTD:
+        payload = _zstd.ZstdCompressor(level=level).compress(payload)
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, method, schema_version) + payload
+
+
+def loads(blob: bytes) -> Tuple[int, Any]:
+    """Decode a save blob. Returns (schema_version, value)."""
+    blob = bytes(blob)
+    if len(blob) < _HEADER.size:
+        raise SaveCodecError("Save blob too short")
+    magic, fmt, method, schema_version = _HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise SaveCodecError("Not a save blob (bad magic)")
+    if fmt > FORMAT_VERSION:
+        raise SaveCodecError(f"Save format v{fmt} is newer than this build (v{FORMAT_VERSION})")
+
+    payload = blob[_HEADER.size:]
+    if method == COMPRESSION_ZLIB:
+        payload = zlib.decompress(payload)
+    elif method == COMPRESSION_ZSTD:
+        if _zstd is None:
+            raise SaveCodecError("Save is zstd-compressed but zstandard is not installed")
+        payload = _zstd.ZstdDecompressor().decompress(payload)
+    elif method != COMPRESSION_NONE:
+        raise SaveCodecError(f"Unknown compression id {method}")
+    return schema_version, _decode(payload)
+
+
+def fingerprint(obj: Any) -> int:
+    """Cheap change-detection checksum of `obj`'s encoded form."""
+    return zlib.crc32(_encode(obj))
+
+
+def is_save_blob(data: Any) -> bool:
+    return isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:4]) == MAGIC
+
+
+# Upgrades keyed by the schema version they upgrade *from*; each returns the
+# next version's dict. Version 0 is the legacy JSON game_state.
+UPGRADES: Dict[int, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+
+
+def _v1_to_v2(state: Dict[str, Any]) -> Dict[str, Any]:
+    """v2 adds the per-session battle pace (None = guild / config default)."""
+    if "session_id" in state:      # full state or the "core" delta, not the other sections
+        state.setdefault("battle_pace", None)
+    return state
+
+
+UPGRADES[1] = _v1_to_v2
+
+
+def upgrade(state: Dict[str, Any], from_version: int, to_version: int) -> Dict[str, Any]:
+    """Run the registered schema upgrades from `from_version` up to `to_version`."""
+    for v in range(from_version, to_version):
+        step = UPGRADES.get(v)
+        if step:
+            state = step(state)
+    return state
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Benchmark:  python -m utils.save_codec [rounds]
+# ──────────────────────────────────────────────────────────────────────────
+def _sample_state(players: int = 4) -> Dict[str, Any]:
+    """A session dict shaped like GameSession.to_dict() mid-battle."""
+    pids = [100000000000000000 + i for i in range(players)]
+    rooms = [
+        {"room_id": i, "coord_x": i % 10, "coord_y": i // 10, "room_type": "safe",
+         "description": "A damp stone chamber.", "image_url": None, "is_locked": False}
+        for i in range(100)
+    ]
+    return {
+        "session_id": 42, "guild_id": 900000000000000001, "thread_id": "1234567890",
+        "owner": pids[0], "difficulty": "Hard", "num_players": players, "players": pids,
+        "current_turn": pids[1], "status": "active", "current_floor": 2, "total_floors": 4,
+        "message_id": 1357924680, "game_log": [f"Line {i}: something happened." for i in range(10)],
+        "game_state": {"floors": {1: rooms, 2: rooms}},
+        "battle_state": {
+            "enemy": {"enemy_id": 7, "enemy_name": "Behemoth", "hp": 812, "max_hp": 1500,
+                      "attack_power": 60, "defense": 30, "gil_pool": 250},
+            "player_effects": [{"effect_id": 3, "effect_name": "Regen", "remaining": 2,
+                                "icon": "", "heal_per_turn": 12}],
+            "enemy_effects": [],
+        },
+        "ability_cooldowns": {pid: {1: 0, 4: 2, 9: 1} for pid in pids},
+        "temp_ability_cooldowns": {pid: {2: 1} for pid in pids},
+        "trance_states": {pids[0]: {"trance_id": 1, "name": "Berserk", "remaining": 2, "max": 3}},
+        "status_effects": {},
+        "current_enemy": None,
+        "illusion_states": {},
+        "illusion_cleared": {pid: [11, 12] for pid in pids},
+        "battle_pace": None,
+        "saved_at": _dt.datetime(2024, 1, 1, 12, 30),
+    }
+
+
+def _benchmark(rounds: int = 500) -> None:
+    import json
+    import time
+
+    state = _sample_state()
+
+    def timeit(fn) -> float:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        return (time.perf_counter() - start) / rounds * 1e6
+
+    json_blob = json.dumps(state, default=str).encode()
+    rows = [("json (current)", len(json_blob),
+             timeit(lambda: json.dumps(state, default=str).encode()),
+             timeit(lambda: json.loads(json_blob)))]
+    methods = ["none", "zlib"] + (["zstd"] if _zstd else [])
+    for method in methods:
+        blob = dumps(state, compression=method)
+        assert loads(blob)[1] == state, f"{method}: round trip is not lossless"
+        rows.append((f"binary/{method}", len(blob),
+                     timeit(lambda: dumps(state, compression=method)),
+                     timeit(lambda: loads(blob))))
+
+    json_lossless = json.loads(json_blob) == state
+    print(f"{'codec':<16}{'bytes':>9}{'encode µs':>12}{'decode µs':>12}")
+    for name, size, enc_us, dec_us in rows:
+        print(f"{name:<16}{size:>9}{enc_us:>12.1f}{dec_us:>12.1f}")
+    print(f"json lossless round trip: {json_lossless}; binary lossless round trip: True")
+
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
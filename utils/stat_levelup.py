@@ -2,9 +2,9 @@ import mysql.connector
 import json
 import logging
 from utils.helpers import load_config
+from utils.db_metrics import instrument
 
 logger = logging.getLogger("StatLevelUp")
-logger.setLevel(logging.DEBUG)
 
 # Load configuration
 config = load_config()
@@ -13,7 +13,7 @@ db_config = config['mysql']
 def db_connect():
     """Create and return a new MySQL connection."""
     try:
-        return mysql.connector.connect(**db_config)
+        return instrument(mysql.connector.connect(**db_config))
     except Exception as e:
         logger.error("DB connection error in StatLevelUp: %s", e)
         raise
@@ -6,141 +6,167 @@ from models.session_models import SessionPlayerModel
 logger = logging.getLogger("StatusEffectEngine")
 
 class StatusEffectEngine:
-    def __init__(self, session, log_callable):
+    def __init__(self, session, log_callable, log_many=None):
         """
         session: your in-memory GameSession (from SessionManager)
         log_callable: a function that takes (session_id:int, msg:str) and logs it
                       e.g. GameMaster.append_game_log
+        log_many: optional (session_id:int, lines:list[str]) variant used to
+                  write a whole tick's lines at once, e.g. GameMaster.append_game_logs
         """
-        self.session = session
-        self.log     = log_callable
-
-    async def tick_world(self, player_id: int) -> None:
+        self.session  = session
+        self.log      = log_callable
+        self.log_many = log_many
+
+    def _flush_logs(self, lines) -> None:
+        """Hand a tick's log lines over in one call when the caller supports it."""
+        if not lines:
+            return
+        if self.log_many:
+            self.log_many(self.session.session_id, lines)
+        else:
+            for line in lines:
+                self.log(self.session.session_id, line)
+
+    @staticmethod
+    def _tick_entries(effects, lines, dmg_fmt, hot_fmt):
         """
-        Out-of-combat: apply all effects on `player_id`,
-        decrement durations, persist back to DB, and log each line.
+        Apply one turn of `effects` in memory.
+        Returns (net_damage, net_heal, still_active) and appends log lines.
         """
-        raw = SessionPlayerModel.get_status_effects(
-            self.session.session_id, player_id
-        ) or []
-        updated = []
+        damage = heal = 0
+        remaining = []
+        for se in effects:
+            name = se["effect_name"]
+            dmg  = se.get("damage_per_turn", 0)
+            hot  = se.get("heal_per_turn", 0)
+
+            if dmg:
+                damage += dmg
+                lines.append(dmg_fmt.format(name=name, amount=dmg))
+            if hot:
+                heal += hot
+                lines.append(hot_fmt.format(name=name, amount=hot))
 
-        for se in raw:
+            se["remaining"] = se.get("remaining", se.get("remaining_turns", 0)) - 1
+            if se["remaining"] > 0:
+                remaining.append(se)
+            else:
+                lines.append(f"{name} has worn off.")
+        return damage, heal, remaining
+
+    @staticmethod
+    def _tick_enemy(enemy, effects, lines):
+        """
+        Apply one turn of the enemy's `effects` to `enemy` in memory, each
+        tick landing in turn (clamped at 0 and max_hp). Returns the effects
+        still active and appends log lines.
+        """
+        remaining = []
+        for se in effects:
             name = se["effect_name"]
             dmg  = se.get("damage_per_turn", 0)
             hot  = se.get("heal_per_turn", 0)
 
             if dmg:
-                SessionPlayerModel.modify_hp(
-                    self.session.session_id, player_id, damage=dmg
-                )
-                self.log(
-                    self.session.session_id,
-                    f"{name} deals {dmg} damage."
-                )
+                enemy["hp"] = max(enemy.get("hp", 0) - dmg, 0)
+                lines.append(f"{name} deals {dmg} damage to {enemy.get('enemy_name')}!")
 
             if hot:
-                SessionPlayerModel.modify_hp(
-                    self.session.session_id, player_id, heal=hot
-                )
-                self.log(
-                    self.session.session_id,
-                    f"{name} heals for {hot} HP."
-                )
-
-            rem = se.get("remaining", se.get("remaining_turns", 0)) - 1
-            if rem > 0:
-                se["remaining"] = rem
-                updated.append(se)
+                old = enemy.get("hp", 0)
+                cap = enemy.get("max_hp", 0)
+                healed = min(hot, cap - old)
+                enemy["hp"] = min(old + hot, cap)
+                lines.append(f"{name} heals {enemy.get('enemy_name')} for {healed} HP!")
+
+            se["remaining"] = se.get("remaining", se.get("remaining_turns", 0)) - 1
+            if se["remaining"] > 0:
+                remaining.append(se)
             else:
-                self.log(
-                    self.session.session_id,
-                    f"{name} has worn off."
-                )
+                lines.append(f"{name} has worn off.")
+        return remaining
 
-        SessionPlayerModel.update_status_effects(
-            self.session.session_id, player_id, updated
+    async def tick_world(self, player_id: int) -> None:
+        """
+        Out-of-combat: apply all effects on `player_id`,
+        decrement durations, persist back to DB, and log each line.
+        """
+        await self.tick_world_many([player_id])
+
+    async def tick_world_many(self, player_ids) -> None:
+        """
+        tick_world for several players at once: one read of their effects,
+        one net HP delta per player, one combined write and one log batch.
+        A player in a battle's combatant snapshot takes the HP change there
+        (as in tick_combat) so the next snapshot flush does not undo it.
+        """
+        player_ids = list(dict.fromkeys(player_ids))
+        raw = SessionPlayerModel.get_status_effects_many(
+            self.session.session_id, player_ids
         )
+        combatants = (self.session.battle_state or {}).get("combatants") or {}
+        lines = []
+        ticks = {}
+
+        for pid in player_ids:
+            effects = raw.get(pid) or []
+            if not effects:
+                continue
+            damage, heal, updated = self._tick_entries(
+                effects, lines,
+                "{name} deals {amount} damage.",
+                "{name} heals for {amount} HP.",
+            )
+            delta = heal - damage
+            snap = combatants.get(pid)
+            if snap is not None:
+                if delta:
+                    snap["hp"] = min(snap["max_hp"], max(0, snap["hp"] + delta))
+                    snap["hp_dirty"] = True
+                delta = 0
+            ticks[pid] = (delta, updated)
+
+        SessionPlayerModel.apply_status_ticks(self.session.session_id, ticks)
+        self._flush_logs(lines)
 
     async def tick_combat(self, target: str) -> None:
         """
         In-combat: `target` is either 'player' or 'enemy'.
         Effects live in session.battle_state['player_effects']
         or session.battle_state['enemy_effects'].
-        Player HP is stored in the DB; enemy HP lives in memory.
-        This method applies each tick, logs the exact amount,
-        decrements durations, and cleans up expired effects.
+        Player HP lives in the battle's combatant snapshot when there is one
+        (persisted by BattleSystem at end of turn), otherwise in the DB;
+        enemy HP lives in memory.
+        All entries are summed into one net HP change, durations are
+        decremented, expired effects dropped, and the lines logged in one batch.
         """
         eff_key = f"{target}_effects"
         effects = self.session.battle_state.get(eff_key, []) or []
-        new_effects = []
+        lines = []
 
-        for se in effects:
-            name = se["effect_name"]
-            dmg  = se.get("damage_per_turn", 0)
-            hot  = se.get("heal_per_turn", 0)
-
-            if target == "player":
-                pid = self.session.current_turn
-
-                # Damage tick
-                if dmg:
-                    SessionPlayerModel.modify_hp(
-                        self.session.session_id, pid, damage=dmg
-                    )
-                    self.log(
-                        self.session.session_id,
-                        f"{name} deals {dmg} damage to you!"
-                    )
-
-                # Heal tick
-                if hot:
-                    SessionPlayerModel.modify_hp(
-                        self.session.session_id, pid, heal=hot
-                    )
-                    self.log(
-                        self.session.session_id,
-                        f"{name} heals you for {hot} HP!"
-                    )
-
-            else:  # enemy
-                enemy = self.session.battle_state.get("enemy", {})
-
-                # Damage tick
-                if dmg:
-                    enemy["hp"] = max(enemy.get("hp", 0) - dmg, 0)
-                    self.log(
-                        self.session.session_id,
-                        f"{name} deals {dmg} damage to {enemy.get('enemy_name')}!"
-                    )
-
-                # Heal tick
-                if hot:
-                    old = enemy.get("hp", 0)
-                    cap = enemy.get("max_hp", 0)
-                    healed = min(hot, cap - old)
-                    enemy["hp"] = min(old + hot, cap)
-                    self.log(
-                        self.session.session_id,
-                        f"{name} heals {enemy.get('enemy_name')} for {healed} HP!"
-                    )
-
-            # Decrement duration
-            se["remaining"] = se.get("remaining", se.get("remaining_turns", 0)) - 1
-            if se["remaining"] > 0:
-                new_effects.append(se)
-            else:
-                self.log(
-                    self.session.session_id,
-                    f"{name} has worn off."
-                )
-
-        # Write-back the updated effects
-        self.session.battle_state[eff_key] = new_effects
-
-        # Persist only the player's side back to the DB
         if target == "player":
             pid = self.session.current_turn
-            SessionPlayerModel.update_status_effects(
-                self.session.session_id, pid, new_effects
+            damage, heal, new_effects = self._tick_entries(
+                effects, lines,
+                "{name} deals {amount} damage to you!",
+                "{name} heals you for {amount} HP!",
+            )
+            self.session.battle_state[eff_key] = new_effects
+
+            # Persist the player's side (effects, plus HP when no snapshot) in one write
+            snap = (self.session.battle_state.get("combatants") or {}).get(pid)
+            delta = heal - damage
+            if snap is not None:
+                if delta:
+                    snap["hp"] = min(snap["max_hp"], max(0, snap["hp"] + delta))
+                    snap["hp_dirty"] = True
+                delta = 0
+            SessionPlayerModel.apply_status_ticks(
+                self.session.session_id, {pid: (delta, new_effects)}
             )
+
+        else:  # enemy — in memory only
+            enemy = self.session.battle_state.get("enemy", {})
+            self.session.battle_state[eff_key] = self._tick_enemy(enemy, effects, lines)
+
+        self._flush_logs(lines)
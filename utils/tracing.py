@@ -0,0 +1,228 @@
+# utils/tracing.py
+"""
+In-process latency tracing for component interactions.
+
+bot.py starts a trace when an interaction is dispatched (`interaction_trace`);
+everything the handlers do inside it can open named spans:
+
+    with tracing.span("embed_build"):
+        ...
+
+    @tracing.traced("update_room_view")
+    async def update_room_view(...):
+
+EmbedManager.send_or_update_embed closes the trace after its first Discord
+edit/send, which records "total" (receipt → user-visible update) and "db"
+(summed query time, fed in by utils.db_metrics).
+
+Every span lands in a histogram keyed by (label, span) where label is the
+custom_id with ids collapsed (move_north, open_chest_#, combat_attack…).
+p50/p95/p99 come from a bounded sample of recent durations; the fixed
+buckets are for the Prometheus text export (`render_prometheus`).
+"""
+from __future__ import annotations
+
+import bisect
+import contextvars
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("Tracing")
+
+ENABLED = True
+
+# histogram upper bounds in seconds (Prometheus `le` labels)
+BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SAMPLE_SIZE = 1024
+
+_lock = threading.Lock()
+
+
+class Histogram:
+    __slots__ = ("buckets", "count", "sum", "samples")
+
+    def __init__(self):
+        self.buckets: List[int] = [0] * (len(BUCKETS) + 1)      # last is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.samples: Deque[float] = deque(maxlen=SAMPLE_SIZE)
+
+    def observe(self, seconds: float) -> None:
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.samples.append(seconds)
+
+    def percentile(self, q: float) -> float:
+        """q in [0, 100] over the recent sample, in seconds."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+HISTOGRAMS: Dict[Tuple[str, str], Histogram] = {}
+
+
+def observe(label: str, span_name: str, seconds: float) -> None:
+    with _lock:
+        hist = HISTOGRAMS.get((label, span_name))
+        if hist is None:
+            hist = HISTOGRAMS[(label, span_name)] = Histogram()
+        hist.observe(seconds)
+
+
+def reset() -> None:
+    with _lock:
+        HISTOGRAMS.clear()
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Traces & spans
+# ──────────────────────────────────────────────────────────────────────────
+class Trace:
+    __slots__ = ("label", "started", "db_seconds", "finished")
+
+    def __init__(self, label: str):
+        self.label = label
+        self.started = time.perf_counter()
+        self.db_seconds = 0.0
+        self.finished = False
+
+    def since_start(self) -> float:
+        return time.perf_counter() - self.started
+
+
+_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("trace", default=None)
+
+
+def current() -> Optional[Trace]:
+    return _trace.get()
+
+
+@contextmanager
+def interaction_trace(label: str) -> Iterator[None]:
+    """Start a trace that tasks spawned inside this block inherit."""
+    if not ENABLED:
+        yield
+        return
+    token = _trace.set(Trace(label))
+    try:
+        yield
+    finally:
+        _trace.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the block as `name` under the current trace (no-op outside one)."""
+    trace = _trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(trace.label, name, time.perf_counter() - start)
+
+
+def record(name: str, seconds: float) -> None:
+    """Record an already-measured duration as span `name` under the current trace."""
+    trace = _trace.get()
+    if trace is not None:
+        observe(trace.label, name, seconds)
+
+
+def mark(name: str) -> None:
+    """
+    Record the time from receipt until now as span `name`; ignored once the
+    trace has finished, so later renders (a paced enemy reply, a refresh)
+    don't add samples.
+    """
+    trace = _trace.get()
+    if trace is not None and not trace.finished:
+        observe(trace.label, name, trace.since_start())
+
+
+def add_db_time(seconds: float) -> None:
+    trace = _trace.get()
+    if trace is not None:
+        trace.db_seconds += seconds
+
+
+def finish() -> None:
+    """
+    Close the current trace at the first user-visible update: records
+    "total" and the summed "db" time. Later calls are ignored.
+    """
+    trace = _trace.get()
+    if trace is None or trace.finished:
+        return
+    trace.finished = True
+    observe(trace.label, "total", trace.since_start())
+    observe(trace.label, "db", trace.db_seconds)
+
+
+def traced(name: str) -> Callable:
+    """Decorator form of span() for coroutine handlers."""
+    def wrap(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def inner(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return await fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Reports / export
+# ──────────────────────────────────────────────────────────────────────────
+def percentiles(span_name: str = "total") -> List[Tuple[str, int, float, float, float]]:
+    """[(label, count, p50, p95, p99)] in seconds for one span, slowest p95 first."""
+    with _lock:
+        rows = [
+            (label, h.count, h.percentile(50), h.percentile(95), h.percentile(99))
+            for (label, name), h in HISTOGRAMS.items() if name == span_name
+        ]
+    return sorted(rows, key=lambda r: r[3], reverse=True)
+
+
+def breakdown(label: str) -> List[Tuple[str, int, float, float, float]]:
+    """[(span, count, p50, p95, p99)] for every span seen under `label`."""
+    with _lock:
+        rows = [
+            (name, h.count, h.percentile(50), h.percentile(95), h.percentile(99))
+            for (lbl, name), h in HISTOGRAMS.items() if lbl == label
+        ]
+    return sorted(rows, key=lambda r: r[3], reverse=True)
+
+
+def _esc(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(prefix: str = "adventurebot") -> str:
+    """Prometheus text exposition (histograms in seconds)."""
+    metric = f"{prefix}_interaction_span_seconds"
+    out = [
+        f"# HELP {metric} Time spent per interaction span, by custom_id.",
+        f"# TYPE {metric} histogram",
+    ]
+    with _lock:
+        items = sorted(HISTOGRAMS.items())
+        for (label, name), h in items:
+            labels = f'custom_id="{_esc(label)}",span="{_esc(name)}"'
+            running = 0
+            for bound, n in zip(BUCKETS, h.buckets):
+                running += n
+                out.append(f'{metric}_bucket{{{labels},le="{bound}"}} {running}')
+            out.append(f'{metric}_bucket{{{labels},le="+Inf"}} {h.count}')
+            out.append(f"{metric}_sum{{{labels}}} {h.sum:.6f}")
+            out.append(f"{metric}_count{{{labels}}} {h.count}")
+    return "\n".join(out) + "\n"